@@ -0,0 +1,23 @@
+import subprocess
+import json
+import sys
+
+try:
+    import unboundmodule
+except ImportError:
+    from benchmarks import unbound_stub
+    sys.modules['unboundmodule'] = unbound_stub
+
+
+def run_case(args, env=None):
+    """Runs a benchmark case in a fresh Python process, subprocess.check_output is not part of Python 2.6.
+
+    :param args: interpreter arguments
+    :param env: environment of the process, defaults to the current one
+    :return: JSON decoded last line the case printed
+    """
+    process = subprocess.Popen([sys.executable] + args, stdout=subprocess.PIPE, env=env)
+    output = process.communicate()[0]
+    if process.returncode:
+        raise RuntimeError('Benchmark case %s exited with %d' % (' '.join(args), process.returncode))
+    return json.loads(output.splitlines()[-1])
@@ -0,0 +1,87 @@
+"""
+Local stand-in for the EC2 DescribeInstances API, serving a synthetic fleet over HTTP.
+"""
+from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+from SocketServer import ThreadingMixIn
+import threading
+import urlparse
+import time
+
+RESPONSE_HEAD = '<?xml version="1.0" encoding="UTF-8"?>\n' \
+                '<DescribeInstancesResponse xmlns="http://ec2.amazonaws.com/doc/2014-10-01/">' \
+                '<requestId>bogus-request-id</requestId><reservationSet>'
+RESPONSE_TAIL = '</reservationSet>%s</DescribeInstancesResponse>'
+RESERVATION = '<item><reservationId>r-%(index)08x</reservationId><ownerId>000000000000</ownerId>' \
+              '<groupSet/><instancesSet><item>' \
+              '<instanceId>i-%(index)08x</instanceId>' \
+              '<instanceState><code>16</code><name>running</name></instanceState>' \
+              '<privateIpAddress>%(private)s</privateIpAddress><ipAddress>%(public)s</ipAddress>' \
+              '<tagSet><item><key>Name</key><value>%(name)s</value></item></tagSet>' \
+              '</item></instancesSet></item>'
+
+
+def address(prefix, index):
+    return '%s.%d.%d.%d' % (prefix, (index >> 16) & 0xff, (index >> 8) & 0xff, index & 0xff)
+
+
+def reservation(index, zone, names):
+    return RESERVATION % {'index': index,
+                          'private': address(10, index),
+                          'public': address(54, index),
+                          'name': 'host-%d.%s' % (index % names, zone)}
+
+
+class FakeEc2Handler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.getheader('content-length', 0)))
+        params = dict((key, values[0]) for key, values in urlparse.parse_qs(body).items())
+        fleet = self.server.fleet
+        start = int(params.get('NextToken', 0))
+        count = int(params.get('MaxResults', fleet)) if 'MaxResults' in params else fleet
+        end = min(start + count, fleet)
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        token = '<nextToken>%d</nextToken>' % end if end < fleet else ''
+        response = ''.join([RESPONSE_HEAD] +
+                           [reservation(i, self.server.zone, self.server.names) for i in xrange(start, end)] +
+                           [RESPONSE_TAIL % token])
+        self.server.requests += 1
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/xml')
+        self.send_header('Content-Length', str(len(response)))
+        self.end_headers()
+        self.wfile.write(response)
+
+    def log_message(self, *args):
+        pass
+
+
+class FakeEc2Server(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+    def __init__(self, fleet, zone='example.com', names=None, latency=0.0):
+        HTTPServer.__init__(self, ('127.0.0.1', 0), FakeEc2Handler)
+        self.fleet = fleet
+        self.zone = zone
+        self.names = names or fleet
+        self.latency = latency
+        self.requests = 0
+
+    def start(self):
+        thread = threading.Thread(target=self.serve_forever)
+        thread.daemon = True
+        thread.start()
+        return self
+
+    def connection(self):
+        return connect(self.server_address[1])
+
+
+def connect(port):
+    """Returns a boto EC2 connection pointed at a fake endpoint listening on provided local port.
+
+    """
+    from boto.ec2.connection import EC2Connection
+    from boto.regioninfo import RegionInfo
+    return EC2Connection(aws_access_key_id='bogus', aws_secret_access_key='bogus', is_secure=False, port=port,
+                         region=RegionInfo(name='fake', endpoint='127.0.0.1'))
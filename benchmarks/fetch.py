@@ -0,0 +1,50 @@
+"""
+Benchmarks fetching and indexing a synthetic fleet from a local fake EC2 endpoint.
+Every mode runs in its own process so that peak RSS is measured per mode.
+
+    $ python -m benchmarks.fetch --instances 50000
+"""
+import optparse
+import json
+import resource
+import time
+
+from benchmarks import fake_ec2
+from benchmarks import run_case
+
+
+def run(port, max_results):
+    from unbound_ec2 import lookup
+    _lookup = lookup.DirectLookup(fake_ec2.connect(port), 'example.com', {}, max_results=max_results)
+    start = time.time()
+    index = _lookup.resolve()
+    return {'max_results': max_results,
+            'names': len(index),
+            'wall_time': time.time() - start,
+            'peak_rss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss}
+
+
+def main():
+    # optparse rather than argparse, which is not part of Python 2.6
+    parser = optparse.OptionParser(usage='%%prog [options]\n%s' % __doc__)
+    parser.add_option('--instances', type='int', default=50000)
+    parser.add_option('--latency', type='float', default=0.05, help='simulated API latency per page')
+    parser.add_option('--max-results', type='int', action='append', dest='max_results',
+                      help='page size, repeat it to compare several')
+    parser.add_option('--port', type='int', help=optparse.SUPPRESS_HELP)
+    args = parser.parse_args()[0]
+
+    if args.port:
+        print json.dumps(run(args.port, args.max_results[0] or None))
+        return
+
+    server = fake_ec2.FakeEc2Server(args.instances, latency=args.latency).start()
+    results = []
+    for max_results in args.max_results or [0, 1000]:
+        results.append(run_case(['-m', 'benchmarks.fetch', '--port', str(server.server_address[1]),
+                                 '--max-results', str(max_results)]))
+    print json.dumps({'instances': args.instances, 'latency': args.latency, 'results': results}, indent=2)
+
+
+if __name__ == '__main__':
+    main()
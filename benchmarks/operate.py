@@ -0,0 +1,216 @@
+"""
+Benchmarks Server.operate and the lookup refresh pipeline on synthetic fleets, for both lookup and server types.
+Every fleet size, tag layout and lookup type runs in its own process so that peak RSS is measured per case.
+Results are printed as JSON, and saved to --output to compare them between versions.
+
+    $ python -m benchmarks.operate --instances 1000 --instances 10000 --instances 100000 --output results.json
+"""
+import optparse
+import fnmatch
+import json
+import os
+import platform
+import random
+import resource
+import tempfile
+import time
+
+from benchmarks import unbound_stub
+from benchmarks import run_case
+
+ZONE = 'example.com'
+REVERSE_ZONE = '10.in-addr.arpa'
+LAYOUTS = ['plain', 'qualified', 'aliases', 'address']
+LOOKUPS = ['direct', 'cache', 'index']
+SERVERS = ['authoritative', 'caching']
+
+
+class Object(object):
+    pass
+
+
+def address(index):
+    return '10.%d.%d.%d' % ((index >> 16) & 0xff, (index >> 8) & 0xff, index & 0xff)
+
+
+def instance(index, layout):
+    """Builds a synthetic instance with one of the supported tag layouts.
+
+    """
+    result = Object()
+    result.id = 'i-%08x' % index
+    result.state = 'running'
+    result.private_ip_address = address(index)
+    result.ip_address = None
+    result.vpc_id = 'vpc-%d' % (index % 4)
+    result.subnet_id = 'subnet-%d' % (index % 16)
+    result.tags = {'Name': 'host-%d' % index}
+    if layout == 'qualified':
+        result.tags['Name'] = 'host-%d.%s' % (index, ZONE)
+    elif layout == 'aliases':
+        result.tags['Name'] = 'host-%d,alias-%d,role-%d' % (index, index, index % 100)
+    elif layout == 'address':
+        result.tags['Address'] = '172.16.%d.%d' % ((index >> 8) & 0xff, index & 0xff)
+    return result
+
+
+class Connection(object):
+    """In-memory EC2 connection serving a synthetic fleet, applying the filters lookups narrow queries with.
+
+    """
+
+    def __init__(self, instances):
+        self.instances = instances
+        self.by_id = dict((i.id, i) for i in instances)
+        self.calls = 0
+
+    def get_all_reservations(self, instance_ids=None, filters=None, max_results=None, next_token=None):
+        self.calls += 1
+        filters = filters or {}
+        if 'instance-id' in filters:
+            candidates = [self.by_id[i] for i in filters['instance-id'] if i in self.by_id]
+        else:
+            candidates = self.instances
+        matches = [i for i in candidates if self.__matches(i, filters)]
+        reservation = Object()
+        reservation.instances = matches
+        return [reservation]
+
+    def __matches(self, instance, filters):
+        for key, values in filters.items():
+            values = values if isinstance(values, list) else [values]
+            if key == 'network-interface.addresses.private-ip-address':
+                value = instance.private_ip_address
+            elif key == 'instance-state-name':
+                value = instance.state
+            elif key.startswith('tag:'):
+                value = instance.tags.get(key[4:])
+            else:
+                continue
+            if value is None or not any(fnmatch.fnmatchcase(value, v) for v in values):
+                return False
+        return True
+
+
+def queries(instances, layout, count):
+    """Builds a reproducible mix of forward hits, reverse hits and misses.
+
+    """
+    rng = random.Random(count)
+    result = []
+    for i in xrange(count):
+        index = rng.randrange(instances)
+        kind = i % 4
+        if kind == 0:
+            result.append(('host-%d.%s.' % (index, ZONE), unbound_stub.RR_TYPE_A))
+        elif kind == 1:
+            result.append(('i-%08x.%s.' % (index, ZONE), unbound_stub.RR_TYPE_A))
+        elif kind == 2:
+            octets = address(index).split('.')
+            result.append(('%s.in-addr.arpa.' % '.'.join(reversed(octets)), unbound_stub.RR_TYPE_PTR))
+        else:
+            result.append(('missing-%d.%s.' % (index, ZONE), unbound_stub.RR_TYPE_A))
+    return result
+
+
+def percentile(values, fraction):
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def measure(srv, questions):
+    latencies = []
+    start = time.time()
+    for qname, qtype in questions:
+        qstate = unbound_stub.QueryState(qname, qtype)
+        query_start = time.time()
+        srv.operate(0, unbound_stub.MODULE_EVENT_NEW, qstate, None)
+        latencies.append(time.time() - query_start)
+    wall_time = time.time() - start
+    latencies.sort()
+    return {'queries': len(questions),
+            'queries_per_second': len(questions) / wall_time,
+            'p50_microseconds': percentile(latencies, 0.5) * 1e6,
+            'p99_microseconds': percentile(latencies, 0.99) * 1e6}
+
+
+def run(instances, layout, lookup_type, count):
+    from unbound_ec2 import lookup
+    from unbound_ec2 import server
+
+    ec2 = Connection([instance(i, layout) for i in xrange(instances)])
+    include_domain = layout == 'qualified'
+    if lookup_type == 'direct':
+        _lookup = lookup.DirectLookup(ec2, ZONE, {'instance-state-name': 'running'}, include_domain)
+    else:
+        _lookup = lookup.CacheLookup(ec2, ZONE, {'instance-state-name': 'running'}, include_domain)
+
+    result = {'instances': instances, 'layout': layout, 'lookup': lookup_type}
+    if lookup_type != 'direct':
+        start = time.time()
+        names = _lookup.refresh()
+        result['refresh_seconds'] = time.time() - start
+        result['names'] = len(names)
+        start = time.time()
+        _lookup.refresh()
+        result['incremental_refresh_seconds'] = time.time() - start
+    if lookup_type == 'index':
+        from unbound_ec2 import index
+        index_file = os.path.join(tempfile.mkdtemp(), 'operate.index')
+        start = time.time()
+        result['index_bytes'] = index.write(index_file, _lookup.cache, _lookup.weights)
+        result['index_write_seconds'] = time.time() - start
+        _lookup = lookup.IndexLookup(index_file)
+        start = time.time()
+        _lookup.load()
+        result['index_map_seconds'] = time.time() - start
+
+    questions = queries(instances, layout, count)
+    for server_type in SERVERS:
+        server_class = server.Authoritative if server_type == 'authoritative' else server.Caching
+        srv = server_class(ZONE, REVERSE_ZONE, 300, _lookup, 'private', '')
+        calls = ec2.calls
+        result[server_type] = measure(srv, questions)
+        result[server_type]['ec2_calls'] = ec2.calls - calls
+    result['peak_rss_kb'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return result
+
+
+def main():
+    # optparse rather than argparse, which is not part of Python 2.6. Options taking several values are repeated.
+    parser = optparse.OptionParser(usage='%%prog [options]\n%s' % __doc__)
+    parser.add_option('--instances', type='int', action='append', help='fleet size, default: 1000, 10000, 100000')
+    parser.add_option('--layouts', type='choice', choices=LAYOUTS, action='append', help='default: all')
+    parser.add_option('--lookups', type='choice', choices=LOOKUPS, action='append', help='default: all')
+    parser.add_option('--queries', type='int', default=20000,
+                      help='queries per server type with cache and index lookups')
+    parser.add_option('--direct-queries', type='int', default=200,
+                      help='queries per server type with direct lookup, each of them queries EC2')
+    parser.add_option('--output', help='file to save the results to')
+    parser.add_option('--case', nargs=3, help=optparse.SUPPRESS_HELP)
+    args = parser.parse_args()[0]
+
+    if args.case:
+        instances, layout, lookup_type = int(args.case[0]), args.case[1], args.case[2]
+        count = args.direct_queries if lookup_type == 'direct' else args.queries
+        print json.dumps(run(instances, layout, lookup_type, count))
+        return
+
+    results = []
+    for instances in args.instances or [1000, 10000, 100000]:
+        for layout in args.layouts or LAYOUTS:
+            for lookup_type in args.lookups or LOOKUPS:
+                results.append(run_case(['-m', 'benchmarks.operate',
+                                         '--queries', str(args.queries),
+                                         '--direct-queries', str(args.direct_queries),
+                                         '--case', str(instances), layout, lookup_type]))
+    report = json.dumps({'python': platform.python_version(),
+                         'timestamp': int(time.time()),
+                         'results': results}, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(report)
+    print report
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+"""
+Benchmarks the startup of the Unbound module: importing unbound_ec2.script and running init, for every lookup
+type. Every case runs in a fresh process, so that imports are not cached and peak RSS is measured per case.
+Results are printed as JSON, and saved to --output to compare them between versions.
+
+    $ python -m benchmarks.startup --runs 10 --output results.json
+"""
+import optparse
+import json
+import os
+import platform
+import resource
+import sys
+import tempfile
+import time
+
+from benchmarks import run_case
+
+LOOKUPS = ['direct', 'cache', 'index']
+CONF = """[main]
+cache_ttl = 3600
+
+[lookup]
+type = %(lookup_type)s
+snapshot_file =
+index_file = %(index_file)s
+
+[ec2]
+aws_region = us-west-1
+"""
+
+
+def percentile(values, fraction):
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def run(lookup_type):
+    start = time.time()
+    import benchmarks
+    from unbound_ec2 import script
+    import_seconds = time.time() - start
+    boto_on_import = 'boto' in sys.modules
+
+    start = time.time()
+    script.init(0, None)
+    init_seconds = time.time() - start
+    result = {'lookup': lookup_type,
+              'import_seconds': import_seconds,
+              'init_seconds': init_seconds,
+              'startup_seconds': import_seconds + init_seconds,
+              'boto_imported': boto_on_import or 'boto' in sys.modules,
+              'peak_rss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss}
+    script.deinit(0)
+    return result
+
+
+def configure(directory, lookup_type):
+    """Writes a configuration file which keeps the refresh thread away from EC2 while startup is measured.
+
+    """
+    conf_file = os.path.join(directory, 'unbound_ec2.conf')
+    with open(conf_file, 'w') as f:
+        f.write(CONF % {'lookup_type': lookup_type, 'index_file': os.path.join(directory, 'startup.index')})
+    return conf_file
+
+
+def main():
+    # optparse rather than argparse, which is not part of Python 2.6
+    parser = optparse.OptionParser(usage='%%prog [options]\n%s' % __doc__)
+    parser.add_option('--lookups', type='choice', choices=LOOKUPS, action='append', help='default: all')
+    parser.add_option('--runs', type='int', default=5, help='processes started per lookup type')
+    parser.add_option('--output', help='file to save the results to')
+    parser.add_option('--case', help=optparse.SUPPRESS_HELP)
+    args = parser.parse_args()[0]
+
+    if args.case:
+        print json.dumps(run(args.case))
+        return
+
+    directory = tempfile.mkdtemp()
+    results = []
+    for lookup_type in args.lookups or LOOKUPS:
+        env = dict(os.environ, UNBOUND_EC2_CONF=configure(directory, lookup_type))
+        runs = [run_case(['-B', '-m', 'benchmarks.startup', '--case', lookup_type], env)
+                for i in xrange(args.runs)]
+        result = {'lookup': lookup_type,
+                  'runs': args.runs,
+                  'boto_imported': any(r['boto_imported'] for r in runs),
+                  'peak_rss_kb': max(r['peak_rss_kb'] for r in runs)}
+        for key in ['import_seconds', 'init_seconds', 'startup_seconds']:
+            values = sorted(r[key] for r in runs)
+            result[key] = {'median': percentile(values, 0.5), 'max': values[-1]}
+        results.append(result)
+    report = json.dumps({'python': platform.python_version(),
+                         'timestamp': int(time.time()),
+                         'results': results}, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(report)
+    print report
+
+
+if __name__ == '__main__':
+    main()
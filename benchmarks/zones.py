@@ -0,0 +1,64 @@
+"""
+Benchmarks Server.operate zone classification with many forwarded zones, comparing the label suffix index
+with the linear endswith scan it replaced.
+
+    $ python -m benchmarks.zones --zones 1000
+"""
+import optparse
+import json
+import timeit
+
+from benchmarks import unbound_stub
+from unbound_ec2 import server
+
+
+class Server(server.Authoritative):
+    def _operate_forward(self, _id, event, qstate, qdata, kind, zone):
+        qstate.ext_state[_id] = unbound_stub.MODULE_FINISHED
+        return True
+
+
+class LinearServer(Server):
+    def operate(self, _id, event, qstate, qdata):
+        qname = qstate.qinfo.qname_str
+        for x in self.forwarded_zones:
+            if qname.endswith(x):
+                return self.handle_pass(_id, event, qstate, qdata)
+        if qname.endswith(self.zone):
+            return self._operate_forward(_id, event, qstate, qdata, server.FORWARD_ZONE, self.zone)
+        if qname.endswith(self.reverse_zone):
+            return self._operate_forward(_id, event, qstate, qdata, server.REVERSE_ZONE, self.reverse_zone)
+        return self.handle_pass(_id, event, qstate, qdata)
+
+
+def measure(server_class, zones, queries, number):
+    forwarded_zones = ','.join('zone-%d.example.com' % i for i in range(zones))
+    srv = server_class('example.com', '10.in-addr.arpa', 300, None, 'private', forwarded_zones)
+    qstates = [unbound_stub.QueryState(qname, unbound_stub.RR_TYPE_A) for qname in queries]
+
+    def run():
+        for qstate in qstates:
+            srv.operate(0, unbound_stub.MODULE_EVENT_NEW, qstate, None)
+
+    seconds = min(timeit.repeat(run, number=number, repeat=3))
+    return {'queries_per_second': len(qstates) * number / seconds,
+            'microseconds_per_query': seconds * 1e6 / (len(qstates) * number)}
+
+
+def main():
+    # optparse rather than argparse, which is not part of Python 2.6
+    parser = optparse.OptionParser(usage='%%prog [options]\n%s' % __doc__)
+    parser.add_option('--zones', type='int', default=1000)
+    parser.add_option('--number', type='int', default=200)
+    args = parser.parse_args()[0]
+
+    queries = ['web-1.example.com.', 'web-1.zone-%d.example.com.' % (args.zones - 1), '1.0.0.10.in-addr.arpa.',
+               'www.google.com.']
+    print json.dumps({'zones': args.zones,
+                      'queries': queries,
+                      'linear': measure(LinearServer, args.zones, queries, args.number),
+                      'suffix_index': measure(Server, args.zones, queries, args.number)}, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -38,7 +38,7 @@ setup(name='unbound-ec2',
       author_email=__author_email__,
       url='https://github.com/unibet/unbound-ec2',
       download_url='https://github.com/unibet/unbound-ec2/tarball/%s' % (version),
-      packages=find_packages(exclude=['tests*']),
+      packages=find_packages(exclude=['tests*', 'benchmarks*']),
       zip_safe=False,
       test_suite="tests",
       setup_requires=[
@@ -56,7 +56,7 @@ setup(name='unbound-ec2',
           'data/unbound_ec2.conf.example',
           'data/default_unbound.example'
       ])],
-      scripts=[],
+      scripts=['data/unbound_ec2_worker'],
       license='Apache License 2.0',
       platforms = 'Posix; MacOS X',
       classifiers=[
@@ -23,6 +23,7 @@ attrs = {
     'MODULE_FINISHED': 'BOGUS_MODULE_FINISHED',
     'MODULE_ERROR': 'BOGUS_MODULE_ERROR',
     'RR_TYPE_A': 'BOGUS_RR_TYPE_A',
+    'RR_TYPE_AAAA': 'BOGUS_RR_TYPE_AAAA',
     'RR_TYPE_ANY': 'BOGUS_RR_TYPE_ANY',
     'RR_TYPE_PTR': 'BOGUS_RR_TYPE_PTR',
     'RR_TYPE_TXT': 'BOGUS_RR_TYPE_TXT',
@@ -31,7 +32,8 @@ attrs = {
     'PKT_RA': 999992,
     'PKT_AA': 999993,
     'RCODE_NOERROR': 'BOGUS_RCODE_NOERROR',
-    'RCODE_NXDOMAIN': 'BOGUS_RCODE_NXDOMAIN'
+    'RCODE_NXDOMAIN': 'BOGUS_RCODE_NXDOMAIN',
+    'RCODE_SERVFAIL': 'BOGUS_RCODE_SERVFAIL'
 }
 
 sys.modules['unboundmodule'] = mock.Mock(**attrs)
@@ -0,0 +1,38 @@
+from tests import unittest
+from tests import mock
+from unbound_ec2 import builder
+from unbound_ec2 import config
+from unbound_ec2 import lookup
+
+
+class TestBuilder(unittest.TestCase):
+    def setUp(self):
+        self.conf = config.UnboundEc2Conf()
+        self.conf.set_defaults()
+        self.conf.parse()
+        self.conf.lookup['snapshot_url'] = 'http://publisher.bogus.tld:9168/'
+        self.ec2 = mock.Mock()
+
+    def tearDown(self):
+        self.conf = None
+        self.ec2 = None
+
+    def test_direct_lookup(self):
+        self.assertIsInstance(builder.direct_lookup(self.conf, self.ec2), lookup.DirectLookup)
+
+    def test_cache_lookup(self):
+        _lookup = builder.cache_lookup(self.conf, self.ec2)
+        self.assertIsInstance(_lookup, lookup.CacheLookup)
+        self.assertEqual('http://publisher.bogus.tld:9168/', _lookup.snapshot_url)
+
+    def test_lazy_connection(self):
+        builder.EC2Connection = mock.MagicMock()
+        try:
+            connection = builder.LazyConnection('us-west-1')
+            self.assertFalse(builder.EC2Connection.called)
+            connection.get_all_reservations(filters={'instance-state-name': 'running'})
+            connection.get_all_reservations()
+            self.assertEqual(1, builder.EC2Connection.call_count)
+            self.assertEqual(2, builder.EC2Connection.return_value.get_all_reservations.call_count)
+        finally:
+            builder.EC2Connection = None
@@ -1,7 +1,11 @@
+import tempfile
+import shutil
+import time
 import os
 import ast
 
 from tests import unittest
+from tests import mock
 from unbound_ec2 import config
 
 
@@ -51,6 +55,11 @@ class TestConfig(unittest.TestCase):
         self.assertIn('type', self.config.lookup)
         self.assertIn('tag_name_include_domain', self.config.lookup)
         self.assertEqual(self.config.ec2['aws_region'], config.DEFAULT_AWS_REGION)
+        self.assertEqual(self.config.ec2['workers'], int(config.DEFAULT_EC2_WORKERS))
+        self.assertEqual(self.config.ec2['timeout'], int(config.DEFAULT_EC2_TIMEOUT))
+        self.assertEqual(self.config.ec2['rate'], int(config.DEFAULT_EC2_RATE))
+        self.assertEqual(self.config.ec2['retries'], int(config.DEFAULT_EC2_RETRIES))
+        self.assertEqual(self.config.ec2['circuit_threshold'], int(config.DEFAULT_EC2_CIRCUIT_THRESHOLD))
         self.assertEqual(self.config.main['zone'], config.DEFAULT_ZONE)
         self.assertEqual(self.config.main['reverse_zone'], config.DEFAULT_REVERSE_ZONE)
         self.assertEqual(self.config.main['ttl'], int(config.DEFAULT_TTL))
@@ -60,6 +69,34 @@ class TestConfig(unittest.TestCase):
         self.assertEqual(self.config.lookup['tag_name_include_domain'],
                          bool(config.DEFAULT_LOOKUP_TAG_NAME_INCLUDE_DOMAIN))
         self.assertEqual(self.config.lookup_filters, ast.literal_eval(config.DEFAULT_LOOKUP_FILTERS))
+        self.assertEqual(self.config.lookup['max_results'], int(config.DEFAULT_LOOKUP_MAX_RESULTS))
+        self.assertEqual(self.config.lookup['refresh'], config.DEFAULT_LOOKUP_REFRESH)
+        self.assertEqual(self.config.lookup['freshness'], int(config.DEFAULT_LOOKUP_FRESHNESS))
+        self.assertEqual(self.config.lookup['refresh_jitter'], float(config.DEFAULT_LOOKUP_REFRESH_JITTER))
+        self.assertFalse(self.config.lookup['refresh_min_interval'])
+        self.assertFalse(self.config.lookup['refresh_max_interval'])
+        self.assertEqual(self.config.lookup['refresh_max_backoff'], int(config.DEFAULT_LOOKUP_REFRESH_MAX_BACKOFF))
+        self.assertFalse(self.config.lookup['snapshot_file'])
+        self.assertEqual(self.config.lookup['snapshot_max_age'], int(config.DEFAULT_LOOKUP_SNAPSHOT_MAX_AGE))
+        self.assertFalse(self.config.lookup['interface_names'])
+        self.assertFalse(self.config.lookup['weight_tag'])
+        self.assertEqual(self.config.lookup['index_file'], config.DEFAULT_LOOKUP_INDEX_FILE)
+        self.assertEqual(self.config.lookup['index_check_interval'],
+                         int(config.DEFAULT_LOOKUP_INDEX_CHECK_INTERVAL))
+        self.assertEqual(self.config.server['answer_order'], config.DEFAULT_SERVER_ANSWER_ORDER)
+        self.assertFalse(self.config.server['max_answers'])
+        self.assertEqual(self.config.server['cache_size'], int(config.DEFAULT_SERVER_CACHE_SIZE))
+        self.assertEqual(self.config.server['loading'], config.DEFAULT_SERVER_LOADING)
+        self.assertEqual(self.config.main['negative_ttl'], int(config.DEFAULT_NEGATIVE_TTL))
+        self.assertFalse(self.config.events['enabled'])
+        self.assertEqual(self.config.events['port'], int(config.DEFAULT_EVENTS_PORT))
+        self.assertEqual(self.config.events['reconcile_ttl'], int(config.DEFAULT_EVENTS_RECONCILE_TTL))
+        self.assertFalse(self.config.metrics['enabled'])
+        self.assertEqual(self.config.metrics['port'], int(config.DEFAULT_METRICS_PORT))
+        self.assertFalse(self.config.publisher['enabled'])
+        self.assertEqual(self.config.publisher['port'], int(config.DEFAULT_PUBLISHER_PORT))
+        self.assertEqual(self.config.main['reload_interval'], int(config.DEFAULT_RELOAD_INTERVAL))
+        self.assertFalse(self.config.lookup['snapshot_url'])
 
     def test_set_defaults_env_overwrite(self):
         os.environ['UNBOUND_ZONE'] = 'BOGUS_TLD'
@@ -101,6 +138,8 @@ class TestConfig(unittest.TestCase):
         self.assertEqual(self.config.lookup['type'], 'BOGUS_LOOKUP_TYPE_FROM_FILE')
         self.assertEqual(self.config.lookup['tag_name_include_domain'], 'BOGUS_TAG_NAME_INCLUDE_DOMAIN_FROM_FILE')
         self.assertEqual(self.config.lookup_filters, {'bogus-key': 'bogus-value-from-file'})
+        self.assertEqual(self.config.zones, {'bogus.zone.from.file': {'ttl': 60,
+                                                                      'filters': {'vpc-id': 'bogus-vpc-from-file'}}})
 
     def test_parse_partial(self):
         fixture_conf_file = os.path.join(os.path.dirname(__file__), 'data', 'unbound_ec2_partial.conf')
@@ -133,3 +172,65 @@ class TestConfig(unittest.TestCase):
         self.assertEqual(self.config.lookup['tag_name_include_domain'],
                          bool(config.DEFAULT_LOOKUP_TAG_NAME_INCLUDE_DOMAIN))
         self.assertEqual(self.config.lookup_filters, ast.literal_eval(config.DEFAULT_LOOKUP_FILTERS))
+
+
+class TestConfigWatcher(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.conf_file = os.path.join(self.directory, 'unbound_ec2.conf')
+        self.write('[main]\nzone = bogus.tld\nttl = 300\n')
+        self.conf = self.parse()
+        self.reload = mock.Mock()
+        self.watcher = config.ConfigWatcher(self.conf, self.reload)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+        self.watcher = None
+
+    def write(self, content, mtime=None):
+        with open(self.conf_file, 'w') as f:
+            f.write(content)
+        mtime = mtime or time.time()
+        os.utime(self.conf_file, (mtime, mtime))
+
+    def parse(self):
+        conf = config.UnboundEc2Conf(self.conf_file)
+        conf.set_defaults()
+        conf.parse()
+        return conf
+
+    def test_modified(self):
+        self.assertFalse(self.conf.modified())
+        self.write('[main]\nzone = bogus.tld\nttl = 300\n', time.time() + 10)
+        self.assertTrue(self.conf.modified())
+        os.remove(self.conf_file)
+        self.assertTrue(self.conf.modified())
+
+    def test_diff(self):
+        self.assertEqual(set(), self.conf.diff(self.parse()))
+        self.write('[main]\nzone = bogus.tld\nttl = 60\n[lookup_filters]\nvpc-id = vpc-0\n'
+                   '[zone:other.tld]\nttl = 30\n')
+        self.assertEqual(set([('main', 'ttl'), ('lookup_filters', 'vpc-id'), ('zones', 'other.tld')]),
+                         self.conf.diff(self.parse()))
+
+    def test_check(self):
+        self.assertEqual(set(), self.watcher.check())
+        self.assertFalse(self.reload.called)
+
+        self.write('[main]\nzone = bogus.tld\nttl = 60\n', time.time() + 10)
+        self.assertEqual(set([('main', 'ttl')]), self.watcher.check())
+        current, conf, changed = self.reload.call_args[0]
+        self.assertIs(self.conf, current)
+        self.assertEqual(60, conf.main['ttl'])
+        self.assertIs(conf, self.watcher.conf)
+        self.assertEqual(set(), self.watcher.check())
+        self.assertEqual(1, self.reload.call_count)
+
+    def test_check_failed(self):
+        self.reload.side_effect = ValueError('bogus error')
+        self.write('[main]\nzone = bogus.tld\nttl = 60\n', time.time() + 10)
+        self.assertRaises(ValueError, self.watcher.check)
+        self.assertIs(self.conf, self.watcher.conf)
+        self.reload.side_effect = None
+        self.assertEqual(set([('main', 'ttl')]), self.watcher.check())
+
@@ -0,0 +1,115 @@
+from collections import namedtuple
+import threading
+import time
+
+from tests import unittest
+from tests import mock
+from unbound_ec2 import distribution
+from unbound_ec2 import lookup
+
+
+def mock_ec2(count):
+    reservation = namedtuple('Reservation', ('instances'))
+    instance = namedtuple('Instance', ('id', 'tags', 'private_ip_address'))
+    ec2 = mock.Mock()
+    ec2.get_all_reservations.return_value = [reservation(
+        [instance('id-%d' % i, {'Name': 'name-%d' % i}, '10.0.0.%d' % i) for i in xrange(count)])]
+    return ec2
+
+
+class TestDistribution(unittest.TestCase):
+    def setUp(self):
+        self.publisher_lookup = lookup.CacheLookup(mock_ec2(2), 'bogus.tld', {})
+        self.listener = distribution.SnapshotListener('127.0.0.1', 0, self.publisher_lookup)
+        self.listener.start()
+        self.url = 'http://127.0.0.1:%d/snapshot' % self.listener.server_address[1]
+        self.subscriber = lookup.CacheLookup(mock_ec2(3), 'bogus.tld', {}, snapshot_url=self.url)
+
+    def tearDown(self):
+        if self.listener:
+            self.listener.stop()
+        self.listener = None
+
+    def test_pull(self):
+        self.assertRaises(IOError, distribution.pull, self.url)
+        self.publisher_lookup.refresh()
+        etag, refreshed, body = distribution.pull(self.url)
+        self.assertTrue(etag)
+        self.assertEqual(self.publisher_lookup.refreshed, refreshed)
+        self.assertEqual((etag, refreshed, None), distribution.pull(self.url, etag))
+
+    def test_pull_during_refresh(self):
+        self.publisher_lookup.refresh()
+        etag = distribution.pull(self.url)[0]
+        ec2 = self.publisher_lookup.ec2
+        reservations = ec2.get_all_reservations.return_value
+        fetching, release = threading.Event(), threading.Event()
+
+        def slow_fetch(*args, **kwargs):
+            fetching.set()
+            release.wait()
+            return reservations[:0]
+        ec2.get_all_reservations.side_effect = slow_fetch
+        refresh = threading.Thread(target=self.publisher_lookup.refresh)
+        refresh.start()
+        try:
+            fetching.wait()
+            self.assertEqual(etag, distribution.pull(self.url, timeout=1)[0])
+        finally:
+            release.set()
+            refresh.join()
+        self.assertNotEqual(etag, distribution.pull(self.url)[0])
+
+    def test_refresh(self):
+        self.publisher_lookup.refresh()
+        changed = self.subscriber.refresh()
+        self.assertEqual(set(self.publisher_lookup.cache), changed)
+        self.assertEqual(self.publisher_lookup.cache, self.subscriber.cache)
+        self.assertTrue(self.subscriber.ready)
+        self.assertFalse(self.subscriber.ec2.get_all_reservations.called)
+
+        self.assertEqual(set(), self.subscriber.refresh())
+        self.publisher_lookup.ec2.get_all_reservations.return_value[0].instances.pop()
+        self.publisher_lookup.refresh()
+        self.assertEqual(set(['name-1.bogus.tld', 'id-1.bogus.tld', '1.0.0.10.in-addr.arpa']),
+                         self.subscriber.refresh())
+        self.assertFalse(self.subscriber.ec2.get_all_reservations.called)
+
+    def test_refresh_then_poll(self):
+        self.publisher_lookup.refresh()
+        self.subscriber.ec2.get_all_reservations.return_value[0].instances.pop()
+        self.subscriber.refresh()
+        self.assertEqual(self.publisher_lookup.hosts, self.subscriber.hosts)
+        self.assertEqual(self.publisher_lookup.host_regions, self.subscriber.host_regions)
+
+        self.subscriber.snapshot_url = None
+        self.assertEqual(set(), self.subscriber.refresh())
+        self.assertTrue(self.subscriber.ec2.get_all_reservations.called)
+
+    def test_refresh_corrupted(self):
+        self.publisher_lookup.refresh()
+        etag, body, refreshed = self.publisher_lookup.snapshot()
+        self.publisher_lookup.snapshot = mock.Mock(return_value=(etag, body[:-1] + 'X', refreshed))
+        self.subscriber.refresh()
+        self.assertTrue(self.subscriber.ec2.get_all_reservations.called)
+        self.assertIn('name-2.bogus.tld', self.subscriber.cache)
+
+    def test_refresh_stale(self):
+        self.publisher_lookup.refresh()
+        self.publisher_lookup.refreshed = time.time() - 7200
+        self.subscriber.refresh()
+        self.assertTrue(self.subscriber.ec2.get_all_reservations.called)
+        self.assertIn('name-2.bogus.tld', self.subscriber.cache)
+
+    def test_refresh_other_settings(self):
+        self.publisher_lookup.refresh()
+        self.subscriber.ttl = 60
+        self.subscriber.refresh()
+        self.assertTrue(self.subscriber.ec2.get_all_reservations.called)
+
+    def test_refresh_unavailable(self):
+        self.listener.stop()
+        self.listener = None
+        self.subscriber.refresh()
+        self.assertTrue(self.subscriber.ec2.get_all_reservations.called)
+        self.assertIn('name-2.bogus.tld', self.subscriber.cache)
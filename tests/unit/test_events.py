@@ -0,0 +1,109 @@
+import json
+import urllib2
+
+from tests import unittest
+from tests import mock
+from unbound_ec2 import events
+
+
+def state_change(instance_id, state):
+    return {'detail-type': 'EC2 Instance State-change Notification',
+            'source': 'aws.ec2',
+            'resources': ['arn:aws:ec2:us-west-1:123456789012:instance/%s' % instance_id],
+            'detail': {'instance-id': instance_id, 'state': state}}
+
+
+def tag_change(instance_id):
+    return {'detail-type': 'Tag Change on Resource',
+            'source': 'aws.tag',
+            'resources': ['arn:aws:ec2:us-west-1:123456789012:instance/%s' % instance_id],
+            'detail': {'changed-tag-keys': ['Name'], 'tags': {'Name': 'bogus-name'}}}
+
+
+class TestInstanceIds(unittest.TestCase):
+    def test_state_change(self):
+        self.assertEqual((set(['i-1']), set()), events.instance_ids(state_change('i-1', 'running')))
+        self.assertEqual((set(['i-1']), set()), events.instance_ids(state_change('i-1', 'stopped')))
+        self.assertEqual((set(), set(['i-1'])), events.instance_ids(state_change('i-1', 'terminated')))
+
+    def test_tag_change(self):
+        self.assertEqual((set(['i-1']), set()), events.instance_ids(tag_change('i-1')))
+
+    def test_unrelated(self):
+        self.assertEqual((set(), set()), events.instance_ids({'detail': {'bogus': 'bogus'}}))
+
+    def test_malformed(self):
+        for event in [['i-1'], {'detail': 'i-1'}, {'detail': {'instance-id': 1}}, {'resources': 'i-1'},
+                      {'resources': [None]}, {'detail': {'instance-id': u'i-\xe9'}}]:
+            self.assertRaises(ValueError, events.instance_ids, event)
+
+
+class TestEventApplier(unittest.TestCase):
+    def setUp(self):
+        self.invalidator = mock.Mock()
+        self.applier = events.EventApplier(self.invalidator)
+
+    def tearDown(self):
+        self.applier = None
+
+    def test_coalesce(self):
+        self.applier.feed(state_change('i-1', 'pending'))
+        self.applier.feed(state_change('i-1', 'running'))
+        self.applier.feed(tag_change('i-2'))
+        self.applier.feed(state_change('i-3', 'running'))
+        self.applier.feed(state_change('i-3', 'terminated'))
+        self.applier.start()
+        self.applier.stop()
+        self.invalidator.update.assert_called_once_with(set(['i-1', 'i-2']), set(['i-3']))
+
+    def test_error(self):
+        events.log_warn = mock.Mock()
+        self.invalidator.update.side_effect = ValueError('bogus error')
+        self.applier.apply([(set(['i-1']), set())])
+        self.assertTrue(events.log_warn.called)
+
+
+class TestEventListener(unittest.TestCase):
+    def setUp(self):
+        self.invalidator = mock.Mock()
+        self.listener = events.EventListener('127.0.0.1', 0, self.invalidator)
+        self.listener.start()
+        self.url = 'http://%s:%d/' % self.listener.server_address
+
+    def tearDown(self):
+        self.listener.stop()
+        self.listener = None
+
+    def feed(self, data):
+        return urllib2.urlopen(urllib2.Request(self.url, data, {'Content-Type': 'application/json'}))
+
+    def test_feed(self):
+        self.assertEqual(202, self.feed(json.dumps([state_change('i-1', 'running'), tag_change('i-2')])).getcode())
+        self.assertEqual(202, self.feed(json.dumps(state_change('i-3', 'terminated'))).getcode())
+        self.listener.applier.stop()
+        updated = set()
+        removed = set()
+        for call in self.invalidator.update.call_args_list:
+            updated.update(call[0][0])
+            removed.update(call[0][1])
+        self.assertEqual(set(['i-1', 'i-2']), updated)
+        self.assertEqual(set(['i-3']), removed)
+        self.listener.applier.stop = mock.Mock()
+
+    def test_feed_malformed(self):
+        events.log_warn = mock.Mock()
+        batch = [state_change('i-1', 'running'), ['bogus'], {'detail': 'bogus'}, {'detail': {'instance-id': 1}},
+                 tag_change('i-2')]
+        self.assertEqual(202, self.feed(json.dumps(batch)).getcode())
+        self.listener.applier.stop()
+        updated = set()
+        for call in self.invalidator.update.call_args_list:
+            updated.update(call[0][0])
+        self.assertEqual(set(['i-1', 'i-2']), updated)
+        self.assertEqual(3, events.log_warn.call_count)
+        self.listener.applier.stop = mock.Mock()
+
+    def test_feed_invalid(self):
+        with self.assertRaises(urllib2.HTTPError) as context:
+            self.feed('bogus')
+        self.assertEqual(400, context.exception.code)
@@ -0,0 +1,48 @@
+from tests import unittest
+from tests import mock
+from unbound_ec2 import expiring
+
+
+class TestExpiringDict(unittest.TestCase):
+    def setUp(self):
+        self.time = mock.patch('time.time', return_value=1000.0)
+        self.time.start()
+        self.expiring = expiring.ExpiringDict(3, 10)
+
+    def tearDown(self):
+        self.time.stop()
+        self.expiring = None
+
+    def test_set_get(self):
+        self.expiring.set('bogus-key', 'bogus-value')
+        self.assertIn('bogus-key', self.expiring)
+        self.assertEqual('bogus-value', self.expiring.get('bogus-key'))
+        self.assertEqual('bogus-value', self.expiring.pop('bogus-key'))
+        self.assertNotIn('bogus-key', self.expiring)
+        self.assertIsNone(self.expiring.pop('bogus-key'))
+
+    def test_expire(self):
+        self.expiring.set('bogus-key', 'bogus-value')
+        with mock.patch('time.time', return_value=1010.0):
+            self.assertNotIn('bogus-key', self.expiring)
+            self.assertIsNone(self.expiring.get('bogus-key'))
+            self.expiring.set('other-key', 'other-value')
+        self.assertEqual(1, len(self.expiring))
+
+    def test_evict(self):
+        for i in range(3):
+            self.expiring.set(i, i)
+        self.expiring.set(0, 0)
+        self.expiring.set(3, 3)
+        self.assertEqual(3, len(self.expiring))
+        self.assertNotIn(1, self.expiring)
+        self.assertIn(0, self.expiring)
+        for i in range(100):
+            self.expiring.set(0, i)
+        self.assertLessEqual(len(self.expiring.order), 6)
+        self.assertEqual(99, self.expiring.get(0))
+
+    def test_clear(self):
+        self.expiring.set('bogus-key', 'bogus-value')
+        self.expiring.clear()
+        self.assertEqual(0, len(self.expiring))
@@ -0,0 +1,52 @@
+import tempfile
+import shutil
+import os
+
+from tests import unittest
+from unbound_ec2 import index
+
+
+class TestIndex(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.index_file = os.path.join(self.directory, 'bogus.index')
+        self.answers = dict(('name-%d.bogus.tld' % i, ('name-%d.bogus.tld. 300 IN A 10.0.0.%d' % (i, i),))
+                            for i in xrange(100))
+        self.answers['web.bogus.tld'] = ('web.bogus.tld. 300 IN A 10.0.1.1', 'web.bogus.tld. 300 IN A 10.0.1.2')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_write(self):
+        size = index.write(self.index_file, self.answers, {'web.bogus.tld': (1, 2.5)}, 7)
+        self.assertEqual(size, os.path.getsize(self.index_file))
+        self.assertFalse(os.path.exists('%s.tmp' % self.index_file))
+        current = index.Index(self.index_file)
+        self.assertEqual(7, current.generation)
+        self.assertEqual(len(self.answers), len(current))
+        for name, records in self.answers.iteritems():
+            self.assertEqual(records, current.get(name))
+        self.assertEqual((), current.get('missing.bogus.tld'))
+        self.assertEqual((1.0, 2.5), current.weights.get('web.bogus.tld'))
+        self.assertIsNone(current.weights.get('name-1.bogus.tld'))
+        self.assertEqual(sorted(self.answers), sorted(current.names()))
+        self.assertIsNone(current.changes())
+
+    def test_changes(self):
+        index.write(self.index_file, self.answers, generation=2, previous=1, changes=set(['web.bogus.tld']))
+        current = index.Index(self.index_file)
+        self.assertEqual(1, current.previous)
+        self.assertEqual(set(['web.bogus.tld']), current.changes())
+        index.write(self.index_file, {}, generation=3, previous=2, changes=set())
+        current = index.Index(self.index_file)
+        self.assertEqual(set(), current.changes())
+        self.assertEqual((), current.get('web.bogus.tld'))
+
+    def test_invalid(self):
+        with open(self.index_file, 'wb') as f:
+            f.write('bogus')
+        self.assertRaises(index.IndexFormatError, index.Index, self.index_file)
+        index.write(self.index_file, self.answers)
+        with open(self.index_file, 'ab') as f:
+            f.write('bogus')
+        self.assertRaises(index.IndexFormatError, index.Index, self.index_file)
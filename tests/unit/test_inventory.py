@@ -0,0 +1,96 @@
+from collections import namedtuple
+import threading
+
+from tests import unittest
+from tests import mock
+from unbound_ec2 import inventory
+
+reservation = namedtuple('Reservation', ('instances'))
+
+
+class Page(list):
+    next_token = None
+
+
+def page(ids, token=None):
+    result = Page([reservation(['id-%s' % i]) for i in ids])
+    result.next_token = token
+    return result
+
+
+class TestInstances(unittest.TestCase):
+    def setUp(self):
+        self.ec2 = mock.Mock()
+        self.filters = {'bogus-filter': 'bogus-value'}
+
+    def tearDown(self):
+        self.ec2 = None
+
+    def test_single_call(self):
+        self.ec2.get_all_reservations.return_value = page([0, 1], 'bogus-token')
+        self.assertEqual(['id-0', 'id-1'], list(inventory.instances(self.ec2, self.filters)))
+        self.ec2.get_all_reservations.assert_called_once_with(filters=self.filters)
+
+    def test_paginated(self):
+        pages = {None: page([0, 1], 'token-1'), 'token-1': page([2, 3], 'token-2'), 'token-2': page([4])}
+        self.ec2.get_all_reservations.side_effect = \
+            lambda filters, max_results, next_token=None: pages[next_token]
+        self.assertEqual(['id-%d' % i for i in range(5)], list(inventory.instances(self.ec2, self.filters, 2)))
+        self.assertEqual(3, self.ec2.get_all_reservations.call_count)
+        self.ec2.get_all_reservations.assert_called_with(filters=self.filters, max_results=2, next_token='token-2')
+
+    def test_paginated_error(self):
+        def get_all_reservations(filters, max_results, next_token=None):
+            if next_token:
+                raise ValueError('bogus error')
+            return page([0], 'token-1')
+
+        self.ec2.get_all_reservations.side_effect = get_all_reservations
+        instances = inventory.instances(self.ec2, self.filters, 1)
+        self.assertEqual('id-0', next(instances))
+        self.assertRaises(ValueError, next, instances)
+
+    def test_next_token(self):
+        self.assertIsNone(inventory.next_token(mock.MagicMock()))
+        self.assertIsNone(inventory.next_token([]))
+        self.assertEqual('bogus-token', inventory.next_token(page([], 'bogus-token')))
+
+
+class TestFleet(unittest.TestCase):
+    def setUp(self):
+        self.connections = {}
+        for region, ids in (('region-a', [0, 1]), ('region-b', [2])):
+            self.connections[region] = mock.Mock()
+            self.connections[region].get_all_reservations.return_value = page(ids)
+        self.filters = {'bogus-filter': 'bogus-value'}
+
+    def tearDown(self):
+        self.connections = None
+
+    def test_single_region(self):
+        fleet = inventory.Fleet({None: self.connections['region-a']})
+        self.assertEqual({None: ['ID-0', 'ID-1']}, fleet.fetch(self.filters, transform=str.upper))
+
+    def test_regions(self):
+        fleet = inventory.Fleet(self.connections, workers=1)
+        self.assertEqual({'region-a': ['id-0', 'id-1'], 'region-b': ['id-2']}, fleet.fetch(self.filters))
+        for ec2 in self.connections.values():
+            ec2.get_all_reservations.assert_called_once_with(filters=self.filters)
+
+    def test_failed_region(self):
+        self.connections['region-b'].get_all_reservations.side_effect = ValueError('bogus error')
+        fleet = inventory.Fleet(self.connections)
+        self.assertEqual({'region-a': ['id-0', 'id-1'], 'region-b': None}, fleet.fetch(self.filters))
+
+    def test_timeout(self):
+        event = threading.Event()
+        self.connections['region-b'].get_all_reservations.side_effect = lambda filters: event.wait(5)
+        fleet = inventory.Fleet(self.connections, timeout=0.1)
+        self.assertEqual({'region-a': ['id-0', 'id-1'], 'region-b': None}, fleet.fetch(self.filters))
+        event.set()
+
+    def test_all_failed(self):
+        for ec2 in self.connections.values():
+            ec2.get_all_reservations.side_effect = ValueError('bogus error')
+        fleet = inventory.Fleet(self.connections)
+        self.assertRaises(inventory.FetchError, fleet.fetch, self.filters)
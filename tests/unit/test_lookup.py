@@ -1,9 +1,15 @@
 from collections import namedtuple
-import itertools
+import tempfile
+import threading
+import shutil
+import time
+import os
 
 from tests import unittest
 from tests import mock
 from unbound_ec2 import lookup
+from unbound_ec2 import inventory
+from unbound_ec2 import index
 from unbound_ec2 import config
 
 RESERVATION_COUNT = 2
@@ -25,7 +31,7 @@ class TestDirectLookup(unittest.TestCase):
     def setUp(self):
         self.zone = '.bogus.tld'
         self.domain = self.zone.strip('.')
-        self.directlookup = lookup.DirectLookup(mock_ec2(), self.zone, config.DEFAULT_LOOKUP_FILTERS)
+        self.directlookup = lookup.DirectLookup(mock_ec2(), self.zone, {'instance-state-name': 'running'})
 
     def tearDown(self):
         self.directlookup = None
@@ -39,10 +45,337 @@ class TestDirectLookup(unittest.TestCase):
 
     def test_lookup(self):
         for i in xrange(RESERVATION_COUNT):
-            instances = self.directlookup.lookup('id-%d.%s' % (i, self.domain))
-            for instance in itertools.chain(instances):
-                self.assertEqual('id-%d' % i, instance.id)
-                self.assertEqual('name-%d' % i, instance.tags['Name'])
+            records = self.directlookup.lookup('id-%d.%s' % (i, self.domain))
+            self.assertEqual(('id-%d.%s. 300 IN A 192.168.1.%d' % (i, self.domain, i),), records)
+            records = self.directlookup.lookup('%d.1.168.192.in-addr.arpa.' % i)
+            self.assertEqual(('%d.1.168.192.in-addr.arpa. 300 IN PTR name-%d.%s.' % (i, i, self.domain),), records)
+
+    def test_lookup_ip_order(self):
+        instance = namedtuple('Instance', ('id', 'tags', 'private_ip_address', 'ip_address'))
+        reservation = namedtuple('Reservation', ('instances'))
+        self.directlookup.ec2.get_all_reservations.return_value = [reservation([
+            instance('id-0', {'Name': 'name-0.%s' % self.domain}, '10.0.0.1', '54.0.0.1')])]
+        self.assertEqual(('name-0.%s. 300 IN A 10.0.0.1' % self.domain,),
+                         self.directlookup.lookup('name-0.%s.' % self.domain))
+        self.directlookup.ip_order = 'public'
+        self.directlookup.ttl = 60
+        self.directlookup.zones[0].ttl = 60
+        self.assertEqual(('name-0.%s. 60 IN A 54.0.0.1' % self.domain,),
+                         self.directlookup.lookup('name-0.%s.' % self.domain))
+        self.assertEqual(('1.0.0.10.in-addr.arpa. 60 IN PTR name-0.%s.' % self.domain,),
+                         self.directlookup.lookup('1.0.0.10.in-addr.arpa.'))
+
+    def test_lookup_not_found(self):
+        self.assertEqual((), self.directlookup.lookup('bogus.%s.' % self.domain))
+
+    def test_lookup_narrowed(self):
+        ec2 = self.directlookup.ec2
+        self.directlookup.lookup('name-0.%s.' % self.domain)
+        ec2.get_all_reservations.assert_called_once_with(filters={
+            'instance-state-name': 'running',
+            'tag:Name': ['name-0.%s' % self.domain, 'name-0.%s,*' % self.domain, '*,name-0.%s' % self.domain,
+                         '*,name-0.%s,*' % self.domain, 'name-0', 'name-0,*', '*,name-0', '*,name-0,*']})
+
+        ec2.get_all_reservations.reset_mock()
+        self.directlookup.lookup('i-0123abcd.%s.' % self.domain)
+        ec2.get_all_reservations.assert_called_once_with(filters={'instance-state-name': 'running',
+                                                                  'instance-id': ['i-0123abcd']})
+
+        ec2.get_all_reservations.reset_mock()
+        self.directlookup.lookup('1.0.0.10.in-addr.arpa.')
+        ec2.get_all_reservations.assert_any_call(filters={'instance-state-name': 'running',
+                                                          'network-interface.addresses.private-ip-address': ['10.0.0.1']})
+        ec2.get_all_reservations.assert_any_call(filters={
+            'instance-state-name': 'running',
+            'tag:Address': ['10.0.0.1', '10.0.0.1,*', '*,10.0.0.1', '*,10.0.0.1,*']})
+
+        ec2.get_all_reservations.reset_mock()
+        self.assertEqual((), self.directlookup.lookup('0.10.in-addr.arpa.'))
+        self.assertEqual((), self.directlookup.lookup('*.%s.' % self.domain))
+        self.assertFalse(ec2.get_all_reservations.called)
+
+    def test_lookup_listed_name(self):
+        instance = namedtuple('Instance', ('id', 'tags', 'private_ip_address'))
+        reservation = namedtuple('Reservation', ('instances'))
+        ec2 = self.directlookup.ec2
+        ec2.get_all_reservations.return_value = [reservation([
+            instance('id-0', {'Name': 'web.%s,www.%s' % (self.domain, self.domain)}, '10.0.0.1'),
+            instance('id-1', {'Name': 'db.%s,other.tld' % self.domain}, '10.0.0.2')])]
+        directlookup = lookup.DirectLookup(ec2, self.zone, {}, tag_name_include_domain=True)
+        self.assertEqual(('web.%s. 300 IN A 10.0.0.1' % self.domain,),
+                         directlookup.lookup('web.%s.' % self.domain))
+        self.assertIn('web.%s,*' % self.domain, ec2.get_all_reservations.call_args[1]['filters']['tag:Name'])
+        # Name tags which do not end with the domain are excluded, as they are from the cache
+        self.assertEqual((), directlookup.lookup('db.%s.' % self.domain))
+
+    def test_lookup_configured_filter(self):
+        instance = namedtuple('Instance', ('id', 'tags', 'private_ip_address'))
+        reservation = namedtuple('Reservation', ('instances'))
+        ec2 = self.directlookup.ec2
+        ec2.get_all_reservations.return_value = [reservation([
+            instance('id-0', {'Name': 'web-1'}, '10.0.0.1'),
+            instance('id-1', {'Name': 'staging-1'}, '10.0.0.2')])]
+        _filter = {'tag:Name': 'web*', 'network-interface.addresses.private-ip-address': '10.0.0.*'}
+        directlookup = lookup.DirectLookup(ec2, self.zone, _filter)
+        self.assertEqual(('web-1.%s. 300 IN A 10.0.0.1' % self.domain,),
+                         directlookup.lookup('web-1.%s.' % self.domain))
+        self.assertEqual((), directlookup.lookup('staging-1.%s.' % self.domain))
+
+        ec2.get_all_reservations.reset_mock()
+        directlookup.lookup('2.0.0.10.in-addr.arpa.')
+        ec2.get_all_reservations.assert_any_call(filters=_filter)
+
+    def test_lookup_original_case(self):
+        instance = namedtuple('Instance', ('id', 'tags', 'private_ip_address'))
+        reservation = namedtuple('Reservation', ('instances'))
+        ec2 = self.directlookup.ec2
+        ec2.get_all_reservations.return_value = [reservation([instance('id-0', {'Name': 'Web-01'}, '10.0.0.1')])]
+        self.assertEqual(('web-01.%s. 300 IN A 10.0.0.1' % self.domain,),
+                         self.directlookup.lookup('Web-01.%s.' % self.domain.upper()))
+        values = ec2.get_all_reservations.call_args[1]['filters']['tag:Name']
+        self.assertIn('Web-01', values)
+        self.assertIn('web-01', values)
+        self.assertIn('Web-01.%s' % self.domain.upper(), values)
+
+    def test_lookup_freshness(self):
+        ec2 = self.directlookup.ec2
+        self.directlookup.lookup('id-0.%s.' % self.domain)
+        self.directlookup.lookup('id-0.%s.' % self.domain)
+        self.assertEqual(2, ec2.get_all_reservations.call_count)
+        self.directlookup.freshness = 60
+        self.directlookup.flights.clear()
+        records = self.directlookup.lookup('id-0.%s.' % self.domain)
+        self.assertEqual(records, self.directlookup.lookup('id-0.%s.' % self.domain))
+        self.assertEqual(3, ec2.get_all_reservations.call_count)
+
+    def test_lookup_single_flight(self):
+        started = threading.Event()
+        release = threading.Event()
+        reservations = self.directlookup.ec2.get_all_reservations.return_value
+
+        def get_all_reservations(filters):
+            started.set()
+            release.wait(5)
+            return reservations
+
+        self.directlookup.ec2.get_all_reservations.side_effect = get_all_reservations
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(
+            self.directlookup.lookup('id-0.%s.' % self.domain))) for i in range(4)]
+        threads[0].start()
+        started.wait(5)
+        for thread in threads[1:]:
+            thread.start()
+        # Give the other lookups time to join the query in flight
+        time.sleep(0.1)
+        release.set()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(1, self.directlookup.ec2.get_all_reservations.call_count)
+        self.assertEqual([('id-0.%s. 300 IN A 192.168.1.0' % self.domain,)] * 4, results)
+
+    def test_lookup_error(self):
+        self.directlookup.ec2.get_all_reservations.side_effect = ValueError('bogus error')
+        self.assertRaises(ValueError, self.directlookup.lookup, 'id-0.%s.' % self.domain)
+        self.directlookup.ec2.get_all_reservations.side_effect = None
+        self.assertTrue(self.directlookup.lookup('id-0.%s.' % self.domain))
+
+    def test_lookup_error_fallback(self):
+        records = self.directlookup.lookup('id-0.%s.' % self.domain)
+        self.assertTrue(records)
+        self.directlookup.ec2.get_all_reservations.side_effect = ValueError('bogus error')
+        self.assertEqual(records, self.directlookup.lookup('id-0.%s.' % self.domain))
+        self.assertEqual(records, self.directlookup.lookup('id-0.%s.' % self.domain))
+        self.assertEqual(3, self.directlookup.ec2.get_all_reservations.call_count)
+
+
+class TestIpv6Lookup(unittest.TestCase):
+    def setUp(self):
+        instance = namedtuple('Instance', ('id', 'tags', 'private_ip_address', 'interfaces'))
+        interface = namedtuple('Interface', ('ipv6Address'))
+        reservation = namedtuple('Reservation', ('instances'))
+        ec2 = mock.Mock()
+        ec2.get_all_reservations.return_value = [reservation([
+            instance('id-0', {'Name': 'web'}, '10.0.0.1', [interface('2001:db8::1')]),
+            instance('id-1', {'Name': 'db', 'Address': '10.0.1.1,2001:db8::2'}, '10.0.0.2', [])])]
+        self.lookup = lookup.DirectLookup(ec2, 'bogus.tld', {})
+
+    def tearDown(self):
+        self.lookup = None
+
+    def test_resolve(self):
+        resolve = self.lookup.resolve()
+        self.assertEqual(('web.bogus.tld. 300 IN A 10.0.0.1', 'web.bogus.tld. 300 IN AAAA 2001:db8::1'),
+                         resolve['web.bogus.tld'])
+        self.assertEqual(('1.0.0.0.0.0.0.0.0.0.0.0.0.0.0.0.0.0.0.0.0.0.0.0.8.b.d.0.1.0.0.2.ip6.arpa. 300 IN PTR '
+                          'web.bogus.tld.',),
+                         resolve['1.0.0.0.0.0.0.0.0.0.0.0.0.0.0.0.0.0.0.0.0.0.0.0.8.b.d.0.1.0.0.2.ip6.arpa'])
+        self.assertEqual(('db.bogus.tld. 300 IN A 10.0.1.1', 'db.bogus.tld. 300 IN AAAA 2001:db8::2'),
+                         resolve['db.bogus.tld'])
+        self.assertIn('2.0.0.0.0.0.0.0.0.0.0.0.0.0.0.0.0.0.0.0.0.0.0.0.8.b.d.0.1.0.0.2.ip6.arpa', resolve)
+
+    def test_canonical(self):
+        self.assertEqual('web-01.bogus.tld', lookup.canonical(' Web-01.Bogus.TLD. '))
+        self.assertEqual('xn--bcher-kva.bogus.tld', lookup.canonical(u'B\xfccher.bogus.tld'))
+        self.assertIsInstance(lookup.canonical(u'web'), str)
+        self.assertIsNone(lookup.canonical(u'\xfc' * 64))
+
+    def test_resolve_canonical(self):
+        instance = namedtuple('Instance', ('id', 'tags', 'private_ip_address'))
+        reservation = namedtuple('Reservation', ('instances'))
+        self.lookup.ec2.get_all_reservations.return_value = [reservation([
+            instance('id-0', {'Name': u'Web-01,B\xfccher'}, '10.0.0.1')])]
+        resolve = self.lookup.resolve()
+        self.assertEqual(('web-01.bogus.tld. 300 IN A 10.0.0.1',), resolve['web-01.bogus.tld'])
+        self.assertIn('xn--bcher-kva.bogus.tld', resolve)
+        self.assertEqual(('1.0.0.10.in-addr.arpa. 300 IN PTR web-01.bogus.tld.',), resolve['1.0.0.10.in-addr.arpa'])
+
+    def test_reverse6(self):
+        name = lookup.reverse6('2001:db8::1')
+        self.assertEqual('1.0.0.0.0.0.0.0.0.0.0.0.0.0.0.0.0.0.0.0.0.0.0.0.8.b.d.0.1.0.0.2.ip6.arpa', name)
+        self.assertEqual('2001:db8::1', lookup.unreverse6(name))
+        self.assertIsNone(lookup.unreverse6('8.b.d.0.1.0.0.2.ip6.arpa'))
+        self.assertIsNone(lookup.unreverse6('x' + name[1:]))
+
+    def test_lookup_narrowed(self):
+        self.lookup.lookup(lookup.reverse6('2001:db8::1') + '.')
+        self.lookup.ec2.get_all_reservations.assert_any_call(filters={
+            'network-interface.ipv6-addresses.ipv6-address': ['2001:db8::1']})
+
+
+    def test_invalid_address_tag(self):
+        instance = namedtuple('Instance', ('id', 'tags', 'private_ip_address'))
+        reservation = namedtuple('Reservation', ('instances'))
+        ec2 = mock.Mock()
+        ec2.get_all_reservations.return_value = [reservation([
+            instance('id-0', {'Name': 'web', 'Address': u'fe80::zz,10.0.0.9,10.0.0.x,\xe9'}, '10.0.0.1'),
+            instance('id-1', {'Name': 'db'}, '10.0.0.2')])]
+        lookup.log_warn = mock.Mock()
+        cachelookup = lookup.CacheLookup(ec2, 'bogus.tld', {})
+        cachelookup.refresh()
+        self.assertTrue(cachelookup.ready)
+        self.assertTrue(lookup.log_warn.called)
+        self.assertEqual(('web.bogus.tld. 300 IN A 10.0.0.9',), cachelookup.lookup('web.bogus.tld.'))
+        self.assertEqual(('db.bogus.tld. 300 IN A 10.0.0.2',), cachelookup.lookup('db.bogus.tld.'))
+
+
+class TestInterfaceLookup(unittest.TestCase):
+    def setUp(self):
+        instance = namedtuple('Instance', ('id', 'tags', 'private_ip_address', 'interfaces'))
+        interface = namedtuple('Interface', ('id', 'attachment', 'private_ip_addresses'))
+        ipv6_interface = namedtuple('Interface', ('id', 'ipv6Address', 'private_ip_address'))
+        attachment = namedtuple('Attachment', ('device_index'))
+        address = namedtuple('PrivateIPAddress', ('private_ip_address'))
+        reservation = namedtuple('Reservation', ('instances'))
+        ec2 = mock.Mock()
+        ec2.get_all_reservations.return_value = [reservation([
+            instance('id-0', {'Name': 'web'}, '10.0.0.1', [
+                interface('eni-1', attachment(1), [address('10.0.1.1'), address('10.0.1.2')]),
+                interface('eni-0', attachment(0), [address('10.0.0.1'), address('10.0.0.9')]),
+                ipv6_interface(None, '2001:db8::1', '10.0.0.1')])])]
+        self.lookup = lookup.DirectLookup(ec2, 'bogus.tld', {})
+
+    def tearDown(self):
+        self.lookup = None
+
+    def test_resolve(self):
+        resolve = self.lookup.resolve()
+        self.assertEqual(('web.bogus.tld. 300 IN A 10.0.0.1', 'web.bogus.tld. 300 IN AAAA 2001:db8::1'),
+                         resolve['web.bogus.tld'])
+        for reversed_address in ['1.0.0.10.in-addr.arpa', '9.0.0.10.in-addr.arpa', '1.1.0.10.in-addr.arpa',
+                                 '2.1.0.10.in-addr.arpa']:
+            self.assertEqual(('%s. 300 IN PTR web.bogus.tld.' % reversed_address,), resolve[reversed_address])
+        self.assertNotIn('web-eth1.bogus.tld', resolve)
+
+    def test_resolve_interface_names(self):
+        self.lookup.interface_names = True
+        resolve = self.lookup.resolve()
+        self.assertEqual(('web.bogus.tld. 300 IN A 10.0.0.1', 'web.bogus.tld. 300 IN AAAA 2001:db8::1'),
+                         resolve['web.bogus.tld'])
+        self.assertEqual(('web-eth0.bogus.tld. 300 IN A 10.0.0.1', 'web-eth0.bogus.tld. 300 IN A 10.0.0.9'),
+                         resolve['web-eth0.bogus.tld'])
+        self.assertNotIn('None.bogus.tld', resolve)
+        self.assertEqual(('web-eth1.bogus.tld. 300 IN A 10.0.1.1', 'web-eth1.bogus.tld. 300 IN A 10.0.1.2'),
+                         resolve['web-eth1.bogus.tld'])
+        self.assertEqual(('eni-1.bogus.tld. 300 IN A 10.0.1.1', 'eni-1.bogus.tld. 300 IN A 10.0.1.2'),
+                         resolve['eni-1.bogus.tld'])
+        self.assertIn('web-eth0.bogus.tld', resolve)
+        self.assertEqual(('1.0.0.10.in-addr.arpa. 300 IN PTR web.bogus.tld.',), resolve['1.0.0.10.in-addr.arpa'])
+        self.assertEqual(('9.0.0.10.in-addr.arpa. 300 IN PTR web-eth0.bogus.tld.',),
+                         resolve['9.0.0.10.in-addr.arpa'])
+        self.assertEqual(('2.1.0.10.in-addr.arpa. 300 IN PTR web-eth1.bogus.tld.',),
+                         resolve['2.1.0.10.in-addr.arpa'])
+
+    def test_lookup_narrowed(self):
+        self.lookup.interface_names = True
+        self.assertEqual(('web-eth1.bogus.tld. 300 IN A 10.0.1.1', 'web-eth1.bogus.tld. 300 IN A 10.0.1.2'),
+                         self.lookup.lookup('web-eth1.bogus.tld.'))
+        self.lookup.ec2.get_all_reservations.assert_any_call(filters={
+            'tag:Name': ['web-eth1.bogus.tld', 'web-eth1.bogus.tld,*', '*,web-eth1.bogus.tld',
+                         '*,web-eth1.bogus.tld,*', 'web-eth1', 'web-eth1,*', '*,web-eth1', '*,web-eth1,*',
+                         'web.bogus.tld', 'web.bogus.tld,*', '*,web.bogus.tld', '*,web.bogus.tld,*',
+                         'web', 'web,*', '*,web', '*,web,*']})
+        self.lookup.lookup('eni-1.bogus.tld.')
+        self.lookup.ec2.get_all_reservations.assert_any_call(filters={
+            'network-interface.network-interface-id': ['eni-1']})
+
+
+class TestMultiZoneLookup(unittest.TestCase):
+    def setUp(self):
+        instance = namedtuple('Instance', ('id', 'tags', 'private_ip_address', 'vpc_id'))
+        reservation = namedtuple('Reservation', ('instances'))
+        ec2 = mock.Mock()
+        ec2.get_all_reservations.return_value = [reservation([
+            instance('id-0', {'Name': 'web', 'Env': 'prod'}, '10.0.0.1', 'vpc-a'),
+            instance('id-1', {'Name': 'db.b.tld'}, '172.16.0.1', 'vpc-b'),
+            instance('id-2', {'Name': 'db.b.tld'}, '172.16.0.2', 'vpc-a'),
+            instance('id-3', {'Name': 'cache.sub.a.tld'}, '10.0.0.3', 'vpc-a')])]
+        zones = {'a.tld': {'filters': {'vpc-id': 'vpc-a'}},
+                 'b.tld.': {'ttl': 60, 'filters': {'vpc-id': ['vpc-b', 'vpc-c']}},
+                 'prod.tld': {'filters': {'tag:Env': 'pro*'}}}
+        self.lookup = lookup.DirectLookup(ec2, 'a.tld,b.tld,prod.tld,sub.a.tld', {}, True, zones=zones)
+
+    def tearDown(self):
+        self.lookup = None
+
+    def test_filter(self):
+        self.assertEqual(['*a.tld', '*b.tld', '*prod.tld', '*sub.a.tld'], self.lookup.filter['tag:Name'])
+        self.assertEqual(['Env'], self.lookup.filter_tags)
+
+    def test_resolve(self):
+        resolve = self.lookup.resolve()
+        self.lookup.ec2.get_all_reservations.assert_called_once_with(filters=self.lookup.filter)
+        self.assertEqual(('web.a.tld. 300 IN A 10.0.0.1',), resolve['web.a.tld'])
+        self.assertEqual(('web.prod.tld. 300 IN A 10.0.0.1',), resolve['web.prod.tld'])
+        self.assertEqual(('web.sub.a.tld. 300 IN A 10.0.0.1',), resolve['web.sub.a.tld'])
+        self.assertNotIn('web.b.tld', resolve)
+        self.assertEqual(('db.b.tld. 60 IN A 172.16.0.1',), resolve['db.b.tld'])
+        self.assertEqual(('id-1.b.tld. 60 IN A 172.16.0.1',), resolve['id-1.b.tld'])
+        self.assertNotIn('id-1.a.tld', resolve)
+        self.assertNotIn('id-2.b.tld', resolve)
+        self.assertEqual(('id-2.a.tld. 300 IN A 172.16.0.2',), resolve['id-2.a.tld'])
+        self.assertEqual(('2.0.16.172.in-addr.arpa. 300 IN PTR id-2.a.tld.',), resolve['2.0.16.172.in-addr.arpa'])
+        self.assertEqual(('cache.sub.a.tld. 300 IN A 10.0.0.3',), resolve['cache.sub.a.tld'])
+        self.assertNotIn('cache.sub.a.tld.a.tld', resolve)
+        self.assertEqual(('1.0.0.10.in-addr.arpa. 300 IN PTR web.a.tld.',), resolve['1.0.0.10.in-addr.arpa'])
+        self.assertEqual(('1.0.16.172.in-addr.arpa. 300 IN PTR db.b.tld.',), resolve['1.0.16.172.in-addr.arpa'])
+        self.assertEqual(('3.0.0.10.in-addr.arpa. 300 IN PTR cache.sub.a.tld.',), resolve['3.0.0.10.in-addr.arpa'])
+
+    def test_non_ascii_tag(self):
+        instance = namedtuple('Instance', ('id', 'tags', 'private_ip_address', 'vpc_id'))
+        reservation = namedtuple('Reservation', ('instances'))
+        ec2 = mock.Mock()
+        ec2.get_all_reservations.return_value = [reservation([
+            instance('id-0', {'Name': 'web', 'Team': u'Z\xfcrich', 'Weight': u'\u2460'}, '10.0.0.1', 'vpc-a'),
+            instance('id-1', {'Name': 'db', 'Team': u'Bern'}, '10.0.0.2', 'vpc-a')])]
+        _lookup = lookup.DirectLookup(ec2, 'a.tld', {}, zones={'a.tld': {'filters': {'tag:Team': 'Z\xc3\xbcrich'}}},
+                                      weight_tag='Weight')
+        resolve = _lookup.resolve()
+        self.assertEqual(('web.a.tld. 300 IN A 10.0.0.1',), resolve['web.a.tld'])
+        self.assertNotIn('db.a.tld', resolve)
+
+    def test_unsupported_filter(self):
+        self.assertRaises(ValueError, lookup.Zone, 'bogus.tld', 300, {'bogus-filter': 'bogus-value'})
 
 
 class TestCacheLookup(unittest.TestCase):
@@ -56,7 +389,7 @@ class TestCacheLookup(unittest.TestCase):
 
     def test_invalidate(self):
         self.assertEqual(0, len(self.cachelookup.cache))
-        self.cachelookup.resolve()
+        self.cachelookup.refresh()
         self.assertEqual(len(self.cachelookup.cache), RESERVATION_COUNT * 3)
         self.assertIn('id-0.%s' % self.domain, self.cachelookup.cache)
         self.cachelookup.invalidate('id-0.%s' % self.domain)
@@ -64,3 +397,244 @@ class TestCacheLookup(unittest.TestCase):
         self.assertNotIn('id-0.%s' % self.domain, self.cachelookup.cache)
         self.cachelookup.invalidate()
         self.assertEqual(0, len(self.cachelookup.cache))
+
+    def test_ready(self):
+        self.assertFalse(self.cachelookup.ready)
+        self.cachelookup.refresh()
+        self.assertTrue(self.cachelookup.ready)
+
+    def test_resolve_does_not_query_ec2(self):
+        self.assertEqual({}, self.cachelookup.resolve())
+        self.assertEqual((), self.cachelookup.lookup('id-0.%s.' % self.domain))
+        self.assertFalse(self.cachelookup.ec2.get_all_reservations.called)
+
+    def test_refresh_swaps_snapshot(self):
+        self.cachelookup.refresh_mode = 'full'
+        self.assertEqual(RESERVATION_COUNT * 3, len(self.cachelookup.refresh()))
+        snapshot = self.cachelookup.resolve()
+        self.assertEqual(set(), self.cachelookup.refresh())
+        self.assertIsNot(snapshot, self.cachelookup.resolve())
+        self.assertEqual(snapshot, self.cachelookup.resolve())
+        self.assertEqual(len(snapshot), RESERVATION_COUNT * 3)
+        self.assertTrue(self.cachelookup.lookup('id-0.%s.' % self.domain))
+
+    def test_refresh_incremental(self):
+        instance = namedtuple('Instance', ('id', 'tags', 'private_ip_address'))
+        reservation = namedtuple('Reservation', ('instances'))
+        ec2 = self.cachelookup.ec2
+        ec2.get_all_reservations.return_value = [reservation([
+            instance('id-0', {'Name': 'web'}, '10.0.0.1'),
+            instance('id-1', {'Name': 'web'}, '10.0.0.2'),
+            instance('id-2', {'Name': 'db'}, '10.0.0.3')])]
+        self.assertEqual(8, len(self.cachelookup.refresh()))
+        web = self.cachelookup.lookup('web.%s.' % self.domain)
+        self.assertEqual(2, len(web))
+
+        self.assertEqual(set(), self.cachelookup.refresh())
+        self.assertIs(web, self.cachelookup.lookup('web.%s.' % self.domain))
+
+        ec2.get_all_reservations.return_value = [reservation([
+            instance('id-0', {'Name': 'web'}, '10.0.0.1'),
+            instance('id-2', {'Name': 'db'}, '10.0.0.4'),
+            instance('id-3', {'Name': 'cache'}, '10.0.0.5')])]
+        self.assertEqual(set(['web.%s' % self.domain,
+                              'id-1.%s' % self.domain,
+                              '2.0.0.10.in-addr.arpa',
+                              'db.%s' % self.domain,
+                              'id-2.%s' % self.domain,
+                              '3.0.0.10.in-addr.arpa',
+                              '4.0.0.10.in-addr.arpa',
+                              'cache.%s' % self.domain,
+                              'id-3.%s' % self.domain,
+                              '5.0.0.10.in-addr.arpa']), self.cachelookup.refresh())
+        self.assertEqual(('web.%s. 300 IN A 10.0.0.1' % self.domain,),
+                         self.cachelookup.lookup('web.%s.' % self.domain))
+        self.assertEqual((), self.cachelookup.lookup('id-1.%s.' % self.domain))
+        self.assertEqual((), self.cachelookup.lookup('3.0.0.10.in-addr.arpa.'))
+        self.assertEqual(('db.%s. 300 IN A 10.0.0.4' % self.domain,), self.cachelookup.lookup('db.%s.' % self.domain))
+        self.assertEqual(self.cachelookup.cache, lookup.DirectLookup.resolve(self.cachelookup))
+        self.assertNotIn('id-1', self.cachelookup.hosts)
+        self.assertNotIn('3.0.0.10.in-addr.arpa', self.cachelookup.owners)
+
+    def test_refresh_incremental_error(self):
+        self.cachelookup.refresh()
+        cache = dict(self.cachelookup.cache)
+        self.cachelookup.ec2.get_all_reservations.side_effect = ValueError('bogus error')
+        self.assertRaises(ValueError, self.cachelookup.refresh)
+        self.assertEqual(cache, self.cachelookup.cache)
+
+    def test_refresh_failed_region(self):
+        instance = namedtuple('Instance', ('id', 'tags', 'private_ip_address'))
+        reservation = namedtuple('Reservation', ('instances'))
+        regions = {'region-a': mock.Mock(), 'region-b': mock.Mock()}
+        regions['region-a'].get_all_reservations.return_value = [reservation([instance('id-0', {'Name': 'a'},
+                                                                                       '10.0.0.1')])]
+        regions['region-b'].get_all_reservations.return_value = [reservation([instance('id-1', {'Name': 'b'},
+                                                                                       '10.0.1.1')])]
+        for refresh_mode in ('full', 'incremental'):
+            self.cachelookup = lookup.CacheLookup(inventory.Fleet(regions), self.zone, {}, refresh_mode=refresh_mode)
+            self.cachelookup.refresh()
+            self.assertTrue(self.cachelookup.lookup('a.%s.' % self.domain))
+            self.assertTrue(self.cachelookup.lookup('b.%s.' % self.domain))
+
+            regions['region-a'].get_all_reservations.return_value = [reservation([])]
+            regions['region-b'].get_all_reservations.side_effect = ValueError('bogus error')
+            self.assertEqual(set(['a.%s' % self.domain, 'id-0.%s' % self.domain, '1.0.0.10.in-addr.arpa']),
+                             self.cachelookup.refresh())
+            self.assertTrue(self.cachelookup.lookup('b.%s.' % self.domain))
+            self.assertEqual({'id-1': 'region-b'}, self.cachelookup.host_regions)
+
+            regions['region-a'].get_all_reservations.return_value = [reservation([instance('id-0', {'Name': 'a'},
+                                                                                           '10.0.0.1')])]
+            regions['region-b'].get_all_reservations.side_effect = None
+
+    def test_weights(self):
+        instance = namedtuple('Instance', ('id', 'tags', 'private_ip_address'))
+        reservation = namedtuple('Reservation', ('instances'))
+        self.cachelookup.ec2.get_all_reservations.return_value = [reservation([
+            instance('id-0', {'Name': 'web', 'Weight': '3'}, '10.0.0.2'),
+            instance('id-1', {'Name': 'web'}, '10.0.0.1'),
+            instance('id-2', {'Name': 'db', 'Weight': 'bogus'}, '10.0.0.3')])]
+        self.cachelookup.refresh()
+        self.assertEqual({}, self.cachelookup.weights)
+
+        self.cachelookup.weight_tag = 'Weight'
+        self.cachelookup.filter_tags = ['Weight']
+        self.cachelookup.hosts = {}
+        self.cachelookup.refresh()
+        self.assertEqual(('web.bogus.tld. 300 IN A 10.0.0.1', 'web.bogus.tld. 300 IN A 10.0.0.2'),
+                         self.cachelookup.lookup('web.bogus.tld.'))
+        self.assertEqual({'web.bogus.tld': (1, 3.0)}, self.cachelookup.weights)
+
+        self.cachelookup.ec2.get_all_reservations.return_value = [reservation([
+            instance('id-0', {'Name': 'web', 'Weight': '1'}, '10.0.0.2'),
+            instance('id-1', {'Name': 'web'}, '10.0.0.1')])]
+        self.assertEqual(set(['db.bogus.tld', 'id-2.bogus.tld', '3.0.0.10.in-addr.arpa']),
+                         self.cachelookup.refresh())
+        self.assertEqual({}, self.cachelookup.weights)
+
+    def test_update(self):
+        instance = namedtuple('Instance', ('id', 'tags', 'private_ip_address'))
+        reservation = namedtuple('Reservation', ('instances'))
+        ec2 = self.cachelookup.ec2
+        self.cachelookup.filter = {'instance-state-name': 'running'}
+        self.cachelookup.refresh()
+        ec2.get_all_reservations.reset_mock()
+        ec2.get_all_reservations.return_value = [reservation([instance('id-0', {'Name': 'name-9'}, '10.0.0.9'),
+                                                             instance('id-5', {'Name': 'name-5'}, '10.0.0.5')])]
+        changed = self.cachelookup.update(['id-0', 'id-1', 'id-5'])
+        ec2.get_all_reservations.assert_called_once_with(
+            filters={'instance-state-name': 'running', 'instance-id': ['id-0', 'id-1', 'id-5']})
+        self.assertIn('name-0.%s' % self.domain, changed)
+        self.assertIn('name-1.%s' % self.domain, changed)
+        self.assertIn('name-5.%s' % self.domain, changed)
+        self.assertIn('name-9.%s' % self.domain, changed)
+        self.assertEqual((), self.cachelookup.lookup('name-0.%s.' % self.domain))
+        self.assertEqual((), self.cachelookup.lookup('name-1.%s.' % self.domain))
+        self.assertTrue(self.cachelookup.lookup('name-9.%s.' % self.domain))
+
+        ec2.get_all_reservations.reset_mock()
+        changed = self.cachelookup.update(removed_ids=['id-5'])
+        self.assertFalse(ec2.get_all_reservations.called)
+        self.assertEqual(set(['name-5.%s' % self.domain, 'id-5.%s' % self.domain, '5.0.0.10.in-addr.arpa']), changed)
+
+
+class TestIndexLookup(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.index_file = os.path.join(self.directory, 'bogus.index')
+        self.indexlookup = lookup.IndexLookup(self.index_file)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+        self.indexlookup = None
+
+    def test_refresh(self):
+        self.assertFalse(self.indexlookup.load())
+        self.assertEqual((), self.indexlookup.lookup('web.bogus.tld.'))
+        answers = {'web.bogus.tld': ('web.bogus.tld. 300 IN A 10.0.0.1',),
+                   'db.bogus.tld': ('db.bogus.tld. 300 IN A 10.0.0.2',)}
+        index.write(self.index_file, answers, generation=1)
+        self.assertTrue(self.indexlookup.load())
+        self.assertEqual(answers['web.bogus.tld'], self.indexlookup.lookup('web.bogus.tld.'))
+        self.assertEqual(answers, self.indexlookup.resolve())
+        self.assertEqual(set(), self.indexlookup.refresh())
+
+        answers['web.bogus.tld'] = ('web.bogus.tld. 300 IN A 10.0.0.3',)
+        index.write(self.index_file, answers, {'web.bogus.tld': (1, 2)}, 2, 1, set(['web.bogus.tld']))
+        self.assertEqual(set(['web.bogus.tld']), self.indexlookup.refresh())
+        self.assertEqual(answers['web.bogus.tld'], self.indexlookup.lookup('web.bogus.tld'))
+        self.assertEqual((1, 2), self.indexlookup.weights.get('web.bogus.tld'))
+
+        del answers['db.bogus.tld']
+        index.write(self.index_file, answers, generation=1)
+        self.assertEqual(set(['web.bogus.tld', 'db.bogus.tld']), self.indexlookup.refresh())
+
+    def test_refresh_invalid(self):
+        with open(self.index_file, 'wb') as f:
+            f.write('bogus')
+        self.assertFalse(self.indexlookup.load())
+        self.assertRaises(index.IndexFormatError, self.indexlookup.refresh)
+
+
+class TestCacheLookupSnapshot(unittest.TestCase):
+    def setUp(self):
+        self.zone = '.bogus.tld'
+        self.domain = self.zone.strip('.')
+        self.directory = tempfile.mkdtemp()
+        self.snapshot_file = os.path.join(self.directory, 'bogus.snapshot')
+        self.filter = {'instance-state-name': 'running'}
+        self.cachelookup = lookup.CacheLookup(mock_ec2(), self.zone, self.filter, snapshot_file=self.snapshot_file)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+        self.cachelookup = None
+
+    def test_load(self):
+        self.assertFalse(self.cachelookup.load())
+        self.cachelookup.refresh()
+        self.assertTrue(os.path.isfile(self.snapshot_file))
+
+        restarted = lookup.CacheLookup(mock_ec2(), self.zone, self.filter, snapshot_file=self.snapshot_file)
+        self.assertTrue(restarted.load())
+        self.assertFalse(restarted.ec2.get_all_reservations.called)
+        self.assertEqual(self.cachelookup.cache, restarted.cache)
+        self.assertEqual(self.cachelookup.owners, restarted.owners)
+        self.assertEqual(set(), restarted.refresh())
+
+    def test_load_stale(self):
+        self.cachelookup.refresh()
+        os.utime(self.snapshot_file, (time.time() - 7200, time.time() - 7200))
+        self.assertFalse(self.cachelookup.load())
+        self.cachelookup.refresh()
+        self.assertTrue(self.cachelookup.load())
+
+    def test_load_other_settings(self):
+        self.cachelookup.refresh()
+        restarted = lookup.CacheLookup(mock_ec2(), self.zone, self.filter, ttl=60, snapshot_file=self.snapshot_file)
+        self.assertFalse(restarted.load())
+        self.assertEqual({}, restarted.cache)
+
+    def test_rerender(self):
+        self.cachelookup.refresh()
+        calls = self.cachelookup.ec2.get_all_reservations.call_count
+        changed = self.cachelookup.rerender(60, 'public')
+        self.assertEqual(calls, self.cachelookup.ec2.get_all_reservations.call_count)
+        self.assertEqual(RESERVATION_COUNT * 3, len(changed))
+        self.assertEqual(('name-0.%s. 60 IN A 192.168.1.0' % self.domain,),
+                         self.cachelookup.lookup('name-0.%s.' % self.domain))
+        self.assertEqual(set(), self.cachelookup.rerender(60, 'public'))
+
+        restarted = lookup.CacheLookup(mock_ec2(), self.zone, self.filter, ttl=60, ip_order='public',
+                                       snapshot_file=self.snapshot_file)
+        self.assertTrue(restarted.load())
+        self.assertEqual(self.cachelookup.cache, restarted.cache)
+
+    def test_load_corrupted(self):
+        with open(self.snapshot_file, 'wb') as f:
+            f.write('bogus')
+        self.assertFalse(self.cachelookup.load())
+
+    def test_save_error(self):
+        self.cachelookup.snapshot_file = os.path.join(self.directory, 'bogus', 'bogus.snapshot')
+        self.assertEqual(RESERVATION_COUNT * 3, len(self.cachelookup.refresh()))
@@ -0,0 +1,55 @@
+import threading
+import urllib2
+
+from tests import unittest
+from tests import mock
+from unbound_ec2 import metrics
+
+
+class TestMetrics(unittest.TestCase):
+    def setUp(self):
+        self.metrics = metrics.Metrics()
+        self.metrics.histogram('bogus_seconds', (0.1, 1))
+
+    def tearDown(self):
+        self.metrics = None
+
+    def test_counters(self):
+        self.metrics.inc('bogus_total', 'type="A"')
+        thread = threading.Thread(target=self.metrics.inc, args=('bogus_total', 'type="A"', 2))
+        thread.start()
+        thread.join()
+        self.metrics.inc('bogus_total', 'type="PTR"')
+        self.assertEqual(2, len(self.metrics.tables))
+        self.assertEqual({('bogus_total', 'type="A"'): 3, ('bogus_total', 'type="PTR"'): 1}, self.metrics.collect())
+
+    def test_render(self):
+        self.metrics.inc('bogus_total')
+        self.metrics.observe('bogus_seconds', 0.05, 'mode="full"')
+        self.metrics.observe('bogus_seconds', 0.5, 'mode="full"')
+        self.metrics.observe('bogus_seconds', 5, 'mode="full"')
+        self.metrics.gauge('bogus_gauge', lambda: 7, 'region="bogus"')
+        self.metrics.gauge('bogus_unknown', lambda: None)
+        self.metrics.gauge('bogus_error', mock.Mock(side_effect=ValueError('bogus error')))
+        self.assertEqual('\n'.join(['# TYPE bogus_total counter',
+                                    'bogus_total 1',
+                                    '# TYPE bogus_seconds histogram',
+                                    'bogus_seconds_bucket{mode="full",le="0.1"} 1',
+                                    'bogus_seconds_bucket{mode="full",le="1"} 2',
+                                    'bogus_seconds_bucket{mode="full",le="+Inf"} 3',
+                                    'bogus_seconds_sum{mode="full"} 5.55',
+                                    'bogus_seconds_count{mode="full"} 3',
+                                    '# TYPE bogus_gauge gauge',
+                                    'bogus_gauge{region="bogus"} 7']) + '\n', self.metrics.render())
+
+    def test_listener(self):
+        metrics.log_info = mock.Mock()
+        self.metrics.inc('bogus_total')
+        listener = metrics.MetricsListener('127.0.0.1', 0, self.metrics)
+        listener.start()
+        try:
+            response = urllib2.urlopen('http://127.0.0.1:%d/metrics' % listener.server_address[1])
+            self.assertEqual(200, response.getcode())
+            self.assertIn('bogus_total 1', response.read())
+        finally:
+            listener.stop()
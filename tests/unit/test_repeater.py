@@ -0,0 +1,91 @@
+import threading
+
+from tests import unittest
+from tests import mock
+from unbound_ec2 import repeater
+
+
+class TestRefreshScheduler(unittest.TestCase):
+    def setUp(self):
+        self.callme = mock.Mock(return_value=set())
+        self.scheduler = repeater.RefreshScheduler(60, self.callme, jitter=0, min_interval=15, max_interval=240,
+                                                   max_backoff=300)
+
+    def tearDown(self):
+        self.scheduler = None
+
+    @mock.patch('time.time', return_value=1000)
+    def test_fixed_rate(self, time_mock):
+        self.scheduler.max_interval = 60
+        self.scheduler.schedule(990, set())
+        self.assertEqual(1050, self.scheduler.next_run)
+        self.scheduler.schedule(900, set())
+        self.assertEqual(1000, self.scheduler.next_run)
+
+    @mock.patch('time.time', return_value=1000)
+    def test_adaptive(self, time_mock):
+        self.scheduler.schedule(1000, set(['bogus.tld']))
+        self.assertEqual(30, self.scheduler.current_interval)
+        self.scheduler.schedule(1000, set(['bogus.tld']))
+        self.scheduler.schedule(1000, set(['bogus.tld']))
+        self.assertEqual(15, self.scheduler.current_interval)
+        for i in range(10):
+            self.scheduler.schedule(1000, set())
+        self.assertEqual(240, self.scheduler.current_interval)
+        self.assertEqual(1240, self.scheduler.next_run)
+
+    @mock.patch('time.time', return_value=1000)
+    def test_backoff(self, time_mock):
+        self.scheduler.schedule(1000, None, True)
+        self.assertEqual(1120, self.scheduler.next_run)
+        self.scheduler.schedule(1000, None, True)
+        self.assertEqual(1240, self.scheduler.next_run)
+        self.scheduler.schedule(1000, None, True)
+        self.assertEqual(1300, self.scheduler.next_run)
+        self.scheduler.schedule(1000, set())
+        self.assertEqual(0, self.scheduler.failures)
+        self.assertEqual(4, self.scheduler.stats()['runs'])
+        self.assertEqual(3, self.scheduler.stats()['errors'])
+
+    @mock.patch('time.time', return_value=1000)
+    def test_jitter(self, time_mock):
+        self.scheduler.jitter = 0.1
+        self.scheduler.max_interval = 60
+        runs = set()
+        for i in range(20):
+            self.scheduler.schedule(1000, set())
+            self.assertTrue(1054 <= self.scheduler.next_run <= 1066)
+            runs.add(self.scheduler.next_run)
+        self.assertTrue(len(runs) > 1)
+
+    def test_run(self):
+        called = threading.Event()
+
+        def callme():
+            called.set()
+            raise ValueError('bogus error')
+
+        repeater.log_warn = mock.Mock()
+        self.scheduler.callme = callme
+        self.scheduler.start()
+        self.assertTrue(called.wait(5))
+        self.scheduler.stop()
+        self.assertEqual(1, self.scheduler.errors)
+        self.assertTrue(repeater.log_warn.called)
+        self.assertIsNotNone(self.scheduler.stats()['last_duration'])
+
+    def test_prepare(self):
+        called = threading.Event()
+        calls = []
+        self.scheduler.prepare = lambda: calls.append('prepare')
+
+        def callme():
+            calls.append('callme')
+            called.set()
+            return set()
+
+        self.scheduler.callme = callme
+        self.scheduler.start()
+        self.assertTrue(called.wait(5))
+        self.scheduler.stop()
+        self.assertEqual(['prepare', 'callme'], calls[:2])
@@ -1,17 +1,26 @@
+import tempfile
+import shutil
+import os
+
 from tests import unittest
 from tests import mock
 from unbound_ec2 import script
+from unbound_ec2 import builder
+from unbound_ec2 import config
+from unbound_ec2 import lookup
+from benchmarks import startup
+from benchmarks import run_case
 
 class TestAbstractServer(unittest.TestCase):
     def setUp(self):
         self.id = mock.Mock()
         self.cfg = mock.Mock()
-        script.EC2Connection = mock.MagicMock()
+        builder.EC2Connection = mock.MagicMock()
 
     def tearDown(self):
         self.id = None
         self.cfg = None
-        script.EC2Connection = None
+        builder.EC2Connection = None
 
     def test_init(self):
         script.init(self.id, self.cfg)
@@ -20,4 +29,94 @@ class TestAbstractServer(unittest.TestCase):
         event = mock.Mock()
         qstate = mock.MagicMock()
         qdata = mock.Mock()
-        script.operate(self.id, event, qstate, qdata)
\ No newline at end of file
+        script.operate(self.id, event, qstate, qdata)
+
+
+class TestReload(unittest.TestCase):
+    def setUp(self):
+        builder.EC2Connection = mock.MagicMock()
+        script.init(mock.Mock(), mock.Mock())
+        self.current = self.parse()
+        self.conf = self.parse()
+        self.reload = getattr(script, '__reload')
+
+    def tearDown(self):
+        script.deinit(mock.Mock())
+        builder.EC2Connection = None
+        self.current = None
+        self.conf = None
+
+    def parse(self):
+        conf = config.UnboundEc2Conf()
+        conf.set_defaults()
+        conf.parse()
+        return conf
+
+    def test_serving(self):
+        server, scheduler = script._server, script._rr
+        self.conf.server['answer_order'] = 'shuffle'
+        self.reload(self.current, self.conf, set([('server', 'answer_order')]))
+        self.assertIsNot(server, script._server)
+        self.assertIs(server.lookup, script._server.lookup)
+        self.assertEqual('shuffle', script._server.answer_order)
+        self.assertIs(script._server, script._invalidator.server)
+        self.assertIsNot(scheduler, script._rr)
+        self.assertFalse(scheduler.is_alive())
+
+    def test_rendering(self):
+        _lookup = script._server.lookup
+        self.conf.main['ttl'] = 60
+        self.reload(self.current, self.conf, set([('main', 'ttl')]))
+        self.assertIs(_lookup, script._server.lookup)
+        self.assertEqual(60, _lookup.ttl)
+        self.assertEqual(60, script._server.ttl)
+
+    def test_lookup(self):
+        _lookup = script._server.lookup
+        self.conf.main['zone'] = 'other.tld'
+        self.reload(self.current, self.conf, set([('main', 'zone')]))
+        self.assertIsNot(_lookup, script._server.lookup)
+        self.assertIsInstance(script._server.lookup, lookup.CacheLookup)
+        self.assertTrue(script._server.lookup.ready)
+        self.assertEqual('other.tld', script._server.lookup.domain)
+
+    def test_reload_interval(self):
+        server, scheduler = script._server, script._rr
+        script.log_warn = mock.Mock()
+        self.conf.main['reload_interval'] = 30
+        self.reload(self.current, self.conf, set([('main', 'reload_interval')]))
+        self.assertTrue(script.log_warn.called)
+        self.assertIs(server, script._server)
+        self.assertIs(scheduler, script._rr)
+
+    def test_events_enabled(self):
+        script.log_warn = mock.Mock()
+        self.conf.events['enabled'] = True
+        self.conf.main['cache_ttl'] = 120
+        self.reload(self.current, self.conf, set([('events', 'enabled'), ('main', 'cache_ttl')]))
+        self.assertIsNone(script._events)
+        self.assertEqual(120, script._rr.interval)
+
+    def test_lookup_type(self):
+        server = script._server
+        self.conf.lookup['type'] = 'direct'
+        self.assertRaises(ValueError, self.reload, self.current, self.conf, set([('lookup', 'type')]))
+        self.assertIs(server, script._server)
+
+
+class TestStartup(unittest.TestCase):
+    """Runs the startup benchmark cases, every one in a fresh process so that nothing is imported already.
+    The cache lookup refreshes in the background right away, which imports boto, so it is left out.
+    """
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_boto_deferred(self):
+        for lookup_type in ['direct', 'index']:
+            env = dict(os.environ, UNBOUND_EC2_CONF=startup.configure(self.directory, lookup_type))
+            result = run_case(['-B', '-m', 'benchmarks.startup', '--case', lookup_type], env)
+            self.assertFalse(result['boto_imported'], '%s lookup imported boto on startup' % lookup_type)
@@ -1,6 +1,7 @@
 from tests import unittest
 from tests import mock
 from unbound_ec2 import server
+from unbound_ec2 import throttle
 from tests import attrs
 
 
@@ -9,10 +10,10 @@ class TestServer(server.Server):
     HANDLE_PASS_RESULT = True
     DNSMSG = mock.MagicMock()
 
-    def handle_request(self, _id, event, qstate, qdata, request_type):
+    def handle_request(self, _id, event, qstate, qdata, zone):
         return self.HANDLE_FORWARD_RESULT
 
-    def new_dns_msg(self, qname):
+    def new_dns_msg(self, qname, qtype=None):
         return self.DNSMSG
 
 
@@ -81,6 +82,32 @@ class TestAbstractServer(unittest.TestCase):
         self.assertEqual(self.srv.operate(id, event, qstate, qdata), TestServer.HANDLE_PASS_RESULT)
         qstate.ext_state.__setitem__.assert_called_with(id, attrs['MODULE_WAIT_MODULE'])
 
+    def test_classify(self):
+        forwarded_zones = 'sub.bogus.tld,other.tld.,%s' % ','.join('zone-%d.tld' % i for i in range(1000))
+        srv = TestServer(self.zone, self.reverse_zone, self.ttl, mock.MagicMock(), self.ip_order, forwarded_zones)
+        self.assertEqual((server.FORWARD_ZONE, 'bogus.tld.'), srv.classify('bogus-name.bogus.tld.'))
+        self.assertEqual((server.FORWARD_ZONE, 'bogus.tld.'), srv.classify('bogus.tld.'))
+        self.assertEqual((server.REVERSE_ZONE, '127.in-addr.arpa.'), srv.classify('1.0.0.127.in-addr.arpa.'))
+        self.assertEqual((server.FORWARDED, 'sub.bogus.tld.'), srv.classify('bogus-name.sub.bogus.tld.'))
+        self.assertEqual((server.FORWARDED, 'zone-999.tld.'), srv.classify('bogus-name.zone-999.tld.'))
+        self.assertEqual((server.FORWARD_ZONE, 'bogus.tld.'), srv.classify('bogus-name.nosub.bogus.tld.'))
+        self.assertEqual((server.UNMANAGED, None), srv.classify('bogus-name.notbogus.tld.'))
+        self.assertEqual((server.UNMANAGED, None), srv.classify('tld.'))
+        self.assertEqual((server.UNMANAGED, None), srv.classify('.'))
+
+    def test_classify_multiple_zones(self):
+        srv = TestServer('a.tld,b.tld.,sub.a.tld', '10.in-addr.arpa,16.172.in-addr.arpa', self.ttl, mock.MagicMock(),
+                         self.ip_order, '')
+        self.assertEqual('a.tld.', srv.zone)
+        self.assertEqual('10.in-addr.arpa.', srv.reverse_zone)
+        self.assertEqual((server.FORWARD_ZONE, 'a.tld.'), srv.classify('web.a.tld.'))
+        self.assertEqual((server.FORWARD_ZONE, 'b.tld.'), srv.classify('web.b.tld.'))
+        self.assertEqual((server.FORWARD_ZONE, 'sub.a.tld.'), srv.classify('web.sub.a.tld.'))
+        self.assertEqual((server.REVERSE_ZONE, '10.in-addr.arpa.'), srv.classify('1.0.0.10.in-addr.arpa.'))
+        self.assertEqual((server.REVERSE_ZONE, '16.172.in-addr.arpa.'), srv.classify('1.0.16.172.in-addr.arpa.'))
+        self.assertEqual((server.UNMANAGED, None), srv.classify('1.0.17.172.in-addr.arpa.'))
+        self.assertEqual(5, len(srv.soa_records))
+
 
 class TestAuthoritativeServer(unittest.TestCase):
     def setUp(self):
@@ -116,6 +143,156 @@ class TestAuthoritativeServer(unittest.TestCase):
         qdata = mock.MagicMock()
         server.DNSMessage = mock.MagicMock()
         self.assertTrue(self.srv.operate(id, event, qstate, qdata))
+        self.assertEqual(qstate.return_rcode, attrs['RCODE_NOERROR'])
+        server.DNSMessage.return_value.authority.append.assert_called_once_with(
+            'bogus.tld. 60 IN SOA bogus.tld. hostmaster.bogus.tld. 1 3600 600 86400 60')
+
+    def test_metrics(self):
+        server.DNSMessage = mock.MagicMock()
+        self.srv.lookup.lookup.return_value = ()
+        qstate = mock.MagicMock()
+        qstate.qinfo.qtype = attrs['RR_TYPE_A']
+        qstate.qinfo.qname_str = 'bogus-metrics%s.' % self.zone
+        before = server.metrics.registry.collect()
+        self.assertTrue(self.srv.operate('bogus_id', attrs['MODULE_EVENT_NEW'], qstate, mock.MagicMock()))
+        after = server.metrics.registry.collect()
+        for key in [('unbound_ec2_queries_total', 'type="A",rcode="NXDOMAIN"'),
+                    ('unbound_ec2_lookups_total', 'result="miss"'),
+                    ('unbound_ec2_operate_seconds', '', 'count')]:
+            self.assertEqual(before[key] + 1, after[key])
+
+    def test_handle_aaaa(self):
+        server.DNSMessage = mock.MagicMock()
+        self.srv.lookup.lookup.return_value = ('bogus-name.bogus.tld. 300 IN A 10.0.0.1',
+                                               'bogus-name.bogus.tld. 300 IN AAAA 2001:db8::1')
+        qstate = mock.MagicMock()
+        qstate.qinfo.qtype = attrs['RR_TYPE_AAAA']
+        qstate.qinfo.qname_str = 'bogus-name%s.' % self.zone
+        self.assertTrue(self.srv.operate('bogus_id', attrs['MODULE_EVENT_NEW'], qstate, mock.MagicMock()))
+        server.DNSMessage.assert_called_with(qstate.qinfo.qname_str, attrs['RR_TYPE_AAAA'], attrs['RR_CLASS_IN'],
+                                             mock.ANY)
+        server.DNSMessage.return_value.answer.extend.assert_called_once_with(
+            ('bogus-name.bogus.tld. 300 IN AAAA 2001:db8::1',))
+
+        server.DNSMessage = mock.MagicMock()
+        self.srv.lookup.lookup.return_value = ('bogus-name.bogus.tld. 300 IN A 10.0.0.1',)
+        self.assertTrue(self.srv.operate('bogus_id', attrs['MODULE_EVENT_NEW'], qstate, mock.MagicMock()))
+        self.assertEqual(qstate.return_rcode, attrs['RCODE_NOERROR'])
+        self.assertFalse(server.DNSMessage.return_value.answer.extend.called)
+        server.DNSMessage.return_value.authority.append.assert_called_once_with(
+            'bogus.tld. 60 IN SOA bogus.tld. hostmaster.bogus.tld. 1 3600 600 86400 60')
+
+    def test_order(self):
+        records = tuple('bogus-name.bogus.tld. 300 IN A 10.0.0.%d' % i for i in xrange(4))
+        self.assertIs(records, self.srv.order(records))
+        self.srv.max_answers = 2
+        self.assertEqual(records[:2], self.srv.order(records))
+
+        self.srv.answer_order = server.ORDER_ROUND_ROBIN
+        self.assertEqual([records[0], records[1]], self.srv.order(records))
+        self.assertEqual([records[1], records[2]], self.srv.order(records))
+        self.srv.max_answers = 0
+        self.assertEqual([records[2], records[3], records[0], records[1]], self.srv.order(records))
+
+        self.srv.answer_order = server.ORDER_SHUFFLE
+        self.assertEqual(sorted(records), sorted(self.srv.order(records)))
+
+        self.srv.answer_order = server.ORDER_WEIGHTED
+        self.srv.max_answers = 1
+        weights = (0, 0, 1000000, 0)
+        for i in xrange(10):
+            self.assertEqual([records[2]], self.srv.order(records, weights))
+        self.srv.max_answers = 0
+        self.assertEqual([records[1], records[3]], sorted(self.srv.order(records, (1, 0, 1, 0))[2:]))
+
+    def test_handle_weighted(self):
+        server.DNSMessage = mock.MagicMock()
+        self.srv.answer_order = server.ORDER_WEIGHTED
+        self.srv.max_answers = 1
+        self.srv.lookup.lookup.return_value = ('bogus-name.bogus.tld. 300 IN A 10.0.0.1',
+                                               'bogus-name.bogus.tld. 300 IN A 10.0.0.2',
+                                               'bogus-name.bogus.tld. 300 IN AAAA 2001:db8::1')
+        self.srv.lookup.weights = {'bogus-name.bogus.tld': (0, 1, 100)}
+        qstate = mock.MagicMock()
+        qstate.qinfo.qtype = attrs['RR_TYPE_A']
+        qstate.qinfo.qname_str = 'bogus-name%s.' % self.zone
+        self.assertTrue(self.srv.operate('bogus_id', attrs['MODULE_EVENT_NEW'], qstate, mock.MagicMock()))
+        server.DNSMessage.return_value.answer.extend.assert_called_once_with(
+            ['bogus-name.bogus.tld. 300 IN A 10.0.0.2'])
+
+    def test_handle_loading(self):
+        self.srv.lookup.ready = False
+        qstate = mock.MagicMock()
+        qstate.qinfo.qtype = attrs['RR_TYPE_A']
+        qstate.qinfo.qname_str = 'bogus-name%s.' % self.zone
+        qstate.ext_state = {}
+        self.assertTrue(self.srv.operate('bogus_id', attrs['MODULE_EVENT_NEW'], qstate, mock.MagicMock()))
+        self.assertEqual(attrs['MODULE_ERROR'], qstate.ext_state['bogus_id'])
+        self.srv.loading = server.LOADING_PASS
+        qstate.return_rcode = attrs['RCODE_NOERROR']
+        before = server.metrics.registry.collect()
+        self.assertTrue(self.srv.operate('bogus_id', attrs['MODULE_EVENT_NEW'], qstate, mock.MagicMock()))
+        after = server.metrics.registry.collect()
+        self.assertEqual(attrs['MODULE_WAIT_MODULE'], qstate.ext_state['bogus_id'])
+        self.assertEqual(before.get(('unbound_ec2_queries_total', 'type="A",rcode="pass"'), 0) + 1,
+                         after[('unbound_ec2_queries_total', 'type="A",rcode="pass"')])
+        self.assertEqual(before.get(('unbound_ec2_queries_total', 'type="A",rcode="NOERROR"'), 0),
+                         after.get(('unbound_ec2_queries_total', 'type="A",rcode="NOERROR"'), 0))
+        self.assertFalse(self.srv.lookup.lookup.called)
+
+    def test_handle_suspended(self):
+        server.DNSMessage = mock.MagicMock()
+        self.srv.lookup.lookup.side_effect = throttle.CircuitOpenError('EC2 calls suspended after 5 failures')
+        qstate = mock.MagicMock()
+        qstate.qinfo.qtype = attrs['RR_TYPE_A']
+        qstate.qinfo.qname_str = 'bogus-name%s.' % self.zone
+        before = server.metrics.registry.collect()
+        self.assertTrue(self.srv.operate('bogus_id', attrs['MODULE_EVENT_NEW'], qstate, mock.MagicMock()))
+        after = server.metrics.registry.collect()
+        self.assertEqual(qstate.return_rcode, attrs['RCODE_SERVFAIL'])
+        qstate.ext_state.__setitem__.assert_called_with('bogus_id', attrs['MODULE_ERROR'])
+        self.assertEqual(before.get(('unbound_ec2_lookups_total', 'result="suspended"'), 0) + 1,
+                         after[('unbound_ec2_lookups_total', 'result="suspended"')])
+        self.assertEqual(before.get(('unbound_ec2_queries_total', 'type="A",rcode="SERVFAIL"'), 0) + 1,
+                         after[('unbound_ec2_queries_total', 'type="A",rcode="SERVFAIL"')])
+
+    def test_handle_not_found(self):
+        server.log_info = mock.Mock()
+        server.DNSMessage = mock.MagicMock()
+        self.srv.lookup.lookup.return_value = ()
+        qstate = mock.MagicMock()
+        qstate.qinfo.qtype = attrs['RR_TYPE_PTR']
+        qstate.qinfo.qname_str = '1.0.0.%s.' % self.reverse_zone
+        for i in range(3):
+            self.assertTrue(self.srv.operate('bogus_id', attrs['MODULE_EVENT_NEW'], qstate, mock.MagicMock()))
+        self.assertEqual(qstate.return_rcode, attrs['RCODE_NXDOMAIN'])
+        server.DNSMessage.return_value.authority.append.assert_called_with(
+            '127.in-addr.arpa. 60 IN SOA 127.in-addr.arpa. hostmaster.127.in-addr.arpa. 1 3600 600 86400 60')
+        self.srv.lookup.lookup.assert_called_once_with(qstate.qinfo.qname_str)
+        self.assertEqual(1, server.log_info.call_count)
+        self.assertEqual(2, self.srv.misses)
+
+        self.srv.invalidate(['1.0.0.%s' % self.reverse_zone])
+        self.srv.operate('bogus_id', attrs['MODULE_EVENT_NEW'], qstate, mock.MagicMock())
+        self.assertEqual(2, self.srv.lookup.lookup.call_count)
+
+    def test_handle_mixed_case(self):
+        server.DNSMessage = mock.MagicMock()
+        records = ('bogus-name.bogus.tld. 300 IN A 10.0.0.1',)
+        self.srv.lookup.lookup.return_value = records
+        qstate = mock.MagicMock()
+        qstate.qinfo.qtype = attrs['RR_TYPE_A']
+        qstate.qinfo.qname_str = 'BoGuS-nAmE.bOgUs.TlD.'
+        self.srv.lookup.case_sensitive = False
+        self.assertTrue(self.srv.operate('bogus_id', attrs['MODULE_EVENT_NEW'], qstate, mock.MagicMock()))
+        self.srv.lookup.lookup.assert_called_once_with('bogus-name.bogus.tld.')
+        server.DNSMessage.assert_called_with('BoGuS-nAmE.bOgUs.TlD.', attrs['RR_TYPE_A'], attrs['RR_CLASS_IN'],
+                                             mock.ANY)
+        server.DNSMessage.return_value.answer.extend.assert_called_once_with(records)
+
+        self.srv.lookup.case_sensitive = True
+        self.srv.operate('bogus_id', attrs['MODULE_EVENT_NEW'], qstate, mock.MagicMock())
+        self.srv.lookup.lookup.assert_called_with('BoGuS-nAmE.bOgUs.TlD.')
 
 
 class TestCachingServer(unittest.TestCase):
@@ -136,17 +313,28 @@ class TestCachingServer(unittest.TestCase):
     def test_handle_forward(self):
         server.storeQueryInCache = mock.Mock()
         server.DNSMessage = mock.MagicMock()
-        instances_mock = mock.MagicMock()
-        instances_mock.tags = {'Address': 'bogus_ip_address'}
-        self.lookup_mock.lookup.return_value = [instances_mock]
         id = 'bogus_id'
         event = attrs['MODULE_EVENT_NEW']
         qstate = mock.MagicMock()
         qstate.qinfo.qtype = attrs['RR_TYPE_A']
         qstate.qinfo.qname_str = 'bogus-name%s.' % self.zone
         qdata = mock.MagicMock()
+        records = ('%s %d IN A %s' % (qstate.qinfo.qname_str, self.ttl, 'bogus_ip_address'),)
+        self.lookup_mock.lookup.return_value = records
         self.assertTrue(self.srv.operate(id, event, qstate, qdata))
         qstate.ext_state.__setitem__.assert_called_with(id, attrs['MODULE_FINISHED'])
         self.assertEqual(qstate.return_msg.rep.security, 2)
-        server.DNSMessage.return_value.answer.append.assert_called_with(
-            '%s %d IN A %s' % (qstate.qinfo.qname_str, self.ttl, 'bogus_ip_address'))
+        self.lookup_mock.lookup.assert_called_with(qstate.qinfo.qname_str)
+        server.DNSMessage.return_value.answer.extend.assert_called_with(records)
+        server.storeQueryInCache.assert_called_once_with(qstate, qstate.qinfo, qstate.return_msg.rep, 0)
+
+    def test_handle_forward_not_found(self):
+        server.storeQueryInCache = mock.Mock()
+        server.DNSMessage = mock.MagicMock()
+        self.lookup_mock.lookup.return_value = ()
+        qstate = mock.MagicMock()
+        qstate.qinfo.qtype = attrs['RR_TYPE_A']
+        qstate.qinfo.qname_str = 'bogus-name%s.' % self.zone
+        self.assertTrue(self.srv.operate('bogus_id', attrs['MODULE_EVENT_NEW'], qstate, mock.MagicMock()))
+        self.assertFalse(server.storeQueryInCache.called)
+
@@ -0,0 +1,84 @@
+from tests import unittest
+from tests import mock
+from unbound_ec2 import throttle
+
+
+class EC2ResponseError(Exception):
+    def __init__(self, status, error_code):
+        Exception.__init__(self, error_code)
+        self.status = status
+        self.error_code = error_code
+
+
+class TestTokenBucket(unittest.TestCase):
+    @mock.patch('time.sleep')
+    @mock.patch('time.time', return_value=1000)
+    def test_acquire(self, time_mock, sleep_mock):
+        bucket = throttle.TokenBucket(2, 2)
+        self.assertEqual(0, bucket.acquire())
+        self.assertEqual(0, bucket.acquire())
+        self.assertEqual(0.5, bucket.acquire())
+        sleep_mock.assert_called_once_with(0.5)
+        time_mock.return_value = 1010
+        self.assertEqual(0, bucket.acquire())
+
+
+class TestThrottle(unittest.TestCase):
+    def setUp(self):
+        throttle.log_warn = mock.Mock()
+        self.ec2 = mock.Mock()
+        self.throttle = throttle.Throttle(self.ec2, rate=1000, retries=2, failure_threshold=2, reset_timeout=60)
+        self.sleep = mock.patch('time.sleep').start()
+
+    def tearDown(self):
+        mock.patch.stopall()
+        self.throttle = None
+
+    def test_call(self):
+        self.ec2.get_all_reservations.return_value = ['bogus-reservation']
+        self.assertEqual(['bogus-reservation'], self.throttle.get_all_reservations(filters={'bogus': 'filter'}))
+        self.ec2.get_all_reservations.assert_called_once_with(filters={'bogus': 'filter'})
+        self.assertEqual(1, self.throttle.stats()['calls'])
+
+    def test_retry_throttled(self):
+        self.ec2.get_all_reservations.side_effect = [EC2ResponseError(503, 'RequestLimitExceeded'),
+                                                     EC2ResponseError(500, 'InternalError'),
+                                                     ['bogus-reservation']]
+        self.assertEqual(['bogus-reservation'], self.throttle.get_all_reservations())
+        self.assertEqual({'state': throttle.CLOSED, 'calls': 3, 'throttled': 1, 'retried': 2, 'rejected': 0},
+                         self.throttle.stats())
+        self.assertEqual(2, self.sleep.call_count)
+
+    def test_no_retry_client_error(self):
+        self.ec2.get_all_reservations.side_effect = EC2ResponseError(400, 'InvalidParameterValue')
+        self.assertRaises(EC2ResponseError, self.throttle.get_all_reservations)
+        self.assertEqual(0, self.throttle.retried)
+
+    def test_retry_budget(self):
+        self.throttle.retry_tokens = 1
+        self.ec2.get_all_reservations.side_effect = EC2ResponseError(503, 'RequestLimitExceeded')
+        self.assertRaises(EC2ResponseError, self.throttle.get_all_reservations)
+        self.assertEqual(1, self.throttle.retried)
+
+    def test_circuit_breaker(self):
+        self.ec2.get_all_reservations.side_effect = EC2ResponseError(400, 'InvalidParameterValue')
+        for i in range(2):
+            self.assertRaises(EC2ResponseError, self.throttle.get_all_reservations)
+        self.assertEqual(throttle.OPEN, self.throttle.state)
+        self.assertRaises(throttle.CircuitOpenError, self.throttle.get_all_reservations)
+        self.assertEqual(2, self.ec2.get_all_reservations.call_count)
+        self.assertEqual(1, self.throttle.rejected)
+
+        self.throttle.opened -= 60
+        concurrent = []
+
+        def trial(*args, **kwargs):
+            self.assertRaises(throttle.CircuitOpenError, self.throttle.get_all_reservations)
+            concurrent.append(self.throttle.state)
+            return []
+
+        self.ec2.get_all_reservations.side_effect = trial
+        self.assertEqual([], self.throttle.get_all_reservations())
+        self.assertEqual([throttle.HALF_OPEN], concurrent)
+        self.assertEqual(2, self.throttle.rejected)
+        self.assertEqual(throttle.CLOSED, self.throttle.state)
@@ -0,0 +1,75 @@
+import threading
+import tempfile
+import shutil
+import os
+
+from tests import unittest
+from tests import mock
+from unbound_ec2 import worker
+from unbound_ec2 import index
+from unbound_ec2 import config
+
+
+class TestPublisher(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.index_file = os.path.join(self.directory, 'bogus.index')
+        self.lookup = mock.Mock()
+        self.lookup.cache = {'web.bogus.tld': ('web.bogus.tld. 300 IN A 10.0.0.1',)}
+        self.lookup.weights = {}
+        self.lookup.refresh_lock = threading.Lock()
+        self.publisher = worker.Publisher(self.lookup, self.index_file)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+        self.publisher = None
+
+    def test_invalidate(self):
+        self.lookup.refresh.return_value = set(['web.bogus.tld'])
+        self.assertEqual(set(['web.bogus.tld']), self.publisher.invalidate())
+        current = index.Index(self.index_file)
+        self.assertEqual(1, current.generation)
+        self.assertIsNone(current.changes())
+        self.assertEqual(self.lookup.cache['web.bogus.tld'], current.get('web.bogus.tld'))
+
+        self.lookup.refresh.return_value = set()
+        self.publisher.invalidate()
+        self.assertEqual(1, index.Index(self.index_file).generation)
+
+        self.lookup.refresh.return_value = set(['db.bogus.tld'])
+        self.publisher.invalidate()
+        current = index.Index(self.index_file)
+        self.assertEqual(2, current.generation)
+        self.assertEqual(set(['db.bogus.tld']), current.changes())
+
+    def test_update(self):
+        self.lookup.update.return_value = set(['web.bogus.tld'])
+        self.publisher.update(['i-1'], ['i-2'])
+        self.lookup.update.assert_called_once_with(['i-1'], ['i-2'])
+        self.assertEqual(1, index.Index(self.index_file).generation)
+
+    def test_publish_holds_refresh_lock(self):
+        self.lookup.refresh_lock.acquire()
+        thread = threading.Thread(target=self.publisher.publish, args=(set(['web.bogus.tld']),))
+        thread.start()
+        thread.join(0.2)
+        self.assertFalse(os.path.exists(self.index_file))
+        self.lookup.refresh_lock.release()
+        thread.join(5)
+        self.assertEqual(1, index.Index(self.index_file).generation)
+
+    def test_reload(self):
+        conf = config.UnboundEc2Conf()
+        conf.set_defaults()
+        conf.main['ttl'] = 60
+        self.lookup.rerender.return_value = set(['web.bogus.tld'])
+        worker.log_warn = mock.Mock()
+        worker.reload(self.publisher, None, conf, set([('main', 'ttl'), ('server', 'loading')]))
+        self.lookup.rerender.assert_called_once_with(60, conf.main['ip_order'])
+        self.assertEqual(1, index.Index(self.index_file).generation)
+        self.assertFalse(worker.log_warn.called)
+
+        worker.reload(self.publisher, None, conf, set([('main', 'zone')]))
+        self.assertEqual(1, self.lookup.rerender.call_count)
+        self.assertTrue(worker.log_warn.called)
+
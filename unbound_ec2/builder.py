@@ -0,0 +1,81 @@
+import threading
+
+from unbound_ec2 import lookup
+from unbound_ec2 import inventory
+from unbound_ec2 import throttle
+
+# boto takes longer to import than the whole module, it is only imported once EC2 is first called
+EC2Connection = None
+
+
+class LazyConnection:
+    """EC2 connection to a region, set up on its first call.
+    The first call happens in the refresh thread, so neither importing boto nor connecting delays startup.
+    """
+
+    def __init__(self, region):
+        self.region = region
+        self.connection = None
+        self.lock = threading.Lock()
+
+    def get_all_reservations(self, *args, **kwargs):
+        return self.connect().get_all_reservations(*args, **kwargs)
+
+    def connect(self):
+        global EC2Connection
+        with self.lock:
+            if self.connection is None:
+                import boto.ec2
+                if EC2Connection is None:
+                    from boto.ec2.connection import EC2Connection
+                self.connection = EC2Connection(region=boto.ec2.get_region(self.region))
+            return self.connection
+
+
+def fleet(conf):
+    """Builds the rate limited EC2 connections to every configured region.
+
+    :param conf: UnboundEc2Conf instance
+    :return: inventory.Fleet instance
+    """
+    regions = [region.strip() for region in conf.ec2['aws_region'].split(',') if region.strip()]
+    return inventory.Fleet(dict((region, throttle.Throttle(LazyConnection(region),
+                                                           conf.ec2['rate'],
+                                                           conf.ec2['burst'],
+                                                           conf.ec2['retries'],
+                                                           failure_threshold=conf.ec2['circuit_threshold'],
+                                                           reset_timeout=conf.ec2['circuit_reset']))
+                                 for region in regions),
+                           conf.ec2['workers'],
+                           conf.ec2['timeout'])
+
+
+def direct_lookup(conf, ec2):
+    return lookup.DirectLookup(ec2,
+                               conf.main['zone'],
+                               conf.lookup_filters,
+                               conf.lookup['tag_name_include_domain'],
+                               conf.main['ttl'],
+                               conf.main['ip_order'],
+                               conf.lookup['max_results'],
+                               zones=conf.zones,
+                               freshness=conf.lookup['freshness'],
+                               interface_names=conf.lookup['interface_names'],
+                               weight_tag=conf.lookup['weight_tag'] or None)
+
+
+def cache_lookup(conf, ec2):
+    return lookup.CacheLookup(ec2,
+                              conf.main['zone'],
+                              conf.lookup_filters,
+                              conf.lookup['tag_name_include_domain'],
+                              conf.main['ttl'],
+                              conf.main['ip_order'],
+                              conf.lookup['max_results'],
+                              conf.lookup['refresh'],
+                              zones=conf.zones,
+                              snapshot_file=conf.lookup['snapshot_file'] or None,
+                              snapshot_max_age=conf.lookup['snapshot_max_age'],
+                              interface_names=conf.lookup['interface_names'],
+                              weight_tag=conf.lookup['weight_tag'] or None,
+                              snapshot_url=conf.lookup['snapshot_url'] or None)
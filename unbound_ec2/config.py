@@ -1,19 +1,69 @@
 import ConfigParser
+import threading
 import os.path
 import ast
 
 DEFAULT_CONF_FILE = '/etc/unbound/unbound_ec2.conf'
 DEFAULT_AWS_REGION = 'us-west-1'
+DEFAULT_EC2_WORKERS = '4'
+DEFAULT_EC2_TIMEOUT = '30'
+DEFAULT_EC2_RATE = '5'
+DEFAULT_EC2_BURST = '10'
+DEFAULT_EC2_RETRIES = '3'
+DEFAULT_EC2_CIRCUIT_THRESHOLD = '5'
+DEFAULT_EC2_CIRCUIT_RESET = '60'
 DEFAULT_ZONE = 'zone.tld'
 DEFAULT_REVERSE_ZONE = '127.in-addr.arpa'
 DEFAULT_TTL = '300'
 DEFAULT_CACHE_TTL = '30'
+DEFAULT_NEGATIVE_TTL = '60'
 DEFAULT_SERVER_TYPE = 'caching'
+DEFAULT_SERVER_CACHE_SIZE = '10000'
+DEFAULT_SERVER_LOADING = 'servfail'
+DEFAULT_SERVER_ANSWER_ORDER = 'fixed'
+DEFAULT_SERVER_MAX_ANSWERS = '0'
 DEFAULT_LOOKUP_TYPE = 'cache'
 DEFAULT_LOOKUP_TAG_NAME_INCLUDE_DOMAIN = 'True'
 DEFAULT_LOOKUP_FILTERS = "{'instance-state-name': 'running'}"
+DEFAULT_LOOKUP_MAX_RESULTS = '1000'
+DEFAULT_LOOKUP_REFRESH = 'incremental'
+DEFAULT_LOOKUP_FRESHNESS = '1'
+DEFAULT_LOOKUP_REFRESH_JITTER = '0.1'
+DEFAULT_LOOKUP_REFRESH_MIN_INTERVAL = '0'
+DEFAULT_LOOKUP_REFRESH_MAX_INTERVAL = '0'
+DEFAULT_LOOKUP_REFRESH_MAX_BACKOFF = '600'
+DEFAULT_LOOKUP_SNAPSHOT_FILE = ''
+DEFAULT_LOOKUP_SNAPSHOT_MAX_AGE = '3600'
+DEFAULT_LOOKUP_INTERFACE_NAMES = 'False'
+DEFAULT_LOOKUP_WEIGHT_TAG = ''
+DEFAULT_LOOKUP_INDEX_FILE = '/var/lib/unbound/unbound_ec2.index'
+DEFAULT_LOOKUP_INDEX_CHECK_INTERVAL = '1'
+DEFAULT_LOOKUP_SNAPSHOT_URL = ''
 DEFAULT_IP_ORDER = 'private'
 DEFAULT_FORWARDED_ZONES = ''
+ZONE_SECTION_PREFIX = 'zone:'
+DEFAULT_EVENTS_ENABLED = 'False'
+DEFAULT_EVENTS_ADDRESS = '127.0.0.1'
+DEFAULT_EVENTS_PORT = '5380'
+DEFAULT_EVENTS_RECONCILE_TTL = '900'
+DEFAULT_METRICS_ENABLED = 'False'
+DEFAULT_METRICS_ADDRESS = '127.0.0.1'
+DEFAULT_METRICS_PORT = '9167'
+DEFAULT_PUBLISHER_ENABLED = 'False'
+DEFAULT_PUBLISHER_ADDRESS = '127.0.0.1'
+DEFAULT_PUBLISHER_PORT = '9168'
+DEFAULT_RELOAD_INTERVAL = '0'
+SECTIONS = ['ec2', 'main', 'lookup', 'lookup_filters', 'server', 'events', 'metrics', 'publisher', 'zones']
+# Settings records are rendered with, a reload renders the cached instances again instead of fetching them
+RENDERING_SETTINGS = frozenset([('main', 'ttl'), ('main', 'ip_order')])
+# Settings only the server and the refresh scheduler are built from, a reload keeps the current lookup
+SERVING_SETTINGS = frozenset([('main', 'reverse_zone'), ('main', 'negative_ttl'), ('main', 'forwarded_zones'),
+                              ('main', 'cache_ttl'), ('server', 'type'),
+                              ('server', 'cache_size'), ('server', 'loading'), ('server', 'answer_order'),
+                              ('server', 'max_answers'), ('lookup', 'refresh_jitter'),
+                              ('lookup', 'refresh_min_interval'), ('lookup', 'refresh_max_interval'),
+                              ('lookup', 'refresh_max_backoff'), ('lookup', 'index_check_interval'),
+                              ('events', 'reconcile_ttl')])
 
 
 class UnboundEc2Conf(object):
@@ -30,27 +80,100 @@ class UnboundEc2Conf(object):
         self.lookup = {}
         self.lookup_filters = {}
         self.server = {}
+        self.events = {}
+        self.metrics = {}
+        self.publisher = {}
+        self.zones = {}
+        self.mtime = None
 
     def set_defaults(self):
         """Sets default values for defined self instance attributes.
 
         """
         self.ec2['aws_region'] = os.environ.get('AWS_DEFAULT_REGION', DEFAULT_AWS_REGION).encode('ascii')
+        self.ec2['workers'] = self.__try_type(
+            os.environ.get('UNBOUND_EC2_WORKERS', DEFAULT_EC2_WORKERS).encode('ascii'))
+        self.ec2['timeout'] = self.__try_type(
+            os.environ.get('UNBOUND_EC2_TIMEOUT', DEFAULT_EC2_TIMEOUT).encode('ascii'))
+        self.ec2['rate'] = self.__try_type(os.environ.get('UNBOUND_EC2_RATE', DEFAULT_EC2_RATE).encode('ascii'))
+        self.ec2['burst'] = self.__try_type(os.environ.get('UNBOUND_EC2_BURST', DEFAULT_EC2_BURST).encode('ascii'))
+        self.ec2['retries'] = self.__try_type(
+            os.environ.get('UNBOUND_EC2_RETRIES', DEFAULT_EC2_RETRIES).encode('ascii'))
+        self.ec2['circuit_threshold'] = self.__try_type(
+            os.environ.get('UNBOUND_EC2_CIRCUIT_THRESHOLD', DEFAULT_EC2_CIRCUIT_THRESHOLD).encode('ascii'))
+        self.ec2['circuit_reset'] = self.__try_type(
+            os.environ.get('UNBOUND_EC2_CIRCUIT_RESET', DEFAULT_EC2_CIRCUIT_RESET).encode('ascii'))
         self.main['zone'] = os.environ.get('UNBOUND_ZONE', DEFAULT_ZONE).encode('ascii')
         self.main['reverse_zone'] = os.environ.get('UNBOUND_REVERSE_ZONE', DEFAULT_REVERSE_ZONE).encode('ascii')
         self.main['ttl'] = self.__try_type(os.environ.get('UNBOUND_TTL', DEFAULT_TTL).encode('ascii'))
         self.main['cache_ttl'] = self.__try_type(
             os.environ.get('UNBOUND_CACHE_TTL', DEFAULT_CACHE_TTL).encode('ascii'))
+        self.main['negative_ttl'] = self.__try_type(
+            os.environ.get('UNBOUND_NEGATIVE_TTL', DEFAULT_NEGATIVE_TTL).encode('ascii'))
         self.server['type'] = os.environ.get('UNBOUND_SERVER_TYPE', DEFAULT_SERVER_TYPE).encode('ascii')
+        self.server['cache_size'] = self.__try_type(
+            os.environ.get('UNBOUND_SERVER_CACHE_SIZE', DEFAULT_SERVER_CACHE_SIZE).encode('ascii'))
+        self.server['loading'] = os.environ.get('UNBOUND_SERVER_LOADING', DEFAULT_SERVER_LOADING).encode('ascii')
+        self.server['answer_order'] = os.environ.get('UNBOUND_SERVER_ANSWER_ORDER',
+                                                     DEFAULT_SERVER_ANSWER_ORDER).encode('ascii')
+        self.server['max_answers'] = self.__try_type(
+            os.environ.get('UNBOUND_SERVER_MAX_ANSWERS', DEFAULT_SERVER_MAX_ANSWERS).encode('ascii'))
         self.lookup['type'] = os.environ.get('UNBOUND_LOOKUP_TYPE', DEFAULT_LOOKUP_TYPE).encode('ascii')
         self.lookup['tag_name_include_domain'] = self.__try_type(
             os.environ.get('UNBOUND_LOOKUP_TAG_NAME_INCLUDE_DOMAIN',
                            DEFAULT_LOOKUP_TAG_NAME_INCLUDE_DOMAIN).encode('ascii'))
+        self.lookup['max_results'] = self.__try_type(
+            os.environ.get('UNBOUND_LOOKUP_MAX_RESULTS', DEFAULT_LOOKUP_MAX_RESULTS).encode('ascii'))
+        self.lookup['refresh'] = os.environ.get('UNBOUND_LOOKUP_REFRESH', DEFAULT_LOOKUP_REFRESH).encode('ascii')
+        self.lookup['refresh_jitter'] = self.__try_type(
+            os.environ.get('UNBOUND_LOOKUP_REFRESH_JITTER', DEFAULT_LOOKUP_REFRESH_JITTER).encode('ascii'))
+        self.lookup['refresh_min_interval'] = self.__try_type(
+            os.environ.get('UNBOUND_LOOKUP_REFRESH_MIN_INTERVAL', DEFAULT_LOOKUP_REFRESH_MIN_INTERVAL).encode('ascii'))
+        self.lookup['refresh_max_interval'] = self.__try_type(
+            os.environ.get('UNBOUND_LOOKUP_REFRESH_MAX_INTERVAL', DEFAULT_LOOKUP_REFRESH_MAX_INTERVAL).encode('ascii'))
+        self.lookup['refresh_max_backoff'] = self.__try_type(
+            os.environ.get('UNBOUND_LOOKUP_REFRESH_MAX_BACKOFF', DEFAULT_LOOKUP_REFRESH_MAX_BACKOFF).encode('ascii'))
+        self.lookup['freshness'] = self.__try_type(
+            os.environ.get('UNBOUND_LOOKUP_FRESHNESS', DEFAULT_LOOKUP_FRESHNESS).encode('ascii'))
+        self.lookup['snapshot_file'] = os.environ.get('UNBOUND_LOOKUP_SNAPSHOT_FILE',
+                                                      DEFAULT_LOOKUP_SNAPSHOT_FILE).encode('ascii')
+        self.lookup['snapshot_max_age'] = self.__try_type(
+            os.environ.get('UNBOUND_LOOKUP_SNAPSHOT_MAX_AGE', DEFAULT_LOOKUP_SNAPSHOT_MAX_AGE).encode('ascii'))
+        self.lookup['interface_names'] = self.__try_type(
+            os.environ.get('UNBOUND_LOOKUP_INTERFACE_NAMES', DEFAULT_LOOKUP_INTERFACE_NAMES).encode('ascii'))
+        self.lookup['weight_tag'] = os.environ.get('UNBOUND_LOOKUP_WEIGHT_TAG',
+                                                   DEFAULT_LOOKUP_WEIGHT_TAG).encode('ascii')
+        self.lookup['index_file'] = os.environ.get('UNBOUND_LOOKUP_INDEX_FILE',
+                                                   DEFAULT_LOOKUP_INDEX_FILE).encode('ascii')
+        self.lookup['index_check_interval'] = self.__try_type(
+            os.environ.get('UNBOUND_LOOKUP_INDEX_CHECK_INTERVAL', DEFAULT_LOOKUP_INDEX_CHECK_INTERVAL).encode('ascii'))
+        self.lookup['snapshot_url'] = os.environ.get('UNBOUND_LOOKUP_SNAPSHOT_URL',
+                                                     DEFAULT_LOOKUP_SNAPSHOT_URL).encode('ascii')
         self.lookup_filters = self.__try_type(
             os.environ.get('UNBOUND_LOOKUP_FILTERS', DEFAULT_LOOKUP_FILTERS).encode('ascii'))
         self.main['ip_order'] = os.environ.get('UNBOUND_IP_ORDER', DEFAULT_IP_ORDER).encode('ascii')
         self.main['forwarded_zones'] = os.environ.get('UNBOUND_FORWARDED_ZONES', DEFAULT_FORWARDED_ZONES)\
             .encode('ascii')
+        self.main['reload_interval'] = self.__try_type(
+            os.environ.get('UNBOUND_RELOAD_INTERVAL', DEFAULT_RELOAD_INTERVAL).encode('ascii'))
+        self.events['enabled'] = self.__try_type(
+            os.environ.get('UNBOUND_EVENTS_ENABLED', DEFAULT_EVENTS_ENABLED).encode('ascii'))
+        self.events['address'] = os.environ.get('UNBOUND_EVENTS_ADDRESS', DEFAULT_EVENTS_ADDRESS).encode('ascii')
+        self.events['port'] = self.__try_type(
+            os.environ.get('UNBOUND_EVENTS_PORT', DEFAULT_EVENTS_PORT).encode('ascii'))
+        self.events['reconcile_ttl'] = self.__try_type(
+            os.environ.get('UNBOUND_EVENTS_RECONCILE_TTL', DEFAULT_EVENTS_RECONCILE_TTL).encode('ascii'))
+        self.metrics['enabled'] = self.__try_type(
+            os.environ.get('UNBOUND_METRICS_ENABLED', DEFAULT_METRICS_ENABLED).encode('ascii'))
+        self.metrics['address'] = os.environ.get('UNBOUND_METRICS_ADDRESS', DEFAULT_METRICS_ADDRESS).encode('ascii')
+        self.metrics['port'] = self.__try_type(
+            os.environ.get('UNBOUND_METRICS_PORT', DEFAULT_METRICS_PORT).encode('ascii'))
+        self.publisher['enabled'] = self.__try_type(
+            os.environ.get('UNBOUND_PUBLISHER_ENABLED', DEFAULT_PUBLISHER_ENABLED).encode('ascii'))
+        self.publisher['address'] = os.environ.get('UNBOUND_PUBLISHER_ADDRESS',
+                                                   DEFAULT_PUBLISHER_ADDRESS).encode('ascii')
+        self.publisher['port'] = self.__try_type(
+            os.environ.get('UNBOUND_PUBLISHER_PORT', DEFAULT_PUBLISHER_PORT).encode('ascii'))
 
     def parse(self):
         """Tries to read defined configuration file and merge values with instance attributes.
@@ -58,22 +181,53 @@ class UnboundEc2Conf(object):
         """
         result = False
         if os.path.isfile(self.conf_file):
+            # Taken before reading, a change made while the file is read is caught by the next check
+            self.mtime = os.path.getmtime(self.conf_file)
             self.config.read(self.conf_file)
 
             for section in self.config.sections():
-                setattr(self, section, self.__get_merged_attribute(section, dict(self.config.items(section))))
+                if section.startswith(ZONE_SECTION_PREFIX):
+                    self.zones[section[len(ZONE_SECTION_PREFIX):].strip().strip('.')] = \
+                        self.__get_typed(dict(self.config.items(section)))
+                else:
+                    setattr(self, section, self.__get_merged_attribute(section, dict(self.config.items(section))))
             result = True
         return result
 
+    def modified(self):
+        """Tells whether the configuration file was changed, created or removed since it was parsed.
+
+        """
+        try:
+            mtime = os.path.getmtime(self.conf_file)
+        except OSError:
+            mtime = None
+        return mtime != self.mtime
+
+    def diff(self, other):
+        """Lists the settings whose values differ from another configuration.
+
+        :param other: UnboundEc2Conf instance
+        :return: set of (section, key) tuples, zone settings being listed as ('zones', zone name)
+        """
+        result = set()
+        for section in SECTIONS:
+            mine, theirs = getattr(self, section), getattr(other, section)
+            result.update((section, key) for key in set(mine) | set(theirs) if mine.get(key) != theirs.get(key))
+        return result
+
     def __get_merged_attribute(self, name, value):
         string_result = value
         if getattr(self, name):
             string_result = getattr(self, name).copy()
             string_result.update(value)
 
+        return self.__get_typed(string_result)
+
+    def __get_typed(self, value):
         result = {}
-        for key in string_result:
-            result[key] = self.__try_type(string_result[key])
+        for key in value:
+            result[key] = self.__try_type(value[key])
 
         return result
 
@@ -83,3 +237,35 @@ class UnboundEc2Conf(object):
         except (ValueError, SyntaxError):
             result = value
         return result
+
+
+class ConfigWatcher(object):
+    """Parses the configuration file again whenever it changes, and hands the new configuration over.
+
+    """
+
+    def __init__(self, conf, reload):
+        """
+        :param conf: parsed UnboundEc2Conf instance
+        :param reload: callable taking the current configuration, the new one and the set of changed settings
+        """
+        self.conf = conf
+        self.reload = reload
+        self.lock = threading.Lock()
+
+    def check(self):
+        """Reloads the configuration when its file changed. A failed reload is retried on the next check.
+
+        :return: set of changed settings
+        """
+        with self.lock:
+            if not self.conf.modified():
+                return set()
+            conf = UnboundEc2Conf(self.conf.conf_file)
+            conf.set_defaults()
+            conf.parse()
+            changed = self.conf.diff(conf)
+            if changed:
+                self.reload(self.conf, conf, changed)
+            self.conf = conf
+            return changed
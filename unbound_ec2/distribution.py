@@ -0,0 +1,84 @@
+from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+import threading
+
+from unboundmodule import log_info
+
+REFRESHED_HEADER = 'X-Refreshed'
+
+
+def pull(url, etag=None, timeout=10):
+    """Pulls a cache snapshot from a publisher, unless it did not change.
+
+    :param url: publisher URL
+    :param etag: ETag of the snapshot pulled last
+    :param timeout: seconds after which the request is abandoned
+    :return: (ETag, time of the publisher's last refresh, compressed snapshot) tuple, snapshot being None
+        when not modified
+    """
+    # Imported on first pull, nodes which do not pull snapshots do not pay for it on startup
+    import urllib2
+    request = urllib2.Request(url)
+    if etag:
+        request.add_header('If-None-Match', etag)
+    try:
+        response = urllib2.urlopen(request, timeout=timeout)
+    except urllib2.HTTPError as e:
+        if e.code != 304:
+            raise
+        return etag, refreshed(e.info()), None
+    return response.info().getheader('ETag'), refreshed(response.info()), response.read()
+
+
+def refreshed(headers):
+    try:
+        return float(headers.getheader(REFRESHED_HEADER))
+    except (TypeError, ValueError):
+        return None
+
+
+class SnapshotHandler(BaseHTTPRequestHandler):
+    """Serves the compressed cache snapshot on GET requests, or an empty not modified answer when the
+    requested ETag matches.
+    """
+
+    def do_GET(self):
+        etag, body, refreshed_at = self.server.lookup.snapshot()
+        if refreshed_at is None:
+            self.send_response(503)
+            self.end_headers()
+            return
+        not_modified = self.headers.getheader('If-None-Match') == etag
+        self.send_response(304 if not_modified else 200)
+        self.send_header('ETag', etag)
+        self.send_header(REFRESHED_HEADER, repr(refreshed_at))
+        if not not_modified:
+            self.send_header('Content-Type', 'application/octet-stream')
+            self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if not not_modified:
+            self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class SnapshotListener(HTTPServer):
+    """HTTP listener publishing the cache of the node polling EC2 to the other nodes.
+    """
+
+    def __init__(self, address, port, lookup):
+        """
+        :param lookup: CacheLookup instance to publish
+        """
+        HTTPServer.__init__(self, (address, port), SnapshotHandler)
+        self.lookup = lookup
+        self.thread = threading.Thread(target=self.serve_forever)
+        self.thread.daemon = True
+
+    def start(self):
+        self.thread.start()
+        log_info('Publishing snapshots on %s:%d' % self.server_address)
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
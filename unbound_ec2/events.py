@@ -0,0 +1,126 @@
+from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+import threading
+import Queue
+import json
+
+from unboundmodule import log_info, log_warn
+
+TERMINATED_STATES = ['terminated']
+
+
+def instance_ids(event):
+    """Extracts ids of instances referenced by an EC2 state-change or tag-change event.
+
+    :param event: decoded CloudWatch/EventBridge event
+    :return: (updated, removed) tuple of instance id sets
+    :raises ValueError: when the event is malformed
+    """
+    if not isinstance(event, dict):
+        raise ValueError('event is not an object')
+    detail = event.get('detail') or {}
+    resources = event.get('resources') or []
+    if not isinstance(detail, dict) or not isinstance(resources, list):
+        raise ValueError('detail is not an object or resources is not a list')
+    ids = set()
+    if detail.get('instance-id'):
+        if not isinstance(detail['instance-id'], basestring):
+            raise ValueError('instance-id is not a string')
+        ids.add(detail['instance-id'].encode('ascii'))
+    for arn in resources:
+        if not isinstance(arn, basestring):
+            raise ValueError('resource is not a string')
+        if ':instance/' in arn:
+            ids.add(arn.rsplit('/', 1)[1].encode('ascii'))
+    if detail.get('state') in TERMINATED_STATES:
+        return set(), ids
+    return ids, set()
+
+
+class EventApplier(threading.Thread):
+    """Applies queued events to the lookup cache.
+    Events which arrive while a batch is being applied are coalesced into the next batch.
+    """
+
+    def __init__(self, invalidator):
+        threading.Thread.__init__(self)
+        self.invalidator = invalidator
+        self.queue = Queue.Queue()
+        self.daemon = True
+
+    def feed(self, event):
+        self.queue.put(instance_ids(event))
+
+    def run(self):
+        while True:
+            batch = [self.queue.get()]
+            while batch[-1] is not None:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except Queue.Empty:
+                    break
+            self.apply([ids for ids in batch if ids is not None])
+            if batch[-1] is None:
+                return
+
+    def apply(self, batch):
+        updated = set()
+        removed = set()
+        for updated_ids, removed_ids in batch:
+            updated.update(updated_ids)
+            removed.update(removed_ids)
+        updated.difference_update(removed)
+        if not updated and not removed:
+            return
+        try:
+            self.invalidator.update(updated, removed)
+        except Exception as e:
+            log_warn('Unable to apply events for %s: %s' % (', '.join(sorted(updated | removed)), e))
+
+    def stop(self):
+        self.queue.put(None)
+        self.join()
+
+
+class EventHandler(BaseHTTPRequestHandler):
+    """Accepts a JSON encoded event, or a list of them, per POST request. Malformed events are skipped, only a body
+    which is not JSON is rejected.
+    """
+
+    def do_POST(self):
+        try:
+            events = json.loads(self.rfile.read(int(self.headers.getheader('content-length', 0))))
+        except ValueError:
+            self.send_response(400)
+            self.end_headers()
+            return
+        for event in events if isinstance(events, list) else [events]:
+            try:
+                self.server.applier.feed(event)
+            except ValueError as e:
+                log_warn('Skipping malformed EC2 event: %s' % e)
+        self.send_response(202)
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+class EventListener(HTTPServer):
+    """Local HTTP listener for EC2 instance state-change and tag-change events.
+    """
+
+    def __init__(self, address, port, invalidator):
+        HTTPServer.__init__(self, (address, port), EventHandler)
+        self.applier = EventApplier(invalidator)
+        self.thread = threading.Thread(target=self.serve_forever)
+        self.thread.daemon = True
+
+    def start(self):
+        self.applier.start()
+        self.thread.start()
+        log_info('Listening for EC2 events on %s:%d' % self.server_address)
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+        self.applier.stop()
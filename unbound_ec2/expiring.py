@@ -0,0 +1,61 @@
+from collections import deque
+import itertools
+import threading
+import time
+
+
+class ExpiringDict(object):
+    """Bounded mapping whose entries expire after a fixed time to live.
+    When full, the least recently stored entries are evicted first.
+    """
+
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.data = {}
+        self.order = deque()
+        self.sequence = itertools.count()
+        self.lock = threading.Lock()
+
+    def __contains__(self, key):
+        entry = self.data.get(key)
+        return entry is not None and entry[0] > time.time()
+
+    def __len__(self):
+        return len(self.data)
+
+    def get(self, key, default=None):
+        entry = self.data.get(key)
+        if entry is None or entry[0] <= time.time():
+            return default
+        return entry[1]
+
+    def set(self, key, value):
+        now = time.time()
+        expires = now + self.ttl
+        with self.lock:
+            sequence = next(self.sequence)
+            self.data[key] = (expires, value, sequence)
+            self.order.append((expires, key, sequence))
+            self.__evict(now)
+
+    def pop(self, key, default=None):
+        with self.lock:
+            entry = self.data.pop(key, None)
+        if entry is None or entry[0] <= time.time():
+            return default
+        return entry[1]
+
+    def clear(self):
+        with self.lock:
+            self.data.clear()
+            self.order.clear()
+
+    def __evict(self, now):
+        # Entries stored again leave outdated positions behind, those are skipped and compacted away
+        while self.order and (self.order[0][0] <= now or len(self.data) > self.maxsize
+                              or len(self.order) > 2 * self.maxsize):
+            expires, key, sequence = self.order.popleft()
+            entry = self.data.get(key)
+            if entry is not None and entry[2] == sequence:
+                del self.data[key]
@@ -0,0 +1,149 @@
+import struct
+import mmap
+import zlib
+import os
+
+MAGIC = 'UEC2IDX1'
+HEADER = struct.Struct('<8sQQIIII')
+BUCKET = struct.Struct('<II')
+ENTRY = struct.Struct('<HIH')
+
+
+class IndexFormatError(Exception):
+    """Raised when an index file is not a valid index.
+    """
+    pass
+
+
+def write(path, answers, weights=None, generation=1, previous=0, changes=None):
+    """Writes answers to an index file, replacing it atomically.
+    The index is a hash table of name to answer records with open addressing, laid out so that
+    it can be read in place from a read-only memory map.
+
+    :param path: index file path
+    :param answers: dictionary of name to answer records
+    :param weights: dictionary of name to answer weights
+    :param generation: generation of the index
+    :param previous: generation the changes apply to, 0 when unknown
+    :param changes: names whose answers changed since the previous generation
+    :return: size of the index in bytes
+    """
+    weights = weights or {}
+    buckets = 8
+    while buckets < len(answers) * 2:
+        buckets *= 2
+    table = [(0, 0)] * buckets
+    entries = []
+    offset = HEADER.size + buckets * BUCKET.size
+    for name, records in answers.iteritems():
+        data = '\n'.join(records)
+        name_weights = ','.join(repr(weight) for weight in weights.get(name, ()))
+        entry = ENTRY.pack(len(name), len(data), len(name_weights)) + name + data + name_weights
+        name_hash = hash_name(name)
+        slot = name_hash & (buckets - 1)
+        while table[slot][1]:
+            slot = (slot + 1) & (buckets - 1)
+        table[slot] = (name_hash, offset)
+        entries.append(entry)
+        offset += len(entry)
+    changed = '\n'.join(sorted(changes)) if changes is not None else ''
+
+    temp_path = '%s.tmp' % path
+    with open(temp_path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, generation, previous if changes is not None else 0, buckets, len(answers),
+                            offset, len(changed)))
+        f.write(''.join(BUCKET.pack(*bucket) for bucket in table))
+        f.write(''.join(entries))
+        f.write(changed)
+    os.rename(temp_path, path)
+    return offset + len(changed)
+
+
+def hash_name(name):
+    return zlib.crc32(name) & 0xffffffff
+
+
+class Index:
+    """Read-only memory mapped index, shared by every process mapping the same file.
+    Looking a name up reads its bucket and entry in place, nothing is loaded up front.
+    """
+
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            try:
+                self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError as e:
+                raise IndexFormatError('Unable to map index %s: %s' % (path, e))
+        if len(self.map) < HEADER.size:
+            raise IndexFormatError('Index %s is truncated' % path)
+        magic, self.generation, self.previous, self.buckets, self.entries, self.changes_offset, \
+            self.changes_length = HEADER.unpack_from(self.map)
+        if magic != MAGIC or len(self.map) != self.changes_offset + self.changes_length:
+            raise IndexFormatError('Index %s is not a valid index' % path)
+        self.weights = Weights(self)
+
+    def __len__(self):
+        return self.entries
+
+    def get(self, name):
+        """Returns the answer records of a name, an empty tuple when it is not indexed.
+        """
+        entry = self.__entry(name)
+        if entry is None:
+            return ()
+        offset, name_length, data_length, weights_length = entry
+        return tuple(self.map[offset + name_length:offset + name_length + data_length].split('\n'))
+
+    def get_weights(self, name):
+        """Returns the answer weights of a name, None when its answers weigh the same.
+        """
+        entry = self.__entry(name)
+        if entry is None or not entry[3]:
+            return None
+        offset, name_length, data_length, weights_length = entry
+        start = offset + name_length + data_length
+        return tuple(float(weight) for weight in self.map[start:start + weights_length].split(','))
+
+    def names(self):
+        """Iterates over every indexed name.
+        """
+        for slot in xrange(self.buckets):
+            name_hash, offset = BUCKET.unpack_from(self.map, HEADER.size + slot * BUCKET.size)
+            if offset:
+                name_length = ENTRY.unpack_from(self.map, offset)[0]
+                yield self.map[offset + ENTRY.size:offset + ENTRY.size + name_length]
+
+    def changes(self):
+        """Returns the names whose answers changed since the previous generation, None when unknown.
+        """
+        if not self.previous:
+            return None
+        data = self.map[self.changes_offset:self.changes_offset + self.changes_length]
+        return set(data.split('\n')) if data else set()
+
+    def __entry(self, name):
+        name_hash = hash_name(name)
+        mask = self.buckets - 1
+        slot = name_hash & mask
+        while True:
+            bucket_hash, offset = BUCKET.unpack_from(self.map, HEADER.size + slot * BUCKET.size)
+            if not offset:
+                return None
+            if bucket_hash == name_hash:
+                name_length, data_length, weights_length = ENTRY.unpack_from(self.map, offset)
+                offset += ENTRY.size
+                if self.map[offset:offset + name_length] == name:
+                    return offset, name_length, data_length, weights_length
+            slot = (slot + 1) & mask
+
+
+class Weights:
+    """Answer weights of an index, looked up like the weights of the other lookups.
+    """
+
+    def __init__(self, index):
+        self.index = index
+
+    def get(self, name, default=None):
+        weights = self.index.get_weights(name)
+        return default if weights is None else weights
@@ -1,5 +1,6 @@
 from unbound_ec2 import lookup
-from unboundmodule import invalidateQueryInCache, log_warn
+from unbound_ec2 import metrics
+from unboundmodule import log_warn
 
 
 class CacheInvalidator:
@@ -10,21 +11,29 @@ class CacheInvalidator:
         self.server = server
 
     def invalidate(self):
-        """Invalidates lookup cache for provided server instance.
+        """Refreshes lookup cache for provided server instance and invalidates changed names.
+        Only CacheLookup and IndexLookup instances will be processed.
+
+        :return: set of changed names
+        """
+        if isinstance(self.server.lookup, (lookup.CacheLookup, lookup.IndexLookup)):
+            names = self.server.lookup.refresh()
+            self.invalidate_names(names)
+            return names
+        else:
+            log_warn('Tried to invalidate direct lookup!')
+
+    def update(self, instance_ids=(), removed_ids=()):
+        """Refreshes provided instances only and invalidates changed names.
         Only CacheLookup instances will be processed.
 
         """
         if isinstance(self.server.lookup, lookup.CacheLookup):
-            srv_lookup = self.server.lookup
-            old_cache = srv_lookup.resolve()
-            srv_lookup.invalidate()
-            new_cache = srv_lookup.resolve()
-
-            for key in old_cache:
-                if key in new_cache and old_cache[key] == new_cache[key]:
-                    pass
-                elif key in self.server.cached_requests:
-                    qst = self.server.cached_requests.pop(key)['qstate']
-                    invalidateQueryInCache(qst, qst.qinfo)
+            self.invalidate_names(self.server.lookup.update(instance_ids, removed_ids))
         else:
-            log_warn('Tried to invalidate direct lookup!')
+            log_warn('Tried to update direct lookup!')
+
+    def invalidate_names(self, names):
+        if names:
+            metrics.registry.inc('unbound_ec2_invalidated_names_total', value=len(names))
+            self.server.invalidate(names)
@@ -0,0 +1,152 @@
+import sys
+import threading
+import time
+
+from unboundmodule import log_warn
+
+
+class FetchError(Exception):
+    """Raised when no region could be fetched.
+    """
+    pass
+
+
+class PageFetcher(threading.Thread):
+    """Fetches a single page of EC2 reservations in the background.
+    """
+
+    def __init__(self, ec2, filters, max_results, next_token=None):
+        threading.Thread.__init__(self)
+        self.ec2 = ec2
+        self.filters = filters
+        self.max_results = max_results
+        self.next_token = next_token
+        self.page = None
+        self.exc_info = None
+        self.daemon = True
+
+    def run(self):
+        try:
+            self.page = self.ec2.get_all_reservations(filters=self.filters,
+                                                      max_results=self.max_results,
+                                                      next_token=self.next_token)
+        except Exception:
+            self.exc_info = sys.exc_info()
+
+    def result(self):
+        """Waits for the page and returns it, re-raising any error of the underlying call.
+
+        """
+        self.join()
+        if self.exc_info:
+            raise self.exc_info[0], self.exc_info[1], self.exc_info[2]
+        return self.page
+
+
+def next_token(page):
+    token = getattr(page, 'next_token', None)
+    return token if isinstance(token, basestring) and token else None
+
+
+def instances(ec2, filters, max_results=None):
+    """Streams instances matching provided filters page by page.
+    Follows NextToken when max_results is set. The following page is requested while
+    the current one is consumed, so only about two pages are kept in memory at a time.
+
+    :param ec2: EC2 connection
+    :param filters: describe instances filters
+    :param max_results: page size, None fetches everything in a single call
+    """
+    if not max_results:
+        for reservation in ec2.get_all_reservations(filters=filters):
+            for instance in reservation.instances:
+                yield instance
+        return
+
+    page = ec2.get_all_reservations(filters=filters, max_results=max_results)
+    while page is not None:
+        token = next_token(page)
+        fetcher = None
+        if token:
+            fetcher = PageFetcher(ec2, filters, max_results, token)
+            fetcher.start()
+        for reservation in page:
+            for instance in reservation.instances:
+                yield instance
+        page = fetcher.result() if fetcher else None
+
+
+class Fleet(object):
+    """EC2 connections to one or more regions, fetched concurrently by a bounded number of threads.
+    A region which fails or exceeds its timeout is reported as None, so that its last good instances can be kept.
+    """
+
+    def __init__(self, connections, workers=4, timeout=None):
+        """
+        :param connections: dictionary of region name to EC2 connection
+        :param workers: maximum number of regions fetched at the same time
+        :param timeout: seconds after which a started region fetch is abandoned
+        """
+        self.connections = connections
+        self.workers = workers
+        self.timeout = timeout
+
+    def fetch(self, filters, max_results=None, transform=None):
+        """Fetches instances matching provided filters from every region.
+
+        :param filters: describe instances filters
+        :param max_results: page size
+        :param transform: callable applied to each instance while its page is consumed
+        :return: dictionary of region name to list of transformed instances, None for failed regions
+        """
+        transform = transform or (lambda instance: instance)
+        if len(self.connections) == 1 and not self.timeout:
+            region, ec2 = self.connections.items()[0]
+            return {region: [transform(i) for i in instances(ec2, filters, max_results)]}
+
+        condition = threading.Condition()
+        slots = threading.Semaphore(self.workers)
+        started = {}
+        results = {}
+
+        def run(region, ec2):
+            slots.acquire()
+            with condition:
+                started[region] = time.time()
+                condition.notify()
+            try:
+                result = [transform(i) for i in instances(ec2, filters, max_results)]
+            except Exception as e:
+                log_warn('Unable to fetch instances of region %s: %s' % (region, e))
+                result = None
+            with condition:
+                # Abandoned regions already had their slot released on timeout
+                if region not in results:
+                    results[region] = result
+                    slots.release()
+                condition.notify()
+
+        for region, ec2 in self.connections.items():
+            thread = threading.Thread(target=run, args=(region, ec2))
+            thread.daemon = True
+            thread.start()
+
+        with condition:
+            while len(results) < len(self.connections):
+                wait = None
+                now = time.time()
+                for region, start in started.items():
+                    if region in results or not self.timeout:
+                        continue
+                    if now - start >= self.timeout:
+                        log_warn('Fetching instances of region %s timed out' % region)
+                        results[region] = None
+                        slots.release()
+                    else:
+                        wait = min(wait or self.timeout, start + self.timeout - now)
+                if len(results) < len(self.connections):
+                    condition.wait(wait)
+
+        if all(result is None for result in results.values()):
+            raise FetchError('Unable to fetch instances of any region')
+        return results
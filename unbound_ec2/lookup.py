@@ -1,81 +1,930 @@
 from collections import defaultdict
 import itertools
+import threading
+import fnmatch
+import marshal
+import json
+import socket
+import time
 import copy
+import zlib
+import sys
+import os
+import re
+
+from unboundmodule import log_info, log_warn
+from unbound_ec2 import inventory
+from unbound_ec2 import metrics
+from unbound_ec2 import index
+from unbound_ec2 import distribution
+
+ZONE_FILTER_ATTRIBUTES = ['instance-state-name', 'vpc-id', 'subnet-id']
+SNAPSHOT_VERSION = 4
+REVERSE_SUFFIX = '.in-addr.arpa'
+REVERSE6_SUFFIX = '.ip6.arpa'
+INSTANCE_ID = re.compile(r'^i-[0-9a-f]+$')
+INTERFACE_ID = re.compile(r'^eni-[0-9a-f]+$')
+INTERFACE_NAME = re.compile(r'^(.+)-eth[0-9]+(\..*)?$')
+MAX_FLIGHTS = 1024
+
+
+class Zone:
+    """Served forward zone with its own TTL and optional filter.
+    Zone filters are evaluated on already fetched instances, so all zones share a single EC2 query.
+    Supported filter names are instance-state-name, vpc-id, subnet-id and tag:<key>, values may contain wildcards.
+    """
+
+    def __init__(self, name, ttl, _filter=None):
+        self.domain = canonical(name)
+        self.ttl = ttl
+        self.filter = {}
+        for key, value in (_filter or {}).items():
+            if key not in ZONE_FILTER_ATTRIBUTES and not key.startswith('tag:'):
+                raise ValueError('Unsupported filter %s for zone %s' % (key, self.domain))
+            self.filter[key] = value if isinstance(value, list) else [value]
+
+    def matches(self, attributes):
+        for key, values in self.filter.iteritems():
+            value = attributes.get(key)
+            if value is None or not any(fnmatch.fnmatchcase(value, v) for v in values):
+                return False
+        return True
+
+
+def canonical(name):
+    """Returns the canonical form names are indexed by: lower case, IDNA encoded and without surrounding dots.
+    None when the name cannot be encoded.
+    """
+    name = name.strip().strip('.').lower()
+    if not isinstance(name, unicode):
+        return name
+    try:
+        return name.encode('ascii')
+    except UnicodeError:
+        pass
+    try:
+        return name.encode('idna')
+    except UnicodeError:
+        return None
+
+
+def address_family(address):
+    """Returns the family of an IPv4 or IPv6 address, None when it is not a valid address.
+    """
+    for family in [socket.AF_INET, socket.AF_INET6]:
+        try:
+            socket.inet_pton(family, address)
+            return family
+        except (socket.error, ValueError, TypeError):
+            pass
+    return None
+
+
+def decoded(value):
+    """Returns a JSON decoded value in the form facts are extracted in: lists as tuples and text as UTF-8 strings.
+    """
+    if isinstance(value, list):
+        return tuple(decoded(item) for item in value)
+    if isinstance(value, unicode):
+        return value.encode('utf-8')
+    return value
+
+
+def reverse6(address):
+    """Returns the nibble format ip6.arpa name of an IPv6 address.
+    """
+    nibbles = socket.inet_pton(socket.AF_INET6, address).encode('hex')
+    return '.'.join(reversed(nibbles)) + REVERSE6_SUFFIX
+
+
+def unreverse6(name):
+    """Returns the compressed IPv6 address of a nibble format ip6.arpa name, None when it is not a full address.
+    """
+    nibbles = name[:-len(REVERSE6_SUFFIX)].split('.')
+    if len(nibbles) != 32 or any(len(nibble) != 1 for nibble in nibbles):
+        return None
+    try:
+        return socket.inet_ntop(socket.AF_INET6, ''.join(reversed(nibbles)).decode('hex'))
+    except (TypeError, ValueError):
+        return None
+
+
+class Flight:
+    """Single EC2 query whose result is shared by every lookup of the same name.
+    A failed query falls back to the result of the previous one, when there is one.
+    """
+
+    def __init__(self, fallback=None):
+        self.done = threading.Event()
+        self.finished = None
+        self.result = ()
+        self.exc_info = None
+        self.fallback = fallback
+        self.stale = False
+
+    def run(self, function, *args):
+        try:
+            self.result = function(*args)
+        except Exception:
+            if self.fallback is None:
+                self.exc_info = sys.exc_info()
+            else:
+                self.result = self.fallback
+                self.stale = True
+        self.fallback = None
+        self.finished = time.time()
+        self.done.set()
+
+    def wait(self):
+        self.done.wait()
+        if self.exc_info:
+            raise self.exc_info[0], self.exc_info[1], self.exc_info[2]
+        return self.result
+
+    def expired(self, freshness):
+        return self.finished is not None and (self.exc_info is not None or self.stale or
+                                              time.time() - self.finished >= freshness)
 
 
 class DirectLookup:
     """Looks up all names that correspond to provided filter.
     Every resolve call will result EC2 describe instances query.
+
+    Every private address of every network interface is reverse resolved. With interface names enabled, every
+    interface also resolves as <interface id>.<zone> and <name>-eth<device index>.<zone> to its own addresses.
+
+    A lookup queries EC2 for the requested name only, narrowing the filter down to its instance id, address
+    or Name tag. Configured tag and instance id filters replaced by the narrowed query are applied again to the
+    fetched instances, other configured filters are never replaced. Concurrent lookups of a name share a single
+    query, whose result is reused for `freshness` seconds.
+    When a query fails, the last result of the name is served instead.
+
+    Resolved names map straight to the ready-to-append A or PTR records, so answering a query
+    does not touch the EC2 instance objects. With a weight tag, names whose instances have unequal weights
+    also map to the weights of their records, in the same order.
+
+    EC2 filters are case sensitive, so names are looked up in the case they were queried with, and in lower case.
     """
+    case_sensitive = True
 
-    def __init__(self, ec2, zone, _filter, tag_name_include_domain=False):
+    def __init__(self, ec2, zone, _filter, tag_name_include_domain=False, ttl=300, ip_order='private',
+                 max_results=None, zones=None, freshness=0, interface_names=False, weight_tag=None):
+        """
+        :param ec2: EC2 connection, or inventory.Fleet of connections to several regions
+        :param zone: comma separated list of served zones
+        :param zones: optional dictionary of zone name to its ttl and filters settings
+        :param freshness: seconds a lookup result is reused for
+        :param interface_names: whether network interfaces get names of their own
+        :param weight_tag: tag holding the answer weight of an instance, instances without it weigh 1
+        """
         self.ec2 = ec2
-        self.domain = zone.strip('.')
+        self.fleet = ec2 if isinstance(ec2, inventory.Fleet) else inventory.Fleet({None: ec2})
+        self.zone_settings = dict((canonical(name), value) for name, value in (zones or {}).items())
+        self.zones = []
+        for name in zone.split(','):
+            zone_settings = self.zone_settings.get(canonical(name), {})
+            self.zones.append(Zone(name, zone_settings.get('ttl', ttl), zone_settings.get('filters')))
+        self.domain = self.zones[0].domain
+        self.ttl = ttl
+        self.ip_order = ip_order
+        self.max_results = max_results
         self.filter = copy.deepcopy(_filter)
         if tag_name_include_domain:
-            self.filter['tag:Name'] = '*%s' % self.domain
+            names = ['*%s' % z.domain for z in self.zones]
+            self.filter['tag:Name'] = names[0] if len(names) == 1 else names
+        self.weight_tag = weight_tag
+        self.filter_tags = sorted(set(key[4:] for z in self.zones for key in z.filter if key.startswith('tag:')) |
+                                  set([weight_tag] if weight_tag else []))
+        self.interface_names = interface_names
+        self.weights = {}
+        self.ready = True
+        self.freshness = freshness
+        self.flights = {}
+        self.flights_lock = threading.Lock()
 
     def resolve(self):
-        result = defaultdict(list)
-        reservations = self.ec2.get_all_reservations(filters=self.filter)
-        for instance in itertools.chain(*(i.instances for i in reservations)):
-            for name, addresses in self._lookup(instance).items():
-                result[name].extend(addresses)
-        return result
+        return self._index(self._hosts(self._fetch()))
 
     def lookup(self, name):
-        return self.resolve()[name.rstrip('.')]
+        name = name.rstrip('.')
+        with self.flights_lock:
+            flight = self.flights.get(name)
+            leader = flight is None or flight.expired(self.freshness)
+            if leader:
+                if len(self.flights) >= MAX_FLIGHTS:
+                    for key, value in self.flights.items():
+                        if value.expired(self.freshness):
+                            del self.flights[key]
+                            self.weights.pop(key.lower(), None)
+                fallback = flight.result if flight is not None and flight.exc_info is None else None
+                flight = self.flights[name] = Flight(fallback)
+        if leader:
+            flight.run(self._resolve_name, name)
+        return flight.wait()
+
+    def _resolve_name(self, original):
+        name = original.lower()
+        hosts = {}
+        for _filter in self._narrowed_filters(name, original):
+            # Narrowing replaces configured filters, they are applied again to the fetched instances
+            replaced = [key for key, value in self.filter.iteritems() if _filter[key] != value]
+            transform = lambda instance, keys=replaced: self._facts(instance) if self._matches(instance, keys) else None
+            hosts.update(self._hosts(self._fetch(_filter, transform=transform)))
+        if self.weight_tag:
+            weights = self._weights(hosts).get(name)
+            if weights:
+                self.weights[name] = weights
+            else:
+                self.weights.pop(name, None)
+        return self._index(hosts).get(name, ())
+
+    def _narrowed_filters(self, name, original=None):
+        """Narrows the lookup filter down to the instances a name can resolve to.
+
+        :param name: lower case name without trailing dot
+        :param original: name in the case it was queried with, Name tags are matched in both cases
+        :return: list of filters to query, empty when the name cannot resolve at all
+        """
+        if '*' in name or '?' in name:
+            return []
+        if name.endswith(REVERSE_SUFFIX):
+            octets = name[:-len(REVERSE_SUFFIX)].split('.')
+            if len(octets) != 4:
+                return []
+            address = '.'.join(reversed(octets))
+            return [self.__narrowed('network-interface.addresses.private-ip-address', [address]),
+                    self.__narrowed('tag:Address', self.__listed(address))]
+        if name.endswith(REVERSE6_SUFFIX):
+            address = unreverse6(name)
+            if address is None:
+                return []
+            return [self.__narrowed('network-interface.ipv6-addresses.ipv6-address', [address]),
+                    self.__narrowed('tag:Address', self.__listed(address))]
+
+        labels = [name[:-len(z.domain) - 1] for z in self.zones if name.endswith('.%s' % z.domain)]
+        if any(INSTANCE_ID.match(label) for label in labels):
+            return [self.__narrowed('instance-id', [label for label in labels if INSTANCE_ID.match(label)])]
+        if self.interface_names and any(INTERFACE_ID.match(label) for label in labels):
+            return [self.__narrowed('network-interface.network-interface-id',
+                                    [label for label in labels if INTERFACE_ID.match(label)])]
+        names = [name] + labels
+        if original and original != name:
+            # Every name is a prefix of the queried name, taken in its original case as well
+            names.extend(original[:len(n)] for n in list(names))
+        if self.interface_names:
+            # Interface names are derived from the Name tag, <name>-eth<device index>
+            names.extend(''.join(match.groups('')) for match in map(INTERFACE_NAME.match, list(names)) if match)
+        if 'tag:Name' in self.filter:
+            # Name tags have to include the domain, so only qualified names can match
+            names = [n for n in names if '.' in n]
+        return [self.__narrowed('tag:Name', list(itertools.chain(*(self.__listed(n) for n in names))))]
+
+    def __narrowed(self, key, values):
+        _filter = dict(self.filter)
+        if key in self.filter and key != 'instance-id' and not key.startswith('tag:'):
+            # Only tag and instance id filters can be applied again to fetched instances, others are kept
+            return _filter
+        _filter[key] = values
+        return _filter
+
+    def _matches(self, instance, keys):
+        """Whether an instance matches the configured filter on provided instance-id and tag:<key> keys.
+        """
+        for key in keys:
+            values = self.filter[key] if isinstance(self.filter[key], list) else [self.filter[key]]
+            value = instance.id if key == 'instance-id' else (instance.tags or {}).get(key[4:])
+            if value is None or not any(fnmatch.fnmatchcase(value, v) for v in values):
+                return False
+        return True
+
+    def __listed(self, value):
+        # Tags may hold comma separated lists of values
+        return [value, '%s,*' % value, '*,%s' % value, '*,%s,*' % value]
+
+    def _fetch(self, _filter=None, max_results=None, transform=None):
+        """Fetches facts of matching instances from every region.
+
+        :param transform: callable extracting the facts of an instance, None to skip it, defaults to _facts
+        :return: dictionary of region to list of instance facts, None for regions that failed
+        """
+        return self.fleet.fetch(_filter or self.filter, max_results or self.max_results, transform or self._facts)
+
+    def _hosts(self, regions):
+        """Renders records of every fetched instance.
 
-    def _lookup(self, instance):
+        :param regions: dictionary of region to list of instance facts
+        :return: dictionary of instance id to (facts, records) tuples
+        """
+        result = {}
+        for region_facts in regions.itervalues():
+            for facts in region_facts or ():
+                if facts is not None:
+                    result[facts[0]] = (facts, self._records(facts))
+        return result
+
+    def _index(self, hosts):
+        result = defaultdict(list)
+        for facts, records in hosts.itervalues():
+            for name, name_records in records.iteritems():
+                result[name].extend(name_records)
+        return dict((name, tuple(sorted(records))) for name, records in result.iteritems())
+
+    def _weights(self, hosts):
+        """Weighs the answers of every name, in the order of the indexed records.
+
+        :return: dictionary of name to weights tuple, for names whose instances have unequal weights only
+        """
         result = defaultdict(list)
+        for facts, records in hosts.itervalues():
+            weight = self._weight(facts)
+            for name, name_records in records.iteritems():
+                result[name].extend((record, weight) for record in name_records)
+        weights = ((name, self._aligned(pairs)) for name, pairs in result.iteritems())
+        return dict((name, name_weights) for name, name_weights in weights if name_weights)
+
+    def _aligned(self, pairs):
+        weights = tuple(weight for record, weight in sorted(pairs))
+        return weights if len(set(weights)) > 1 else None
+
+    def _weight(self, facts):
+        if not self.weight_tag:
+            return 1
+        value = dict(facts[-1]).get(self.weight_tag)
+        try:
+            return max(0.0, float(value)) if value is not None else 1
+        except ValueError:
+            return 1
+
+    def _facts(self, instance):
+        """Extracts everything records are rendered from. Facts also serve as instance fingerprint,
+        records only need to be rendered again when facts change.
+
+        :param instance: EC2 instance
+        :return: (id, state, canonical Name tag, Address tag, private address, public address, IPv6 addresses,
+            network interfaces, vpc id, subnet id, zone filter tags) tuple, network interfaces being
+            (device index, interface id, private addresses) tuples
+        """
+        return (instance.id.encode("ascii"),
+                self.__ascii(getattr(instance, 'state', None)),
+                self.__names(instance.tags.get('Name')),
+                self.__utf8(instance.tags.get('Address')),
+                self.__ascii(getattr(instance, 'private_ip_address', None)),
+                self.__ascii(getattr(instance, 'ip_address', None)),
+                self.__ipv6_addresses(instance),
+                self.__interfaces(instance),
+                self.__ascii(getattr(instance, 'vpc_id', None)),
+                self.__ascii(getattr(instance, 'subnet_id', None)),
+                tuple((key, self.__utf8(instance.tags[key])) for key in self.filter_tags if key in instance.tags))
+
+    def _records(self, facts):
+        (instance_id, state, name_tag, address_tag, private_ip_address, ip_address, ipv6_addresses, interfaces,
+         vpc_id, subnet_id, tags) = facts
+        result = defaultdict(list)
+        lookup_names = []
+        reversed_addresses = []
+
+        attributes = dict(('tag:%s' % key, value) for key, value in tags)
+        attributes.update({'instance-state-name': state, 'vpc-id': vpc_id, 'subnet-id': subnet_id})
+        zones = [zone for zone in self.zones if zone.matches(attributes)]
+        if not zones:
+            return {}
 
         # We can support multiple names by comma-separating them.
-        if 'Name' in instance.tags:
-            names = instance.tags['Name'].split(',')
-            for name in names:
-                lookup_name = name if self.domain in name else '%s.%s' % (name, self.domain)
-                result[lookup_name].append(instance)
-
-        if 'Address' in instance.tags:
-            addresses = instance.tags['Address'].split(',')
-            for address in addresses:
-                reversed_address = '.'.join(reversed(address.encode("ascii").split('.'))) + '.in-addr.arpa'
-                result[reversed_address].append(instance)
+        if name_tag is not None:
+            for name in name_tag.split(','):
+                lookup_names.extend(self.__qualify(name, zones))
+
+        if address_tag is not None:
+            tagged = [(address, address_family(address)) for address in
+                      (address.strip() for address in address_tag.split(',')) if address]
+            invalid = [address for address, family in tagged if family is None]
+            if invalid:
+                # A mistyped tag only loses its own entries, the refresh of the other instances goes on
+                log_warn('Ignoring invalid Address tag entries of %s: %s' % (instance_id, ', '.join(invalid)))
+            addresses = [address for address, family in tagged if family == socket.AF_INET]
+            ipv6_addresses = [address for address, family in tagged if family == socket.AF_INET6]
+            reversed_addresses.extend(self.__reverse(address) for address in addresses + ipv6_addresses)
+        elif self.ip_order == 'private':
+            addresses = [address for address in [private_ip_address or ip_address] if address]
+        else:
+            addresses = [address for address in [ip_address or private_ip_address] if address]
 
         # Reverse resolve private address
-        if hasattr(instance, 'private_ip_address') and instance.private_ip_address:
-            result['.'.join(reversed(instance.private_ip_address.encode("ascii").split('.'))) +
-                   '.in-addr.arpa'].append(instance)
+        if private_ip_address:
+            reversed_addresses.append(self.__reverse(private_ip_address))
+        if address_tag is None:
+            reversed_addresses.extend(self.__reverse(address) for address in ipv6_addresses)
 
-        # Reverse resolve default address
-        if hasattr(instance, 'instance') and instance.ip_address:
-            result['.'.join(reversed(instance.ip_address.encode("ascii").split('.'))) +
-                   '.in-addr.arpa'].append(instance)
+        names = list(lookup_names)
 
         # Also resolve concatenation of instance id and domain
-        id_lookup_name = "%s.%s" % (instance.id, self.domain)
-        result[id_lookup_name].append(instance)
+        lookup_names.extend(("%s.%s" % (instance_id, zone.domain), zone) for zone in zones)
 
-        return result
+        for lookup_name, zone in lookup_names:
+            for address in addresses:
+                result[lookup_name].append("%s. %d IN A %s" % (lookup_name, zone.ttl, address))
+            for address in ipv6_addresses:
+                result[lookup_name].append("%s. %d IN AAAA %s" % (lookup_name, zone.ttl, address))
+
+        primary = self.__qualify(name_tag.split(',')[0].rstrip('.'), zones) if name_tag is not None else []
+        name = '%s.' % (primary[0][0] if primary else '%s.%s' % (instance_id, zones[0].domain))
+        for reversed_address in reversed_addresses:
+            result[reversed_address].append("%s. %d IN PTR %s" % (reversed_address, self.ttl, name))
+
+        # Every private address of every interface is reverse resolved, to its interface name when enabled
+        reversed_addresses = set(reversed_addresses)
+        for device_index, interface_id, interface_addresses in interfaces:
+            target = name
+            if self.interface_names:
+                interface_names = [(self.__interface_name(n, device_index), zone) for n, zone in names]
+                interface_names.extend(("%s.%s" % (interface_id, zone.domain), zone) for zone in zones)
+                for lookup_name, zone in interface_names:
+                    for address in interface_addresses:
+                        result[lookup_name].append("%s. %d IN A %s" % (lookup_name, zone.ttl, address))
+                target = '%s.' % interface_names[0][0]
+            for address in interface_addresses:
+                reversed_address = self.__reverse(address)
+                if reversed_address not in reversed_addresses:
+                    reversed_addresses.add(reversed_address)
+                    result[reversed_address].append("%s. %d IN PTR %s" % (reversed_address, self.ttl, target))
+
+        return dict((key, tuple(records)) for key, records in result.iteritems())
+
+    def __qualify(self, name, zones):
+        """Qualifies a name with every provided zone, unless it already belongs to one of the served zones.
+
+        :return: list of (qualified name, zone) tuples
+        """
+        owners = [zone for zone in self.zones if zone.domain in name]
+        if owners:
+            owner = max(owners, key=lambda zone: len(zone.domain))
+            return [(name, owner)] if owner in zones else []
+        return [('%s.%s' % (name, zone.domain), zone) for zone in zones]
+
+    def __reverse(self, address):
+        if ':' in address:
+            return reverse6(address)
+        return '.'.join(reversed(address.split('.'))) + REVERSE_SUFFIX
+
+    def __interface_name(self, name, device_index):
+        label, domain = name.split('.', 1)
+        return '%s-eth%d.%s' % (label, device_index, domain)
+
+    def __interfaces(self, instance):
+        result = []
+        for interface in getattr(instance, 'interfaces', None) or []:
+            if getattr(interface, 'id', None) is None:
+                # boto parses ipv6AddressesSet items as interfaces too, without an id, they only hold an address
+                continue
+            attachment = getattr(interface, 'attachment', None)
+            addresses = [getattr(a, 'private_ip_address', None) for a in
+                         getattr(interface, 'private_ip_addresses', None) or []]
+            addresses = [a for a in addresses if a] or [getattr(interface, 'private_ip_address', None)]
+            result.append((getattr(attachment, 'device_index', 0) or 0,
+                           self.__ascii(getattr(interface, 'id', None)),
+                           tuple(self.__ascii(a) for a in addresses if a)))
+        return tuple(sorted(result))
+
+    def __ipv6_addresses(self, instance):
+        addresses = set(getattr(instance, 'ipv6_addresses', None) or [])
+        for interface in getattr(instance, 'interfaces', None) or []:
+            values = getattr(interface, 'ipv6_addresses', None)
+            if values is None:
+                # boto only keeps the last ipv6Address element of an interface
+                value = getattr(interface, 'ipv6Address', None)
+                values = [value] if value else []
+            addresses.update(values)
+        return tuple(sorted(self.__ascii(address) for address in addresses))
+
+    def __names(self, value):
+        if value is None:
+            return None
+        names = [name for name in (canonical(name) for name in value.split(',')) if name]
+        return ','.join(names) if names else None
+
+    def __ascii(self, value):
+        return value.encode("ascii") if value is not None else None
+
+    def __utf8(self, value):
+        # Tag values are free text, they are matched against filters read as UTF-8 from the configuration
+        return value.encode("utf-8") if isinstance(value, unicode) else value
 
 
 class CacheLookup(DirectLookup):
     """Looks up all names that correspond to provided filter and cache the results.
-    First resolve call will result EC2 describe instances query. All consecutive requests
-    will hit the existing cache.
+    Lookups only read the cache and never query EC2 themselves. Full refreshes build a new cache
+    off to the side and publish it with a single reference swap. Incremental refreshes track
+    instances by id and their facts, and only replace the names whose answers changed.
+
+    When a snapshot file is set, instances and their records are saved to it after every refresh
+    that changed them, so that a restarted module can serve right away from the last known state.
+
+    When a snapshot URL is set, refreshes pull the snapshot published by another node instead of polling EC2,
+    and only poll EC2 while the publisher is unavailable or has not refreshed for longer than the snapshot max age.
     """
+    case_sensitive = False
 
-    def __init__(self, ec2, zone, filter, tag_name_include_domain=False):
-        DirectLookup.__init__(self, ec2, zone, filter, tag_name_include_domain)
-        self.cache = defaultdict(list)
+    def __init__(self, ec2, zone, filter, tag_name_include_domain=False, ttl=300, ip_order='private',
+                 max_results=None, refresh_mode='incremental', zones=None, snapshot_file=None,
+                 snapshot_max_age=3600, interface_names=False, weight_tag=None, snapshot_url=None):
+        """
+        :param snapshot_file: path of the snapshot file, None disables snapshots
+        :param snapshot_max_age: seconds after which a snapshot is too stale to be loaded or pulled
+        :param snapshot_url: URL of the snapshot publisher to pull from, None polls EC2
+        """
+        DirectLookup.__init__(self, ec2, zone, filter, tag_name_include_domain, ttl, ip_order, max_results, zones,
+                              interface_names=interface_names, weight_tag=weight_tag)
+        self.refresh_mode = refresh_mode
+        self.snapshot_file = snapshot_file
+        self.snapshot_max_age = snapshot_max_age
+        self.snapshot_url = snapshot_url
+        self.etag = None
+        self.refreshed = None
+        self.version = 0
+        self.published = None
+        self.cache = {}
+        self.hosts = {}
+        self.host_regions = {}
+        self.owners = {}
+        self.refresh_lock = threading.Lock()
+        self.ready = False
 
     def invalidate(self, lookup_name=None):
         if lookup_name:
-            self.cache.pop(lookup_name)
+            cache = dict(self.cache)
+            cache.pop(lookup_name, None)
+            self.cache = cache
         else:
-            self.cache.clear()
+            self.cache = {}
+
+    def refresh(self):
+        """Refreshes the cache from EC2.
+
+        :return: set of names whose answers changed
+        """
+        with self.refresh_lock:
+            start = time.time()
+            changed = self._pull() if self.snapshot_url else None
+            if changed is not None:
+                mode = 'pull'
+            elif self.refresh_mode == 'incremental' and self.hosts:
+                mode, changed = 'incremental', self._refresh_incremental()
+            else:
+                mode, changed = 'full', self._refresh_full()
+            if mode != 'pull':
+                # The next pull replaces what was polled, even when the publisher snapshot did not change
+                self.etag = None
+                self.refreshed = start
+            metrics.registry.observe('unbound_ec2_refresh_seconds', time.time() - start, 'mode="%s"' % mode)
+            self.ready = True
+            self._save(changed)
+            self._serialize()
+            return changed
+
+    def update(self, instance_ids=(), removed_ids=()):
+        """Refreshes provided instances only. Updated instances that no longer match
+        the filter are removed from the cache, removed ones are dropped without querying EC2.
+
+        :param instance_ids: ids of instances to describe again
+        :param removed_ids: ids of instances known to be gone
+        :return: set of names whose answers changed
+        """
+        with self.refresh_lock:
+            changes = dict((i, None) for i in removed_ids if i in self.hosts)
+            if instance_ids:
+                _filter = dict(self.filter)
+                _filter['instance-id'] = list(instance_ids)
+                regions = self._fetch(_filter)
+                failed = set(region for region, region_facts in regions.iteritems() if region_facts is None)
+                for instance_id in instance_ids:
+                    if instance_id in self.hosts and self.host_regions.get(instance_id) not in failed:
+                        changes[instance_id] = None
+                self.__collect(regions, changes)
+            changed = self._apply(changes)
+            if changed:
+                self._save(changed)
+            self._serialize()
+            return changed
+
+    def rerender(self, ttl, ip_order):
+        """Renders the records of every cached instance again with another TTL and address order, without
+        querying EC2. Zones without a TTL of their own follow the new TTL.
+
+        :return: set of names whose answers changed
+        """
+        with self.refresh_lock:
+            self.ttl, self.ip_order = ttl, ip_order
+            for zone in self.zones:
+                zone.ttl = self.zone_settings.get(zone.domain, {}).get('ttl', ttl)
+            hosts = dict((instance_id, (facts, self._records(facts)))
+                         for instance_id, (facts, records) in self.hosts.iteritems())
+            changed = self._publish(hosts, dict(self.host_regions))
+            # Snapshots are only valid for the settings they were rendered with, even when no answer changed
+            self.version += 1
+            self._save(True)
+            self._serialize()
+            return changed
+
+    def load(self):
+        """Loads instances and their records from the snapshot file.
+        Snapshots which are too old, of another version, or rendered with other zone settings are ignored.
+
+        :return: True when the cache was loaded
+        """
+        if not self.snapshot_file:
+            return False
+        try:
+            age = time.time() - os.path.getmtime(self.snapshot_file)
+            if age > self.snapshot_max_age:
+                log_warn('Ignoring snapshot %s, %d seconds old' % (self.snapshot_file, age))
+                return False
+            with open(self.snapshot_file, 'rb') as f:
+                version, settings, hosts, host_regions = marshal.load(f)
+        except (IOError, OSError, EOFError, ValueError, TypeError) as e:
+            log_warn('Unable to load snapshot %s: %s' % (self.snapshot_file, e))
+            return False
+        if version != SNAPSHOT_VERSION or settings != self.__settings():
+            log_warn('Ignoring snapshot %s, written by another version or with other settings' % self.snapshot_file)
+            return False
+        with self.refresh_lock:
+            self._publish(hosts, host_regions)
+            self.refreshed = time.time() - age
+            self.ready = True
+            self._serialize()
+        log_info('Loaded %d instances from snapshot %s, %d seconds old' % (len(hosts), self.snapshot_file, age))
+        return True
+
+    def snapshot(self):
+        """Returns the cache as a compressed snapshot for other nodes to pull, serialized once per change.
+        Snapshots travel over the network, so they are JSON encoded and only carry instance facts and regions,
+        subscribers render records themselves.
+
+        Once a snapshot was requested, refreshes serialize the cache again when they are done, so a refresh in
+        progress never holds requests up: they are served the last serialized snapshot meanwhile.
+
+        :return: (ETag, compressed snapshot, time of the last refresh) tuple, all None when the cache was never
+            serialized yet and is being refreshed
+        """
+        published = self.published
+        if (published is None or published[0] != self.version) and self.refresh_lock.acquire(False):
+            try:
+                published = self._serialize(True)
+            finally:
+                self.refresh_lock.release()
+        if published is None:
+            return None, None, None
+        return published[1], published[2], self.refreshed
+
+    def _serialize(self, requested=False):
+        """Serializes the cache for snapshot requests when it changed since it was last serialized, with the
+        refresh lock held. Nothing is serialized until a snapshot was requested.
+
+        :return: (version, ETag, compressed snapshot) tuple, None when nothing was serialized
+        """
+        if (self.published is None and not requested) or self.refreshed is None:
+            return self.published
+        if self.published is None or self.published[0] != self.version:
+            instances = [(instance_id, self.host_regions.get(instance_id), facts)
+                         for instance_id, (facts, records) in self.hosts.iteritems()]
+            body = zlib.compress(json.dumps((SNAPSHOT_VERSION, self.__settings(), instances)))
+            self.published = (self.version, '"%08x"' % (zlib.crc32(body) & 0xffffffff), body)
+        return self.published
+
+    def _pull(self):
+        """Pulls the snapshot of the publisher and publishes it in place of the cache.
+
+        :return: set of names whose answers changed, None when the publisher is unavailable or stale
+        """
+        try:
+            etag, refreshed, body = distribution.pull(self.snapshot_url, self.etag)
+        except (IOError, ValueError) as e:
+            log_warn('Unable to pull snapshot from %s, polling EC2: %s' % (self.snapshot_url, e))
+            metrics.registry.inc('unbound_ec2_snapshot_pulls_total', 'result="error"')
+            return None
+        if refreshed is None or time.time() - refreshed > self.snapshot_max_age:
+            log_warn('Snapshot of %s is stale, polling EC2' % self.snapshot_url)
+            metrics.registry.inc('unbound_ec2_snapshot_pulls_total', 'result="stale"')
+            return None
+        if body is None:
+            self.refreshed = refreshed
+            metrics.registry.inc('unbound_ec2_snapshot_pulls_total', 'result="not_modified"')
+            return set()
+        if etag != '"%08x"' % (zlib.crc32(body) & 0xffffffff):
+            log_warn('Snapshot of %s does not match its ETag, polling EC2' % self.snapshot_url)
+            metrics.registry.inc('unbound_ec2_snapshot_pulls_total', 'result="error"')
+            return None
+        try:
+            version, settings, instances = decoded(json.loads(zlib.decompress(body)))
+            if version != SNAPSHOT_VERSION or settings != self.__settings():
+                log_warn('Snapshot of %s was written by another version or with other settings, polling EC2' %
+                         self.snapshot_url)
+                metrics.registry.inc('unbound_ec2_snapshot_pulls_total', 'result="error"')
+                return None
+            hosts = dict((instance_id, (facts, self._records(facts))) for instance_id, region, facts in instances)
+            host_regions = dict((instance_id, region) for instance_id, region, facts in instances)
+        except (zlib.error, ValueError, TypeError, AttributeError) as e:
+            log_warn('Unable to read snapshot from %s, polling EC2: %s' % (self.snapshot_url, e))
+            metrics.registry.inc('unbound_ec2_snapshot_pulls_total', 'result="error"')
+            return None
+        metrics.registry.inc('unbound_ec2_snapshot_pulls_total', 'result="pulled"')
+        self.etag, self.refreshed = etag, refreshed
+        return self._publish(hosts, host_regions)
+
+    def _save(self, changed):
+        """Writes instances and their records to the snapshot file, replacing it atomically.
+        An unchanged cache only refreshes the snapshot modification time.
+        """
+        if not self.snapshot_file:
+            return
+        try:
+            if not changed and os.path.exists(self.snapshot_file):
+                os.utime(self.snapshot_file, None)
+                return
+            path = '%s.tmp' % self.snapshot_file
+            with open(path, 'wb') as f:
+                marshal.dump((SNAPSHOT_VERSION, self.__settings(), self.hosts, self.host_regions), f)
+            os.rename(path, self.snapshot_file)
+        except (IOError, OSError) as e:
+            log_warn('Unable to save snapshot %s: %s' % (self.snapshot_file, e))
+
+    def __settings(self):
+        # Records are rendered according to these, a snapshot is only valid for the same ones
+        return repr(([(z.domain, z.ttl, sorted(z.filter.items())) for z in self.zones],
+                     sorted(self.filter.items()), self.ttl, self.ip_order, self.interface_names, self.weight_tag))
 
     def resolve(self):
-        if len(self.cache) < 1:
-            self.cache = DirectLookup.resolve(self)
         return self.cache
+
+    def lookup(self, name):
+        return self.cache.get(name.rstrip('.'), ())
+
+    def _refresh_full(self):
+        regions = self._fetch()
+        hosts = self._hosts(regions)
+        host_regions = dict((facts[0], region) for region, region_facts in regions.iteritems()
+                            for facts in region_facts or ())
+        # Failed regions keep serving their last good instances
+        for instance_id, region in self.host_regions.iteritems():
+            if region in regions and regions[region] is None:
+                hosts[instance_id] = self.hosts[instance_id]
+                host_regions[instance_id] = region
+        return self._publish(hosts, host_regions)
+
+    def _publish(self, hosts, host_regions):
+        """Replaces the cache with a new one built off to the side from provided instances.
+
+        :return: set of names whose answers changed
+        """
+        cache = self._index(hosts)
+        weights = self._weights(hosts) if self.weight_tag else {}
+        owners = defaultdict(list)
+        for instance_id, (facts, records) in hosts.iteritems():
+            for name in records:
+                owners[name].append(instance_id)
+
+        old_cache, old_hosts = self.cache, self.hosts
+        self.hosts, self.host_regions, self.owners, self.cache = hosts, host_regions, dict(owners), cache
+        self.weights = weights
+        changed = set(name for name, records in cache.iteritems() if old_cache.get(name) != records)
+        changed.update(name for name in old_cache if name not in cache)
+        if changed or hosts != old_hosts:
+            self.version += 1
+        return changed
+
+    def _refresh_incremental(self):
+        regions = self._fetch()
+        changes = {}
+        seen = self.__collect(regions, changes)
+        # Failed regions keep serving their last good instances
+        failed = set(region for region, region_facts in regions.iteritems() if region_facts is None)
+        for instance_id in set(self.hosts).difference(seen):
+            if self.host_regions.get(instance_id) not in failed:
+                changes[instance_id] = None
+        return self._apply(changes)
+
+    def __collect(self, regions, changes):
+        """Collects changes of fetched instances, rendering records only for instances whose facts changed.
+
+        :return: set of fetched instance ids
+        """
+        seen = set()
+        for region, region_facts in regions.iteritems():
+            for facts in region_facts or ():
+                seen.add(facts[0])
+                self.host_regions[facts[0]] = region
+                host = self.hosts.get(facts[0])
+                if host is None or host[0] != facts:
+                    changes[facts[0]] = (facts, self._records(facts))
+                else:
+                    changes.pop(facts[0], None)
+        return seen
+
+    def _apply(self, changes):
+        """Applies instance changes to the live cache, one name at a time.
+
+        :param changes: dictionary of instance id to new (facts, records) tuple, or None when removed
+        :return: set of names whose answers changed
+        """
+        names = set()
+        for instance_id, host in changes.iteritems():
+            if host is None:
+                self.host_regions.pop(instance_id, None)
+            old_host = self.hosts.pop(instance_id, None)
+            if old_host:
+                for name in old_host[1]:
+                    self.owners[name].remove(instance_id)
+                    names.add(name)
+            if host:
+                self.hosts[instance_id] = host
+                for name in host[1]:
+                    self.owners.setdefault(name, []).append(instance_id)
+                    names.add(name)
+
+        changed = set()
+        for name in names:
+            owners = self.owners.get(name)
+            records = tuple(sorted(itertools.chain(*(self.hosts[i][1][name] for i in owners)))) if owners else ()
+            if self.weight_tag:
+                weights = self._aligned([(record, self._weight(self.hosts[i][0]))
+                                         for i in owners or () for record in self.hosts[i][1][name]])
+                if weights:
+                    self.weights[name] = weights
+                else:
+                    self.weights.pop(name, None)
+            if records == self.cache.get(name, ()):
+                continue
+            changed.add(name)
+            if records:
+                self.cache[name] = records
+            else:
+                self.cache.pop(name, None)
+                self.owners.pop(name, None)
+        if changes:
+            self.version += 1
+        return changed
+
+
+class IndexLookup:
+    """Looks names up in a memory mapped index published by the inventory worker process.
+    EC2 is never queried from Unbound's process, so refreshes do not compete with queries for the interpreter.
+    A refresh only checks whether the worker published a new index, and maps it in place of the current one.
+    """
+    case_sensitive = False
+
+    def __init__(self, index_file):
+        """
+        :param index_file: path of the index published by the worker
+        """
+        self.index_file = index_file
+        self.index = None
+        self.stat = None
+        self.weights = {}
+        self.ready = False
+
+    def load(self):
+        """Maps the index when it was already published.
+
+        :return: True when the index was mapped
+        """
+        try:
+            self.refresh()
+        except (IOError, OSError, index.IndexFormatError) as e:
+            log_warn('Unable to load index %s: %s' % (self.index_file, e))
+        return self.ready
+
+    def refresh(self):
+        """Maps the index again when the worker published a new one.
+
+        :return: set of names whose answers changed
+        """
+        try:
+            stat = os.stat(self.index_file)
+        except OSError:
+            return set()
+        stat = (stat.st_ino, stat.st_mtime, stat.st_size)
+        if stat == self.stat:
+            return set()
+        new_index = index.Index(self.index_file)
+        old_index = self.index
+        # Lookups in flight keep reading the index they started with, it is unmapped once no longer referenced
+        self.index, self.weights, self.stat = new_index, new_index.weights, stat
+        if not self.ready:
+            log_info('Mapped index %s with %d names' % (self.index_file, len(new_index)))
+        self.ready = True
+        if old_index is None:
+            return set()
+        changed = new_index.changes() if new_index.previous == old_index.generation else None
+        if changed is None:
+            changed = set(old_index.names()).union(new_index.names())
+        return changed
+
+    def invalidate(self, lookup_name=None):
+        pass
+
+    def resolve(self):
+        current = self.index
+        return dict((name, current.get(name)) for name in current.names()) if current else {}
+
+    def lookup(self, name):
+        current = self.index
+        return current.get(name.rstrip('.')) if current else ()
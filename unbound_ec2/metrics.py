@@ -0,0 +1,163 @@
+from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+from collections import defaultdict
+import threading
+import bisect
+
+from unboundmodule import log_info
+
+LATENCY_BUCKETS = (0.00001, 0.00005, 0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1)
+DURATION_BUCKETS = (0.1, 0.5, 1, 5, 10, 30, 60, 120, 300)
+
+
+class Metrics:
+    """In-process counters, histograms and gauges.
+    Counters and histograms are recorded into per-thread tables, so recording takes no lock. The tables
+    are only summed up when the metrics are collected. Gauges are read from callables at collection time.
+    """
+
+    def __init__(self):
+        self.local = threading.local()
+        self.tables = []
+        self.buckets = {}
+        self.gauges = {}
+        self.lock = threading.Lock()
+
+    def inc(self, name, labels='', value=1):
+        """Increments a counter.
+
+        :param name: metric name
+        :param labels: rendered Prometheus labels, e.g. 'type="A"'
+        :param value: increment
+        """
+        self.__table()[(name, labels)] += value
+
+    def histogram(self, name, buckets):
+        """Declares the bucket upper bounds of a histogram.
+        """
+        self.buckets[name] = tuple(buckets)
+
+    def observe(self, name, value, labels=''):
+        """Records a value in a declared histogram.
+        """
+        table = self.__table()
+        buckets = self.buckets[name]
+        index = bisect.bisect_left(buckets, value)
+        if index < len(buckets):
+            table[(name, labels, index)] += 1
+        table[(name, labels, 'sum')] += value
+        table[(name, labels, 'count')] += 1
+
+    def gauge(self, name, function, labels=''):
+        """Registers a gauge, read by calling function at collection time.
+        """
+        self.gauges[(name, labels)] = function
+
+    def clear_gauges(self):
+        """Unregisters every gauge, so that those of replaced objects are not read anymore.
+        """
+        self.gauges = {}
+
+    def collect(self):
+        """Sums up every thread's counters and histograms.
+
+        :return: dictionary of metric key to value
+        """
+        with self.lock:
+            tables = list(self.tables)
+        result = defaultdict(int)
+        for table in tables:
+            for key, value in table.items():
+                result[key] += value
+        return result
+
+    def render(self):
+        """Renders every metric in Prometheus text format.
+        """
+        counters = defaultdict(list)
+        histograms = defaultdict(lambda: defaultdict(dict))
+        for key, value in self.collect().iteritems():
+            if len(key) == 2:
+                counters[key[0]].append((key[1], value))
+            else:
+                histograms[key[0]][key[1]][key[2]] = value
+
+        lines = []
+        for name in sorted(counters):
+            lines.append('# TYPE %s counter' % name)
+            for labels, value in sorted(counters[name]):
+                lines.append('%s%s %s' % (name, self.__labels(labels), value))
+        for name in sorted(histograms):
+            lines.append('# TYPE %s histogram' % name)
+            for labels, values in sorted(histograms[name].items()):
+                cumulative = 0
+                for index, bound in enumerate(self.buckets[name]):
+                    cumulative += values.get(index, 0)
+                    lines.append('%s_bucket%s %d' % (name, self.__labels(labels, 'le="%s"' % bound), cumulative))
+                lines.append('%s_bucket%s %d' % (name, self.__labels(labels, 'le="+Inf"'), values.get('count', 0)))
+                lines.append('%s_sum%s %s' % (name, self.__labels(labels), values.get('sum', 0)))
+                lines.append('%s_count%s %d' % (name, self.__labels(labels), values.get('count', 0)))
+        typed = set()
+        for (name, labels), function in sorted(self.gauges.items()):
+            try:
+                value = function()
+            except Exception:
+                continue
+            if value is None:
+                continue
+            if name not in typed:
+                lines.append('# TYPE %s gauge' % name)
+                typed.add(name)
+            lines.append('%s%s %s' % (name, self.__labels(labels), value))
+        return '\n'.join(lines) + '\n'
+
+    def __table(self):
+        table = getattr(self.local, 'table', None)
+        if table is None:
+            table = self.local.table = defaultdict(int)
+            with self.lock:
+                self.tables.append(table)
+        return table
+
+    def __labels(self, *labels):
+        labels = ','.join(label for label in labels if label)
+        return '{%s}' % labels if labels else ''
+
+
+registry = Metrics()
+registry.histogram('unbound_ec2_operate_seconds', LATENCY_BUCKETS)
+registry.histogram('unbound_ec2_refresh_seconds', DURATION_BUCKETS)
+
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    """Serves the metrics in Prometheus text format on GET requests.
+    """
+
+    def do_GET(self):
+        body = self.server.metrics.render()
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class MetricsListener(HTTPServer):
+    """Local HTTP listener exposing the metrics.
+    """
+
+    def __init__(self, address, port, metrics=registry):
+        HTTPServer.__init__(self, (address, port), MetricsHandler)
+        self.metrics = metrics
+        self.thread = threading.Thread(target=self.serve_forever)
+        self.thread.daemon = True
+
+    def start(self):
+        self.thread.start()
+        log_info('Serving metrics on %s:%d' % self.server_address)
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
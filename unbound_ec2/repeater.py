@@ -1,23 +1,100 @@
 import threading
+import random
+import time
 
+from unboundmodule import log_warn
 
-class RecursiveRepeater(threading.Thread):
-    """Periodically runs code in a thread.
+
+class RefreshScheduler(threading.Thread):
+    """Periodically runs a refresh in a thread.
+    Runs are scheduled at a fixed rate from the start of the previous run, with jitter so that many
+    resolvers do not refresh in lockstep. The interval shrinks while refreshes report changes and grows
+    back while they do not, and failed refreshes are retried with exponential backoff.
     """
 
-    def __init__(self, delay, callme):
-        """Calls `callme`  every  `delay` seconds.
+    def __init__(self, interval, callme, jitter=0.1, min_interval=None, max_interval=None, max_backoff=600,
+                 prepare=None):
+        """Calls `callme` every `interval` seconds.
+
+        :param callme: refresh callable, returning the changes it found
+        :param jitter: fraction of the interval each run is randomly moved by
+        :param min_interval: shortest interval while changes are found, defaults to interval
+        :param max_interval: longest interval while nothing changes, defaults to interval
+        :param max_backoff: longest delay between failed runs
+        :param prepare: callable run once in the thread before the first run, off the caller's startup path
         """
         threading.Thread.__init__(self)
         self.callme = callme
-        self.delay = delay
+        self.prepare = prepare
+        self.interval = interval
+        self.jitter = jitter
+        self.min_interval = min(min_interval or interval, interval)
+        self.max_interval = max(max_interval or interval, interval)
+        self.max_backoff = max_backoff
+        self.current_interval = interval
+        self.failures = 0
+        self.runs = 0
+        self.errors = 0
+        self.last_run = None
+        self.last_duration = None
+        self.next_run = time.time()
         self.event = threading.Event()
         self.daemon = True
 
     def run(self):
-        while not self.event.wait(1.0):
-            self.callme()
-            self.event.wait(self.delay)
+        if self.prepare:
+            try:
+                self.prepare()
+            except Exception as e:
+                log_warn('Refresh preparation failed: %s' % e)
+        while True:
+            # Event.wait only returns whether the event is set since Python 2.7
+            self.event.wait(max(0, self.next_run - time.time()))
+            if self.event.is_set():
+                break
+            start = time.time()
+            try:
+                changes = self.callme()
+                failed = False
+            except Exception as e:
+                log_warn('Refresh failed: %s' % e)
+                changes = None
+                failed = True
+            self.last_run = start
+            self.last_duration = time.time() - start
+            self.schedule(start, changes, failed)
+
+    def schedule(self, start, changes, failed=False):
+        """Sets the time of the next run.
+
+        :param start: start time of the run that just completed
+        :param changes: changes found by the run
+        :param failed: whether the run failed
+        """
+        self.runs += 1
+        if failed:
+            self.errors += 1
+            self.failures += 1
+            delay = min(self.current_interval * 2 ** self.failures, self.max_backoff)
+        else:
+            self.failures = 0
+            if changes:
+                self.current_interval = max(self.min_interval, self.current_interval / 2.0)
+            else:
+                self.current_interval = min(self.max_interval, self.current_interval * 1.5)
+            delay = self.current_interval
+        delay *= 1 + random.uniform(-self.jitter, self.jitter)
+        # Runs that took longer than the interval are not made up for, the next one starts right away
+        self.next_run = max(start + delay, time.time())
+
+    def stats(self):
+        return {'interval': self.current_interval,
+                'next_run': self.next_run,
+                'last_run': self.last_run,
+                'last_duration': self.last_duration,
+                'runs': self.runs,
+                'errors': self.errors,
+                'failures': self.failures}
 
     def stop(self):
         self.event.set()
@@ -1,15 +1,27 @@
-from boto.ec2.connection import EC2Connection
-import boto
-
-from unboundmodule import log_info
+from unboundmodule import log_info, log_warn
 from unbound_ec2 import config
+from unbound_ec2 import builder
 from unbound_ec2 import server
 from unbound_ec2 import lookup
 from unbound_ec2 import repeater
 from unbound_ec2 import invalidator
+from unbound_ec2 import events
+from unbound_ec2 import throttle
+from unbound_ec2 import metrics
+from unbound_ec2 import distribution
+
+# Listeners are bound on startup, changing their settings takes a restart
+LISTENER_SECTIONS = ['events', 'metrics', 'publisher']
+# The configuration watcher applies reloads, it is only rebuilt on restart
+RESTART_SETTINGS = frozenset([('main', 'reload_interval')])
 
 _server = None
 _rr = None
+_invalidator = None
+_events = None
+_metrics = None
+_snapshots = None
+_watcher = None
 
 """
 This module provides unbound python termination functions and can be used directly or indirectly
@@ -20,46 +32,54 @@ as an unbound python script.
 def init(id, cfg):
     global _server
     global _rr
+    global _invalidator
+    global _events
+    global _metrics
+    global _snapshots
+    global _watcher
     conf = config.UnboundEc2Conf()
     conf.set_defaults()
     conf.parse()
 
-    ec2 = EC2Connection(region=boto.ec2.get_region(conf.ec2['aws_region']))
-
-    _lookup = lookup.DirectLookup(ec2,
-                                  conf.main['zone'],
-                                  conf.lookup_filters,
-                                  conf.lookup['tag_name_include_domain']) \
-        if conf.lookup['type'] == 'direct' \
-        else lookup.CacheLookup(ec2,
-                                conf.main['zone'],
-                                conf.lookup_filters,
-                                conf.lookup['tag_name_include_domain'])
-
-    _server = server.Authoritative(conf.main['zone'],
-                                   conf.main['reverse_zone'],
-                                   conf.main['ttl'],
-                                   _lookup,
-                                   conf.main['ip_order'],
-                                   conf.main['forwarded_zones']) \
-        if conf.server['type'] == 'authoritative' \
-        else server.Caching(conf.main['zone'],
-                            conf.main['reverse_zone'],
-                            conf.main['ttl'],
-                            _lookup,
-                            conf.main['ip_order'],
-                            conf.main['forwarded_zones'])
+    _lookup = __lookup(conf)
+    _server = __server(conf, _lookup)
 
     if conf.lookup['type'] != 'direct':
-        _rr = repeater.RecursiveRepeater(conf.main['cache_ttl'], invalidator.CacheInvalidator(_server).invalidate)
+        # The cache is warmed up by the repeater in the background, until then queries are answered according
+        # to the server loading setting. A snapshot is loaded first, and served as soon as it is.
+        _invalidator = invalidator.CacheInvalidator(_server)
+        if conf.lookup['type'] != 'index' and conf.events['enabled']:
+            _events = events.EventListener(conf.events['address'], conf.events['port'], _invalidator)
+            _events.start()
+        _rr = __scheduler(conf, _invalidator, _lookup.load)
         _rr.start()
 
+    __register_gauges(_lookup, _server, _rr)
+    if conf.metrics['enabled']:
+        _metrics = metrics.MetricsListener(conf.metrics['address'], conf.metrics['port'])
+        _metrics.start()
+    if conf.publisher['enabled'] and isinstance(_lookup, lookup.CacheLookup):
+        _snapshots = distribution.SnapshotListener(conf.publisher['address'], conf.publisher['port'], _lookup)
+        _snapshots.start()
+    if conf.main['reload_interval']:
+        _watcher = repeater.RefreshScheduler(conf.main['reload_interval'],
+                                             config.ConfigWatcher(conf, __reload).check, 0)
+        _watcher.start()
+
     __print_header(conf)
 
     return True
 
 
 def deinit(id):
+    if _watcher:
+        _watcher.stop()
+    if _snapshots:
+        _snapshots.stop()
+    if _metrics:
+        _metrics.stop()
+    if _events:
+        _events.stop()
     if _rr:
         _rr.stop()
     return True
@@ -85,19 +105,181 @@ def operate(id, event, qstate, qdata):
     return _server.operate(id, event, qstate, qdata)
 
 
+def __lookup(conf):
+    if conf.lookup['type'] == 'index':
+        # Instances are fetched by the inventory worker process, the module only maps the index it publishes
+        return lookup.IndexLookup(conf.lookup['index_file'])
+    elif conf.lookup['type'] == 'direct':
+        return builder.direct_lookup(conf, builder.fleet(conf))
+    return builder.cache_lookup(conf, builder.fleet(conf))
+
+
+def __server(conf, _lookup):
+    server_class = server.Authoritative if conf.server['type'] == 'authoritative' else server.Caching
+    return server_class(conf.main['zone'],
+                        conf.main['reverse_zone'],
+                        conf.main['ttl'],
+                        _lookup,
+                        conf.main['ip_order'],
+                        conf.main['forwarded_zones'],
+                        conf.main['negative_ttl'],
+                        conf.server['cache_size'],
+                        conf.server['loading'],
+                        conf.server['answer_order'],
+                        conf.server['max_answers'])
+
+
+def __scheduler(conf, _invalidator, prepare=None):
+    if conf.lookup['type'] == 'index':
+        # Checking for a new index is a file stat, the worker does the refreshing
+        return repeater.RefreshScheduler(conf.lookup['index_check_interval'], _invalidator.invalidate, 0,
+                                         prepare=prepare)
+    cache_ttl = conf.main['cache_ttl']
+    if _events:
+        # Events keep the cache up to date, periodic refresh is only a reconciliation safety net. Whether events
+        # are enabled only changes on restart, so it is the running listener that counts.
+        cache_ttl = conf.events['reconcile_ttl']
+    return repeater.RefreshScheduler(cache_ttl,
+                                     _invalidator.invalidate,
+                                     conf.lookup['refresh_jitter'],
+                                     conf.lookup['refresh_min_interval'],
+                                     conf.lookup['refresh_max_interval'],
+                                     conf.lookup['refresh_max_backoff'],
+                                     prepare=prepare)
+
+
+def __reload(current, conf, changed):
+    """Applies a changed configuration without restarting Unbound, so that its message cache survives.
+    A new server is built around the current lookup when only serving settings changed. When only the TTL or
+    the address order changed too, the cached instances are rendered again instead of being fetched. Any
+    other change builds a new lookup, which is warmed up before it is swapped in.
+
+    :param current: UnboundEc2Conf instance in use
+    :param conf: changed UnboundEc2Conf instance
+    :param changed: set of changed (section, key) settings
+    """
+    global _server
+    global _rr
+    global _invalidator
+    if ('lookup', 'type') in changed:
+        raise ValueError('Lookup type changed from %s to %s, restart Unbound to apply it' % (
+            current.lookup['type'], conf.lookup['type']))
+    ignored = set(key for key in changed if key[0] in LISTENER_SECTIONS or key in RESTART_SETTINGS)
+    if _events:
+        # The reconciliation interval of a running event listener is a refresh scheduler setting
+        ignored.discard(('events', 'reconcile_ttl'))
+    if ignored:
+        log_warn('Changed settings take a restart: %s' % ', '.join(
+            sorted('%s.%s' % key for key in ignored)))
+    changed = changed - ignored
+    if not changed:
+        return
+    rendering = changed & config.RENDERING_SETTINGS
+    _lookup = _server.lookup
+    if changed - config.RENDERING_SETTINGS - config.SERVING_SETTINGS or \
+            (rendering and conf.lookup['type'] == 'direct'):
+        # Queries keep being answered from the current lookup while the new one is warmed up
+        _lookup = __lookup(conf)
+        if conf.lookup['type'] != 'direct':
+            _lookup.load()
+        if conf.lookup['type'] == 'cache':
+            _lookup.refresh()
+    elif rendering and isinstance(_lookup, lookup.CacheLookup):
+        _lookup.rerender(conf.main['ttl'], conf.main['ip_order'])
+
+    new_server = __server(conf, _lookup)
+    scheduler = _rr
+    if _invalidator:
+        _invalidator = invalidator.CacheInvalidator(new_server)
+        if _events:
+            _events.applier.invalidator = _invalidator
+        _rr = __scheduler(conf, _invalidator)
+        # The lookup is up to date, it is refreshed again once the interval elapsed
+        _rr.next_run += _rr.interval
+    _server = new_server
+    if _snapshots and isinstance(_lookup, lookup.CacheLookup):
+        _snapshots.lookup = _lookup
+    metrics.registry.clear_gauges()
+    __register_gauges(_lookup, _server, _rr)
+    if _rr is not scheduler:
+        _rr.start()
+        scheduler.stop()
+    log_info('Reloaded %s, changed %s' % (conf.conf_file, ', '.join(sorted('%s.%s' % key for key in changed))))
+
+
+def __register_gauges(_lookup, _server, scheduler):
+    registry = metrics.registry
+    ec2 = getattr(_lookup, 'fleet', None)
+    registry.gauge('unbound_ec2_negative_names', lambda: len(_server.negative_cache))
+    if isinstance(_lookup, lookup.CacheLookup):
+        registry.gauge('unbound_ec2_instances', lambda: len(_lookup.hosts))
+        registry.gauge('unbound_ec2_names', lambda: len(_lookup.cache))
+        registry.gauge('unbound_ec2_ready', lambda: int(_lookup.ready))
+    if isinstance(_lookup, lookup.IndexLookup):
+        registry.gauge('unbound_ec2_names', lambda: len(_lookup.index) if _lookup.index else None)
+        registry.gauge('unbound_ec2_index_generation', lambda: _lookup.index.generation if _lookup.index else None)
+        registry.gauge('unbound_ec2_ready', lambda: int(_lookup.ready))
+    if scheduler:
+        for key in ['interval', 'next_run', 'last_run', 'last_duration', 'runs', 'errors']:
+            registry.gauge('unbound_ec2_refresh_%s' % key, lambda key=key: scheduler.stats()[key])
+    for region, connection in (ec2.connections.items() if ec2 else []):
+        for key in ['calls', 'throttled', 'retried', 'rejected']:
+            registry.gauge('unbound_ec2_api_%s' % key, lambda connection=connection, key=key: connection.stats()[key],
+                           'region="%s"' % region)
+        registry.gauge('unbound_ec2_api_circuit_open', lambda connection=connection: int(
+            connection.state != throttle.CLOSED), 'region="%s"' % region)
+
+
 def __print_header(conf):
     log_info('##########################')
     log_info('### UNBOUND EC2 SCRIPT ###')
     log_info('##########################')
     log_info('Configuration:')
     log_info('     Server type: %s' % conf.server['type'])
+    log_info('   While loading: %s' % conf.server['loading'])
     log_info('            Zone: %s' % conf.main['zone'])
+    log_info('    Reverse zone: %s' % conf.main['reverse_zone'])
     log_info('        Zone TTL: %s seconds' % conf.main['ttl'])
+    for zone in sorted(conf.zones):
+        log_info('   Zone settings: %s %s' % (zone, conf.zones[zone]))
+    log_info('    Negative TTL: %s seconds' % conf.main['negative_ttl'])
     log_info('          Region: %s' % conf.ec2['aws_region'])
+    log_info('   Fetch workers: %s' % conf.ec2['workers'])
+    log_info('   Fetch timeout: %s seconds' % conf.ec2['timeout'])
+    log_info('  EC2 rate limit: %s calls per second, burst %s, %s retries' % (conf.ec2['rate'], conf.ec2['burst'],
+                                                                          conf.ec2['retries']))
     log_info('          Lookup: %s' % conf.lookup['type'])
     log_info('  Lookup filters: %s' % conf.lookup_filters)
+    log_info('     Max results: %s' % conf.lookup['max_results'])
     log_info('Name tag include: %s' % conf.lookup['tag_name_include_domain'])
     log_info('        IP order: %s' % conf.main['ip_order'])
     log_info(' Forwarded zones: %s' % conf.main['forwarded_zones'])
-    if conf.lookup['type'] != 'direct':
+    log_info(' Interface names: %s' % conf.lookup['interface_names'])
+    log_info('    Answer order: %s%s' % (conf.server['answer_order'],
+                                         ', weight tag %s' % conf.lookup['weight_tag'] if conf.lookup['weight_tag']
+                                         else ''))
+    log_info('     Max answers: %s' % (conf.server['max_answers'] or 'unlimited'))
+    if conf.lookup['type'] == 'direct':
+        log_info('       Freshness: %s seconds' % conf.lookup['freshness'])
+    elif conf.lookup['type'] == 'index':
+        log_info('           Index: %s, checked every %s seconds' % (conf.lookup['index_file'],
+                                                                     conf.lookup['index_check_interval']))
+    else:
         log_info('       Cache TTL: %d seconds' % conf.main['cache_ttl'])
+        log_info('Refresh interval: %s-%s seconds' % (conf.lookup['refresh_min_interval'] or conf.main['cache_ttl'],
+                                                     conf.lookup['refresh_max_interval'] or conf.main['cache_ttl']))
+        log_info('   Cache refresh: %s' % conf.lookup['refresh'])
+        if conf.lookup['snapshot_file']:
+            log_info('        Snapshot: %s, max age %d seconds' % (conf.lookup['snapshot_file'],
+                                                                   conf.lookup['snapshot_max_age']))
+        if conf.lookup['snapshot_url']:
+            log_info('   Snapshot pull: %s' % conf.lookup['snapshot_url'])
+        if conf.publisher['enabled']:
+            log_info('Snapshot publish: %s:%d' % (conf.publisher['address'], conf.publisher['port']))
+        if conf.events['enabled']:
+            log_info('          Events: %s:%d' % (conf.events['address'], conf.events['port']))
+            log_info('   Reconcile TTL: %d seconds' % conf.events['reconcile_ttl'])
+    if conf.metrics['enabled']:
+        log_info('         Metrics: %s:%d' % (conf.metrics['address'], conf.metrics['port']))
+    if conf.main['reload_interval']:
+        log_info('   Config reload: checked every %s seconds' % conf.main['reload_interval'])
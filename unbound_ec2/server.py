@@ -1,7 +1,43 @@
 from abc import ABCMeta, abstractmethod
+import itertools
+import random
+import heapq
 import time
 
 from unboundmodule import *
+from unbound_ec2 import expiring
+from unbound_ec2 import metrics
+from unbound_ec2 import throttle
+
+MISS_LOG_INTERVAL = 60
+
+UNMANAGED = 'unmanaged'
+FORWARDED = 'forwarded'
+FORWARD_ZONE = 'forward'
+REVERSE_ZONE = 'reverse'
+
+LOADING_SERVFAIL = 'servfail'
+LOADING_PASS = 'pass'
+
+ORDER_FIXED = 'fixed'
+ORDER_ROUND_ROBIN = 'round-robin'
+ORDER_SHUFFLE = 'shuffle'
+ORDER_WEIGHTED = 'weighted'
+
+QTYPE_NAMES = {RR_TYPE_A: 'A', RR_TYPE_AAAA: 'AAAA', RR_TYPE_ANY: 'ANY', RR_TYPE_PTR: 'PTR'}
+RECORD_TYPES = {RR_TYPE_A: ' IN A ', RR_TYPE_AAAA: ' IN AAAA ', RR_TYPE_PTR: ' IN PTR '}
+RCODE_NAMES = {RCODE_NOERROR: 'NOERROR', RCODE_NXDOMAIN: 'NXDOMAIN', RCODE_SERVFAIL: 'SERVFAIL'}
+# Label of the queries passed on to the next module, which answers them with its own rcode
+PASSED = 'pass'
+
+
+def query_labels(qtype, rcode):
+    return 'type="%s",rcode="%s"' % (QTYPE_NAMES.get(qtype, qtype), RCODE_NAMES.get(rcode, rcode))
+
+
+# Rendered once, so that counting a query does not format its labels
+QUERY_LABELS = dict(((qtype, rcode), query_labels(qtype, rcode)) for qtype in QTYPE_NAMES
+                    for rcode in RCODE_NAMES.keys() + [PASSED])
 
 
 class Server:
@@ -10,16 +46,29 @@ class Server:
     """
     __metaclass__ = ABCMeta
 
-    def __init__(self, zone, reverse_zone, ttl, lookup, ip_order, forwarded_zones):
-        self.zone = '%s.' % zone.strip('.')
-        self.reverse_zone = '%s.' % reverse_zone.strip('.')
+    def __init__(self, zone, reverse_zone, ttl, lookup, ip_order, forwarded_zones, negative_ttl=60,
+                 negative_cache_size=10000, loading=LOADING_SERVFAIL, answer_order=ORDER_FIXED, max_answers=0):
+        self.forward_zones = ['%s.' % z.strip('.').lower() for z in zone.split(',')]
+        self.reverse_zones = ['%s.' % z.strip('.').lower() for z in reverse_zone.split(',')]
+        self.zone = self.forward_zones[0]
+        self.reverse_zone = self.reverse_zones[0]
         self.lookup = lookup
         self.ttl = ttl
         self.ip_order = ip_order
         if len(forwarded_zones) > 0:
-            self.forwarded_zones = ['%s.' % z.rstrip('.') for z in forwarded_zones.split(',')]
+            self.forwarded_zones = ['%s.' % z.rstrip('.').lower() for z in forwarded_zones.split(',')]
         else:
             self.forwarded_zones = []
+        self.zones = self.__zones()
+        self.negative_ttl = negative_ttl
+        self.negative_cache = expiring.ExpiringDict(negative_cache_size, negative_ttl)
+        self.soa_records = dict((z, self.__soa_record(z)) for z in self.forward_zones + self.reverse_zones)
+        self.misses = 0
+        self.misses_logged = 0
+        self.loading = loading
+        self.answer_order = answer_order
+        self.max_answers = max_answers
+        self.rotation = itertools.count()
 
     def operate(self, _id, event, qstate, qdata):
         """
@@ -32,8 +81,17 @@ class Server:
         :return:
         """
         if event in [MODULE_EVENT_NEW, MODULE_EVENT_PASS]:
-            if self.should_handle_request(qstate):
-                return self._operate_forward(_id, event, qstate, qdata)
+            kind, zone = self.classify(qstate.qinfo.qname_str.lower())
+            if kind in [FORWARD_ZONE, REVERSE_ZONE]:
+                start = time.time()
+                result = self._operate_forward(_id, event, qstate, qdata, kind, zone)
+                metrics.registry.observe('unbound_ec2_operate_seconds', time.time() - start)
+                # Passed queries carry no rcode of ours yet
+                rcode = PASSED if qstate.ext_state[_id] == MODULE_WAIT_MODULE else qstate.return_rcode
+                metrics.registry.inc('unbound_ec2_queries_total',
+                                     QUERY_LABELS.get((qstate.qinfo.qtype, rcode)) or
+                                     query_labels(qstate.qinfo.qtype, rcode))
+                return result
             return self.handle_pass(_id, event, qstate, qdata)
 
         if event == MODULE_EVENT_MODDONE:
@@ -42,25 +100,63 @@ class Server:
         return self.handle_error(_id, event, qstate, qdata)
 
     def should_handle_request(self, qstate):
-        qname = qstate.qinfo.qname_str
-        for x in self.forwarded_zones:
-            if qname.endswith(x):
-                return False
-        if qname.endswith(self.zone):
-            return True
-        if qname.endswith(self.reverse_zone):
-            return True
-        return False
+        return self.classify(qstate.qinfo.qname_str.lower())[0] in [FORWARD_ZONE, REVERSE_ZONE]
 
-    def _operate_forward(self, _id, event, qstate, qdata):
-        qname = qstate.qinfo.qname_str
-        if qstate.qinfo.qtype in [RR_TYPE_A, RR_TYPE_ANY] and qname.endswith(self.zone):
-            return self.handle_request(_id, event, qstate, qdata, getattr(self, 'forward_record'))
-        elif qstate.qinfo.qtype in [RR_TYPE_PTR] and qname.endswith(self.reverse_zone):
-            return self.handle_request(_id, event, qstate, qdata, getattr(self, 'reverse_record'))
-        return self.handle_request_empty(_id, event, qstate, qdata)
+    def classify(self, qname):
+        """
+        Classify a name in a single pass over its label suffixes, from the top level domain down.
+        Forwarded zones take precedence, otherwise the most specific served zone matches.
+
+        :param qname: fully qualified lower case name
+        :return: (kind, zone) tuple, kind being one of UNMANAGED, FORWARDED, FORWARD_ZONE or REVERSE_ZONE
+        """
+        result = (UNMANAGED, None)
+        zones = self.zones
+        dot = qname.rfind('.', 0, len(qname) - 1)
+        while True:
+            match = zones.get(qname[dot + 1:])
+            if match is not None:
+                if match[0] == FORWARDED:
+                    return match
+                result = match
+            if dot < 0:
+                return result
+            dot = qname.rfind('.', 0, dot)
+
+    def __zones(self):
+        zones = dict((zone, (FORWARD_ZONE, zone)) for zone in self.forward_zones)
+        zones.update((zone, (REVERSE_ZONE, zone)) for zone in self.reverse_zones)
+        for zone in self.forwarded_zones:
+            zone = '%s.' % zone.strip('.')
+            zones[zone] = (FORWARDED, zone)
+        return zones
+
+    def _operate_forward(self, _id, event, qstate, qdata, kind, zone):
+        if (qstate.qinfo.qtype in [RR_TYPE_A, RR_TYPE_AAAA, RR_TYPE_ANY] and kind == FORWARD_ZONE) or \
+                (qstate.qinfo.qtype in [RR_TYPE_PTR] and kind == REVERSE_ZONE):
+            if not self.lookup.ready:
+                return self.handle_loading(_id, event, qstate, qdata)
+            return self.handle_request(_id, event, qstate, qdata, zone)
+        return self.handle_request_empty(_id, event, qstate, qdata, zone)
+
+    def handle_loading(self, _id, event, qstate, qdata):
+        """
+        Handle requests that match the serving criteria while the lookup is still warming up,
+        either failing them right away or passing them on, so that no query waits for EC2
 
-    def handle_request_empty(self, _id, event, qstate, qdata):
+        :param _id:
+        :param event:
+        :param qstate:
+        :param qdata:
+        :return:
+        """
+        metrics.registry.inc('unbound_ec2_loading_total')
+        if self.loading == LOADING_PASS:
+            return self.handle_pass(_id, event, qstate, qdata)
+        qstate.return_rcode = RCODE_SERVFAIL
+        return self.handle_error(_id, event, qstate, qdata)
+
+    def handle_request_empty(self, _id, event, qstate, qdata, zone):
         """
         Handle requests within the managed domains but RR types that we ignore
 
@@ -68,37 +164,68 @@ class Server:
         :param event:
         :param qstate:
         :param qdata:
+        :param zone: served zone the request belongs to
         :return:
         """
         qname = qstate.qinfo.qname_str
-        msg = self.new_dns_msg(qname)
+        msg = self.new_dns_msg(qname, qstate.qinfo.qtype)
         qstate.return_rcode = RCODE_NOERROR
+        msg.authority.append(self.soa_records[zone])
         msg.set_return_msg(qstate)
         qstate.return_msg.rep.security = 2
         qstate.ext_state[_id] = MODULE_FINISHED
         return True
 
-    def handle_request(self, _id, event, qstate, qdata, record_function):
+    def handle_request(self, _id, event, qstate, qdata, zone):
         """
-        Handle requests that match the serving criteria
+        Handle requests that match the serving criteria.
+        Lookup returns ready-to-append records of every type, so nothing is rendered on the query path. Names which
+        only have records of other types get an empty answer instead of NXDOMAIN. Answers are ordered and capped
+        according to the answer order and maximum number of answers. Names are indexed in lower case, so the
+        query name is lowered once to match queries sent with randomized case. Case sensitive lookups get the
+        query name as it was sent, they also look up its original case. Names a direct lookup cannot query EC2
+        for while its calls are suspended get SERVFAIL.
 
         :param _id:
         :param event:
         :param qstate:
         :param qdata:
+        :param zone: served zone the request belongs to
         :return:
         """
-        qname = qstate.qinfo.qname_str
-        msg = self.new_dns_msg(qname)
-        instances = self.lookup.lookup(qname)
-        if len(instances) == 0:
-            log_info('%s not found' % qname)
+        qtype = qstate.qinfo.qtype
+        msg = self.new_dns_msg(qstate.qinfo.qname_str, qtype)
+        qname = qstate.qinfo.qname_str.lower()
+        key = qstate.qinfo.qname_str if self.lookup.case_sensitive else qname
+        if key in self.negative_cache:
+            records = ()
+            metrics.registry.inc('unbound_ec2_lookups_total', 'result="negative"')
+        else:
+            try:
+                records = self.lookup.lookup(key)
+            except throttle.CircuitOpenError:
+                metrics.registry.inc('unbound_ec2_lookups_total', 'result="suspended"')
+                qstate.return_rcode = RCODE_SERVFAIL
+                return self.handle_error(_id, event, qstate, qdata)
+            metrics.registry.inc('unbound_ec2_lookups_total', 'result="hit"' if records else 'result="miss"')
+        if len(records) == 0:
+            self.handle_miss(key)
             qstate.return_rcode = RCODE_NXDOMAIN
+            msg.authority.append(self.soa_records[zone])
         else:
             qstate.return_rcode = RCODE_NOERROR
-            for instance in instances:
-                record = record_function(qname, instance).encode("ascii")
-                msg.answer.append(record)
+            weights = self.lookup.weights.get(qname.rstrip('.')) if self.answer_order == ORDER_WEIGHTED else None
+            if qtype != RR_TYPE_ANY:
+                marker = RECORD_TYPES[qtype]
+                if weights:
+                    pairs = [(record, weight) for record, weight in zip(records, weights) if marker in record]
+                    records, weights = tuple(p[0] for p in pairs), tuple(p[1] for p in pairs)
+                else:
+                    records = tuple(record for record in records if marker in record)
+            if records:
+                msg.answer.extend(self.order(records, weights))
+            else:
+                msg.authority.append(self.soa_records[zone])
 
         if not msg.set_return_msg(qstate):
             qstate.ext_state[_id] = MODULE_ERROR
@@ -106,15 +233,83 @@ class Server:
 
         qstate.return_msg.rep.security = 2
         qstate.ext_state[_id] = MODULE_FINISHED
+        self.handle_answer(_id, event, qstate, qdata)
 
         return True
 
+    def order(self, records, weights=None):
+        """
+        Order the answers of a name and cap their number. Only the returned answers are picked from the
+        records, the records themselves are never copied as a whole.
+
+        :param records: answer records
+        :param weights: weights of the records, None when they weigh the same
+        :return: records to answer with
+        """
+        count = len(records)
+        limit = min(count, self.max_answers) if self.max_answers else count
+        if count < 2:
+            return records
+        if self.answer_order == ORDER_ROUND_ROBIN:
+            start = next(self.rotation) % count
+            return [records[(start + i) % count] for i in xrange(limit)]
+        if self.answer_order == ORDER_WEIGHTED and weights:
+            # Weighted random order, each record is drawn with a probability proportional to its weight
+            keys = [random.random() ** (1.0 / weight) if weight > 0 else -1 for weight in weights]
+            return [records[i] for i in heapq.nlargest(limit, xrange(count), keys.__getitem__)]
+        if self.answer_order in [ORDER_SHUFFLE, ORDER_WEIGHTED]:
+            return random.sample(records, limit)
+        return records[:limit] if limit < count else records
+
+    def handle_miss(self, qname):
+        """
+        Remember a name that was not found and log misses at most once per MISS_LOG_INTERVAL
+
+        :param qname:
+        :return:
+        """
+        self.negative_cache.set(qname, True)
+        self.misses += 1
+        now = time.time()
+        if now - self.misses_logged >= MISS_LOG_INTERVAL:
+            log_info('%s not found (%d names not found since last report)' % (qname, self.misses))
+            self.misses = 0
+            self.misses_logged = now
+
+    def __soa_record(self, zone):
+        # SOA minimum sets the negative answer TTL
+        return "%s %d IN SOA %s hostmaster.%s 1 3600 600 86400 %d" % (zone, self.negative_ttl, zone, zone,
+                                                                      self.negative_ttl)
+
+    def handle_answer(self, _id, event, qstate, qdata):
+        """
+        Called once an answer has been set for a request that matched the serving criteria
+
+        :param _id:
+        :param event:
+        :param qstate:
+        :param qdata:
+        :return:
+        """
+        pass
+
+    def invalidate(self, names):
+        """
+        Called with the names whose answers changed after a lookup refresh
+
+        :param names:
+        :return:
+        """
+        for name in names:
+            self.negative_cache.pop('%s.' % name)
+
     @abstractmethod
-    def new_dns_msg(self, qname):
+    def new_dns_msg(self, qname, qtype=RR_TYPE_A):
         """
         Abstract function for instantiating DNSMessage
 
         :param qname:
+        :param qtype:
         :return:
         """
         return NotImplemented
@@ -158,60 +353,42 @@ class Server:
         qstate.ext_state[_id] = MODULE_ERROR
         return True
 
-    def __determine_address(self, instance):
-        if self.ip_order == 'private':
-            ordered_address = instance.private_ip_address or instance.ip_address
-        else:
-            ordered_address = instance.ip_address or instance.private_ip_address
-        return (instance.tags.get('Address')
-                or ordered_address).encode("ascii")
-
-    def __determine_name(self, instance):
-        domain = self.zone.rstrip('.')
-        name = instance.tags['Name'].split(',')[0].rstrip('.') if 'Name' in instance.tags else instance.id
-        return '%s.' % (name if domain in name else '%s.%s' % (name, domain)).encode("ascii")
-
-    def forward_record(self, qname, instance):
-        return "%s %d IN A %s" % (qname, self.ttl, self.__determine_address(instance))
-
-    def reverse_record(self, qname, instance):
-        return "%s %d IN PTR %s" % (qname, self.ttl, self.__determine_name(instance))
-
 
 class Authoritative(Server):
     """This server will return non-cached authoritative answers.
     """
 
-    def new_dns_msg(self, qname):
+    def new_dns_msg(self, qname, qtype=RR_TYPE_A):
         """
         Return DNSMessage instance with AA flag set
 
         :param qname:
+        :param qtype:
         :return:
         """
-        return DNSMessage(qname, RR_TYPE_A, RR_CLASS_IN, PKT_QR | PKT_RA | PKT_AA)
+        return DNSMessage(qname, qtype, RR_CLASS_IN, PKT_QR | PKT_RA | PKT_AA)
 
 
 class Caching(Server):
     """This server will serve cached answers.
+    Answers are stored in Unbound's message cache, which then absorbs repeated queries until their TTL expires.
+    Unbound answers from its message cache before the module sees the query, so changed answers are only
+    served once their cached copy expired.
     """
 
-    def __init__(self, zone, reverse_zone, ttl, lookup, ip_order, forwarded_zones):
-        Server.__init__(self, zone, reverse_zone, ttl, lookup, ip_order, forwarded_zones)
-        self.cached_requests = {}
-
-    def new_dns_msg(self, qname):
+    def new_dns_msg(self, qname, qtype=RR_TYPE_A):
         """
         Return DNSMessage instance
 
         :param qname:
+        :param qtype:
         :return:
         """
-        return DNSMessage(qname, RR_TYPE_A, RR_CLASS_IN, PKT_QR | PKT_RA)
+        return DNSMessage(qname, qtype, RR_CLASS_IN, PKT_QR | PKT_RA)
 
-    def handle_forward(self, _id, event, qstate, qdata):
+    def handle_answer(self, _id, event, qstate, qdata):
         """
-        Apart from the standard Server handle_forward answer, results will be stored in query and request cache
+        Apart from the standard Server answer, positive results will be stored in query and request cache
 
         :param _id:
         :param event:
@@ -219,12 +396,7 @@ class Caching(Server):
         :param qdata:
         :return:
         """
-        result = Server.handle_forward(self, _id, event, qstate, qdata)
-        qname = qstate.qinfo.qname_str
-
+        if qstate.return_rcode != RCODE_NOERROR:
+            return
         if not storeQueryInCache(qstate, qstate.qinfo, qstate.return_msg.rep, 0):
             log_warn('Unable to store query in cache. possibly out of memory.')
-        else:
-            self.cached_requests[qname.rstrip('.')] = {'time': time.time(), 'qstate': qstate}
-
-        return result
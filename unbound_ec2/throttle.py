@@ -0,0 +1,162 @@
+import threading
+import random
+import time
+
+from unboundmodule import log_warn
+
+THROTTLING_ERRORS = ['RequestLimitExceeded', 'Throttling', 'ThrottlingException']
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half-open'
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling EC2 while the circuit is open.
+    """
+    pass
+
+
+class TokenBucket:
+    """Token bucket rate limiter, shared by every thread calling through it.
+    """
+
+    def __init__(self, rate, burst=None):
+        """
+        :param rate: tokens added per second
+        :param burst: maximum number of tokens, defaults to rate
+        """
+        self.rate = float(rate)
+        self.burst = float(burst or rate)
+        self.tokens = self.burst
+        self.updated = time.time()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Takes a token, waiting for one when the bucket is empty.
+
+        :return: seconds waited
+        """
+        with self.lock:
+            now = time.time()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0
+        if wait:
+            time.sleep(wait)
+        return wait
+
+
+class Throttle:
+    """EC2 connection wrapper which rate limits calls, retries throttled or failed ones with jittered exponential
+    backoff within a retry budget, and stops calling EC2 for a while after repeated failures.
+
+    While the circuit is open calls fail right away, so that lookups keep serving what they fetched last.
+    Once the reset timeout elapsed, a single trial call is let through, the others keep failing until it completes.
+    """
+
+    def __init__(self, ec2, rate=5, burst=None, retries=3, backoff=0.5, max_backoff=20, retry_ratio=0.2,
+                 failure_threshold=5, reset_timeout=60):
+        """
+        :param ec2: EC2 connection
+        :param rate: calls per second
+        :param burst: calls allowed at once, defaults to rate
+        :param retries: maximum number of retries per call
+        :param backoff: base delay of the first retry in seconds
+        :param max_backoff: longest delay between retries
+        :param retry_ratio: retries earned per successful call, bounding retries to a fraction of the calls
+        :param failure_threshold: consecutive failed calls after which the circuit opens
+        :param reset_timeout: seconds the circuit stays open before a trial call is let through
+        """
+        self.ec2 = ec2
+        self.bucket = TokenBucket(rate, burst)
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.retry_ratio = retry_ratio
+        self.retry_tokens = float(retries)
+        self.max_retry_tokens = max(10.0, float(retries))
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self.failures = 0
+        self.opened = 0
+        self.lock = threading.Lock()
+        self.calls = 0
+        self.throttled = 0
+        self.retried = 0
+        self.rejected = 0
+
+    def get_all_reservations(self, *args, **kwargs):
+        return self.call(self.ec2.get_all_reservations, *args, **kwargs)
+
+    def call(self, function, *args, **kwargs):
+        self.__before()
+        attempt = 0
+        while True:
+            self.bucket.acquire()
+            self.calls += 1
+            try:
+                result = function(*args, **kwargs)
+            except Exception as e:
+                throttled = getattr(e, 'error_code', None) in THROTTLING_ERRORS
+                if throttled:
+                    self.throttled += 1
+                if attempt < self.retries and (throttled or self.__transient(e)) and self.__withdraw():
+                    attempt += 1
+                    self.retried += 1
+                    time.sleep(random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt)))
+                    continue
+                self.__failed(e)
+                raise
+            self.__succeeded(attempt)
+            return result
+
+    def stats(self):
+        return {'state': self.state,
+                'calls': self.calls,
+                'throttled': self.throttled,
+                'retried': self.retried,
+                'rejected': self.rejected}
+
+    def __transient(self, e):
+        # Server side errors and connection failures are worth retrying, client errors are not
+        status = getattr(e, 'status', None)
+        return status >= 500 if status is not None else isinstance(e, (IOError, OSError))
+
+    def __withdraw(self):
+        with self.lock:
+            if self.retry_tokens < 1:
+                return False
+            self.retry_tokens -= 1
+            return True
+
+    def __before(self):
+        with self.lock:
+            if self.state == HALF_OPEN:
+                self.rejected += 1
+                raise CircuitOpenError('EC2 calls suspended until the trial call completes')
+            if self.state == OPEN:
+                if time.time() - self.opened < self.reset_timeout:
+                    self.rejected += 1
+                    raise CircuitOpenError('EC2 calls suspended after %d failures' % self.failures)
+                # This call is the trial call
+                self.state = HALF_OPEN
+
+    def __succeeded(self, attempt):
+        with self.lock:
+            if attempt == 0:
+                self.retry_tokens = min(self.max_retry_tokens, self.retry_tokens + self.retry_ratio)
+            self.failures = 0
+            self.state = CLOSED
+
+    def __failed(self, e):
+        with self.lock:
+            self.failures += 1
+            if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != OPEN:
+                    log_warn('Suspending EC2 calls for %d seconds after %d failures: %s' % (self.reset_timeout,
+                                                                                         self.failures, e))
+                self.state = OPEN
+                self.opened = time.time()
@@ -0,0 +1,175 @@
+"""
+Inventory worker, fetching instances from EC2 and publishing them as a memory mapped index for the Unbound module
+configured with the index lookup type. Runs outside of Unbound, with the same configuration file:
+
+    $ python -m unbound_ec2.worker --config /etc/unbound/unbound_ec2.conf
+"""
+import functools
+import threading
+import optparse
+import logging
+import signal
+import sys
+import imp
+
+if 'unboundmodule' not in sys.modules:
+    try:
+        import unboundmodule
+    except ImportError:
+        # Outside of Unbound, the module logging functions write to the standard logging
+        unboundmodule = sys.modules['unboundmodule'] = imp.new_module('unboundmodule')
+        unboundmodule.log_info = logging.info
+        unboundmodule.log_warn = logging.warning
+        unboundmodule.log_err = logging.error
+
+from unboundmodule import log_info, log_warn
+from unbound_ec2 import config
+from unbound_ec2 import builder
+from unbound_ec2 import index
+from unbound_ec2 import repeater
+from unbound_ec2 import events
+from unbound_ec2 import metrics
+from unbound_ec2 import distribution
+
+
+class Publisher:
+    """Refreshes a cache lookup and publishes it as an index whenever its answers change.
+    Stands in for the cache invalidator of the Unbound module, so that the refresh scheduler
+    and the events listener drive the worker the same way.
+    """
+
+    def __init__(self, lookup, index_file):
+        """
+        :param lookup: CacheLookup instance
+        :param index_file: path of the published index
+        """
+        self.lookup = lookup
+        self.index_file = index_file
+        self.generation = 0
+        self.lock = threading.Lock()
+
+    def invalidate(self):
+        """Refreshes the lookup and publishes the changes.
+
+        :return: set of changed names
+        """
+        return self.publish(self.lookup.refresh())
+
+    def update(self, instance_ids=(), removed_ids=()):
+        """Refreshes provided instances only and publishes the changes.
+
+        """
+        return self.publish(self.lookup.update(instance_ids, removed_ids))
+
+    def publish(self, changed):
+        """Writes the lookup cache to the index, unless nothing changed since it was last written.
+
+        :param changed: names whose answers changed since the last publication
+        :return: changed names
+        """
+        # The lookup cache is changed in place by incremental refreshes and events, it is written under their lock
+        with self.lock:
+            with self.lookup.refresh_lock:
+                if changed or not self.generation:
+                    previous = self.generation
+                    self.generation += 1
+                    size = index.write(self.index_file, self.lookup.cache, self.lookup.weights, self.generation,
+                                       previous, changed if previous else None)
+                    metrics.registry.inc('unbound_ec2_index_publications_total')
+                    log_info('Published index %s generation %d, %d names, %d bytes' % (
+                        self.index_file, self.generation, len(self.lookup.cache), size))
+        return changed
+
+
+def reload(publisher, current, conf, changed):
+    """Applies a changed TTL or address order by rendering the cached instances again and publishing them.
+    Other settings take a restart of the worker.
+
+    :param publisher: Publisher instance
+    :param current: UnboundEc2Conf instance in use
+    :param conf: changed UnboundEc2Conf instance
+    :param changed: set of changed (section, key) settings
+    """
+    ignored = set(key for key in changed if key[0] != 'server') - config.RENDERING_SETTINGS
+    if ignored:
+        log_warn('Changed settings take a restart of the worker: %s' % ', '.join(
+            sorted('%s.%s' % key for key in ignored)))
+    if changed & config.RENDERING_SETTINGS:
+        publisher.publish(publisher.lookup.rerender(conf.main['ttl'], conf.main['ip_order']))
+        log_info('Rendered instances again with TTL %s and %s addresses first' % (conf.main['ttl'],
+                                                                                   conf.main['ip_order']))
+
+
+def main():
+    # optparse rather than argparse, which is not part of Python 2.6
+    parser = optparse.OptionParser(usage='%%prog [options]\n%s' % __doc__)
+    parser.add_option('--config', help='configuration file, defaults to UNBOUND_EC2_CONF or %s' %
+                                       config.DEFAULT_CONF_FILE)
+    args = parser.parse_args()[0]
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(message)s')
+
+    conf = config.UnboundEc2Conf(args.config)
+    conf.set_defaults()
+    conf.parse()
+
+    _lookup = builder.cache_lookup(conf, builder.fleet(conf))
+    publisher = Publisher(_lookup, conf.lookup['index_file'])
+    if _lookup.load():
+        publisher.publish(set())
+
+    cache_ttl = conf.main['cache_ttl']
+    _events = None
+    if conf.events['enabled']:
+        cache_ttl = conf.events['reconcile_ttl']
+        _events = events.EventListener(conf.events['address'], conf.events['port'], publisher)
+        _events.start()
+    _metrics = None
+    if conf.metrics['enabled']:
+        _metrics = metrics.MetricsListener(conf.metrics['address'], conf.metrics['port'])
+        _metrics.start()
+    _snapshots = None
+    if conf.publisher['enabled']:
+        _snapshots = distribution.SnapshotListener(conf.publisher['address'], conf.publisher['port'], _lookup)
+        _snapshots.start()
+    scheduler = repeater.RefreshScheduler(cache_ttl,
+                                          publisher.invalidate,
+                                          conf.lookup['refresh_jitter'],
+                                          conf.lookup['refresh_min_interval'],
+                                          conf.lookup['refresh_max_interval'],
+                                          conf.lookup['refresh_max_backoff'])
+    scheduler.start()
+    # The configuration is checked for changes every reload interval, and on SIGHUP
+    watcher = config.ConfigWatcher(conf, functools.partial(reload, publisher))
+    _watcher = None
+    if conf.main['reload_interval']:
+        _watcher = repeater.RefreshScheduler(conf.main['reload_interval'], watcher.check, 0)
+        _watcher.start()
+    log_info('Publishing instances to %s' % conf.lookup['index_file'])
+
+    stopped = threading.Event()
+    reloading = threading.Event()
+    for signum in [signal.SIGINT, signal.SIGTERM]:
+        signal.signal(signum, lambda *args: stopped.set())
+    signal.signal(signal.SIGHUP, lambda *args: reloading.set())
+    while not stopped.is_set():
+        stopped.wait(1)
+        if reloading.is_set():
+            reloading.clear()
+            try:
+                watcher.check()
+            except Exception as e:
+                log_warn('Reload failed: %s' % e)
+
+    if _watcher:
+        _watcher.stop()
+    scheduler.stop()
+    if _events:
+        _events.stop()
+    if _metrics:
+        _metrics.stop()
+    if _snapshots:
+        _snapshots.stop()
+
+
+if __name__ == '__main__':
+    main()
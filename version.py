@@ -0,0 +1,2 @@
+# Do not edit this file
+__version__=1.0
\ No newline at end of file